@@ -56,6 +56,7 @@ from collections import defaultdict
 from tqdm import tqdm
 
 from local.lib.common.feedback import print_time_taken_sec
+from local.lib.common.environment import get_env_classifier_batch_size, get_env_classifier_num_threads
 
 from local.lib.ui_utils.cli_selections import Resource_Selector
 
@@ -186,6 +187,7 @@ if no_object_data:
 # Programmatically import the target classifier class
 import_pathing_args = (location_select_folder_path, camera_select)
 Imported_Classifier_Class, setup_data_dict = import_classifier_class(*import_pathing_args)
+Imported_Classifier_Class.set_batch_settings(get_env_classifier_batch_size(), get_env_classifier_num_threads())
 classifier_ref = Imported_Classifier_Class(*import_pathing_args)
 classifier_ref.reconfigure(setup_data_dict)
 
@@ -205,22 +207,26 @@ t_start = perf_counter()
 total_objs = len(obj_id_list)
 cli_prog_bar = tqdm(total = total_objs, mininterval = 0.5)
 
-# Loop over all objects and apply classifier
-for each_obj_id in obj_id_list:
+# Loop over all objects (in batches) and apply classifier
+batch_size = classifier_ref.batch_size
+for batch_start_idx in range(0, total_objs, batch_size):
     
     # Run the classifier on the selected dataset
-    topclass_dict, subclass_dict, attributes_dict = classifier_ref.run(each_obj_id, obj_db, snap_db)
+    batch_obj_id_list = obj_id_list[batch_start_idx:(batch_start_idx + batch_size)]
+    batch_results_list = classifier_ref.run_batch(batch_obj_id_list, obj_db, snap_db)
     
-    # Store results in case we need to save
-    report_entry_dict = new_classifier_report_entry(each_obj_id, topclass_dict, subclass_dict, attributes_dict)
-    save_data_dict[each_obj_id] = report_entry_dict
+    for each_obj_id, (topclass_dict, subclass_dict, attributes_dict) in zip(batch_obj_id_list, batch_results_list):
+        
+        # Store results in case we need to save
+        report_entry_dict = new_classifier_report_entry(each_obj_id, topclass_dict, subclass_dict, attributes_dict)
+        save_data_dict[each_obj_id] = report_entry_dict
+        
+        # Keep track of class counts for feedback
+        topclass_label = report_entry_dict["topclass_label"]
+        class_count_dict[topclass_label] += 1
     
-    # Keep track of class counts for feedback
-    topclass_label = report_entry_dict["topclass_label"]
-    class_count_dict[topclass_label] += 1
-
     # Provide some progress feedback
-    cli_prog_bar.update()
+    cli_prog_bar.update(len(batch_obj_id_list))
 
 # Clean up
 classifier_ref.close()
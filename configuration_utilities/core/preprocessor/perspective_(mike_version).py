@@ -81,7 +81,7 @@ class Custom_Input_Display(Display_Window_Specification):
     def display(self, stage_outputs, configurable_ref, mouse_xy,
                 current_frame_index, current_epoch_ms, current_datetime):
         
-        display_frame = stage_outputs["video_capture_input"]["video_frame"]
+        display_frame = stage_outputs["video_capture_input"]["video_frame"].copy()
         #return draw_warped_grid(display_frame, configurable_ref)
         return draw_extended_quad(display_frame, configurable_ref)
     
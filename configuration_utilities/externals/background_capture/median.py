@@ -66,8 +66,10 @@ class Custom_Stats_Display(Stats_Display):
     
     def _max_ram_usage_mb(self, configurable_ref, ram_mb_per_frame):
         
-        # Median can load many capture images into RAM!
+        # Median can load many capture images into RAM! (incremental generation only stores an estimate + step sizes)
         max_frame_count = configurable_ref.max_captures_to_use
+        if configurable_ref.use_incremental_median:
+            max_frame_count = 2
         
         return ram_mb_per_frame * max_frame_count
 
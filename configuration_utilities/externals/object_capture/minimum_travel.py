@@ -91,7 +91,7 @@ class Custom_Travel_Display(Display_Window_Specification):
         box_color = outline_color
         
         # Get data from core stages
-        display_frame = stage_outputs["preprocessor"]["preprocessed_frame"]
+        display_frame = stage_outputs["preprocessor"]["preprocessed_frame"].copy()
         tracking_obj_dict = stage_outputs["tracker"]["tracked_object_dict"]
         
         # Draw all detections into the appropriate output frame
@@ -74,7 +74,7 @@ from local.lib.ui_utils.script_arguments import script_arg_builder
 from local.lib.file_access_utils.shared import build_camera_path, build_logging_folder_path, url_safe_name
 from local.lib.file_access_utils.reporting import build_base_report_path
 from local.lib.file_access_utils.logging import build_stdout_log_file_path, build_stderr_log_file_path
-from local.lib.file_access_utils.state_files import load_state_file, delete_state_file
+from local.lib.file_access_utils.state_files import load_state_file, delete_state_file, load_metrics_file
 from local.lib.file_access_utils.resources import reset_background_resources_folder
 
 from local.lib.file_access_utils.control_server import Autolaunch_Settings, get_existing_camera_names_list
@@ -876,6 +876,43 @@ def status_get_cameras_status_route():
 
 # .....................................................................................................................
 
+@wsgi_app.route("/status/get-cameras-metrics")
+def status_get_cameras_metrics_route():
+    
+    # Get pathing to cameras and a list of available cameras
+    camera_name_list = get_existing_camera_names_list(LOCATION_SELECT_FOLDER_PATH)
+    
+    # Loop over all cameras and load performance metrics for running cameras (metrics may be stale otherwise)
+    camera_metrics_dict = {}
+    for each_camera_name in camera_name_list:
+        
+        metrics_dict = None
+        is_running = RTSP_PROC.check_camera_is_running(each_camera_name)
+        if is_running:
+            _, metrics_dict = load_metrics_file(LOCATION_SELECT_FOLDER_PATH, each_camera_name)
+        camera_metrics_dict[each_camera_name] = metrics_dict
+    
+    return jsonify(camera_metrics_dict)
+
+# .....................................................................................................................
+
+@wsgi_app.route("/status/get-camera-metrics/<string:camera_select>")
+def status_get_camera_metrics_route(camera_select):
+    
+    # Bail if the camera isn't running, since we won't have up-to-date metrics
+    is_running = RTSP_PROC.check_camera_is_running(camera_select)
+    if not is_running:
+        return bad_response("Camera is not running: {}".format(camera_select), status_code = 404)
+    
+    # Load camera metrics, if available
+    no_metrics_data, metrics_dict = load_metrics_file(LOCATION_SELECT_FOLDER_PATH, camera_select)
+    if no_metrics_data:
+        return bad_response("No metrics available for camera: {}".format(camera_select), status_code = 404)
+    
+    return jsonify(metrics_dict)
+
+# .....................................................................................................................
+
 @wsgi_app.route("/control/cameras/start/<string:camera_select>")
 def control_cameras_restart_route(camera_select):
     
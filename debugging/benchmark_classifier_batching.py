@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 15:40:12 2026
+
+@author: eo
+"""
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Add local path
+
+import os
+import sys
+
+def find_path_to_local(target_folder = "local"):
+    
+    # Skip path finding if we successfully import the dummy file
+    try:
+        from local.dummy import dummy_func; dummy_func(); return
+    except ImportError:
+        print("", "Couldn't find local directory!", "Searching for path...", sep="\n")
+    
+    # Figure out where this file is located so we can work backwards to find the target folder
+    file_directory = os.path.dirname(os.path.abspath(__file__))
+    path_check = []
+    
+    # Check parent directories to see if we hit the main project directory containing the target folder
+    prev_working_path = working_path = file_directory
+    while True:
+        
+        # If we find the target folder in the given directory, add it to the python path (if it's not already there)
+        if target_folder in os.listdir(working_path):
+            if working_path not in sys.path:
+                tilde_swarm = "~"*(4 + len(working_path))
+                print("\n{}\nPython path updated:\n  {}\n{}".format(tilde_swarm, working_path, tilde_swarm))
+                sys.path.append(working_path)
+            break
+        
+        # Stop if we hit the filesystem root directory (parent directory isn't changing)
+        prev_working_path, working_path = working_path, os.path.dirname(working_path)
+        path_check.append(prev_working_path)
+        if prev_working_path == working_path:
+            print("\nTried paths:", *path_check, "", sep="\n  ")
+            raise ImportError("Can't find '{}' directory!".format(target_folder))
+            
+find_path_to_local()
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Imports
+
+import argparse
+import numpy as np
+
+from time import perf_counter
+
+from local.lib.classifier_models.squeezenet_variants import Full_SqueezeNet_112x112, set_inference_threads
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Define functions
+
+# .....................................................................................................................
+
+def parse_benchmark_args():
+    
+    # Set defaults
+    default_num_images = 256
+    default_batch_sizes = [8, 32, 64]
+    default_thread_counts = [0]
+    
+    # Set up script arguments
+    ap = argparse.ArgumentParser(formatter_class = argparse.RawTextHelpFormatter,
+                                 description = "Benchmark per-image vs. batched squeezenet classifier inference")
+    ap.add_argument("-n", "--num_images", default = default_num_images, type = int,
+                    help = "Number of (randomly generated) images to classify per test (Default: {})"
+                           .format(default_num_images))
+    ap.add_argument("-b", "--batch_sizes", default = default_batch_sizes, type = int, nargs = "+",
+                    help = "Batch sizes to test (Default: {})".format(default_batch_sizes))
+    ap.add_argument("-t", "--threads", default = default_thread_counts, type = int, nargs = "+",
+                    help = "Thread counts to test, 0 uses the pytorch default (Default: {})"
+                           .format(default_thread_counts))
+    
+    # Get arg inputs into a dictionary
+    args = vars(ap.parse_args())
+    
+    return args
+
+# .....................................................................................................................
+
+def create_test_images(num_images, random_seed = 0):
+    
+    ''' Function used to create random (differently sized) images, to mimic cropped objects '''
+    
+    rng = np.random.default_rng(random_seed)
+    image_list = []
+    for _ in range(num_images):
+        image_width, image_height = rng.integers(75, 200, size = 2)
+        image_list.append(rng.integers(0, 256, size = (image_height, image_width, 3), dtype = np.uint8))
+    
+    return image_list
+
+# .....................................................................................................................
+
+def run_single_benchmark(model, image_list):
+    
+    ''' Function used to time the original (one image per call) inference '''
+    
+    t_start = perf_counter()
+    prediction_list = [model.predict(each_image) for each_image in image_list]
+    t_end = perf_counter()
+    
+    return prediction_list, (t_end - t_start)
+
+# .....................................................................................................................
+
+def run_batch_benchmark(model, image_list, batch_size):
+    
+    ''' Function used to time batched inference '''
+    
+    t_start = perf_counter()
+    prediction_list = model.predict_batch(image_list, batch_size)
+    t_end = perf_counter()
+    
+    return prediction_list, (t_end - t_start)
+
+# .....................................................................................................................
+
+def count_mismatches(reference_prediction_list, prediction_list, score_tolerance = 1E-4):
+    
+    ''' Helper function used to check that batched predictions match the per-image results '''
+    
+    num_mismatches = 0
+    for (ref_label, ref_score), (each_label, each_score) in zip(reference_prediction_list, prediction_list):
+        if (ref_label != each_label) or (abs(ref_score - each_score) > score_tolerance):
+            num_mismatches += 1
+    
+    return num_mismatches
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Set up model & data
+
+# Get script args
+script_args = parse_benchmark_args()
+num_images = max(1, script_args["num_images"])
+batch_sizes_list = script_args["batch_sizes"]
+thread_counts_list = script_args["threads"]
+
+# Create a randomly initialized model, since only the timing matters here
+class_labels_list = ["pedestrian", "vehicle", "forklift", "background"]
+model = Full_SqueezeNet_112x112(class_labels_list, random_initialization = True)
+model.set_to_inference_mode()
+
+# Create test data
+image_list = create_test_images(num_images)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Run benchmarks
+
+print("",
+      "Benchmarking squeezenet inference ({} images)".format(num_images),
+      "",
+      "{:<24} {:>8} {:>12} {:>10} {:>12}".format("Test", "Threads", "Images/sec", "Speed up", "Mismatches"),
+      "-" * 70,
+      sep = "\n")
+
+for each_thread_count in thread_counts_list:
+    
+    # Apply thread count (if not using the default)
+    num_threads = set_inference_threads(each_thread_count)
+    
+    # Run the original per-image inference, as a reference for both speed & results
+    ref_prediction_list, ref_time_sec = run_single_benchmark(model, image_list)
+    ref_images_per_sec = num_images / max(1E-9, ref_time_sec)
+    print("{:<24} {:>8} {:>12.1f} {:>10} {:>12}".format("per-image", num_threads, ref_images_per_sec, "-", "-"))
+    
+    # Run batched inference and compare to the per-image results
+    for each_batch_size in batch_sizes_list:
+        prediction_list, time_sec = run_batch_benchmark(model, image_list, each_batch_size)
+        images_per_sec = num_images / max(1E-9, time_sec)
+        speed_up = images_per_sec / ref_images_per_sec
+        num_mismatches = count_mismatches(ref_prediction_list, prediction_list)
+        test_name = "batched ({})".format(each_batch_size)
+        print("{:<24} {:>8} {:>12.1f} {:>9.2f}x {:>12}".format(test_name, num_threads, images_per_sec,
+                                                                 speed_up, num_mismatches))
+    print("")
+
+print("Batch size & thread count can be set for the classifier using the environment variables:",
+      "  CLASSIFIER_BATCH_SIZE & CLASSIFIER_NUM_THREADS",
+      "", sep = "\n")
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Scrap
+
+
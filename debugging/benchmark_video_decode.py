@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:12:41 2026
+
+@author: eo
+"""
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Add local path
+
+import os
+import sys
+
+def find_path_to_local(target_folder = "local"):
+    
+    # Skip path finding if we successfully import the dummy file
+    try:
+        from local.dummy import dummy_func; dummy_func(); return
+    except ImportError:
+        print("", "Couldn't find local directory!", "Searching for path...", sep="\n")
+    
+    # Figure out where this file is located so we can work backwards to find the target folder
+    file_directory = os.path.dirname(os.path.abspath(__file__))
+    path_check = []
+    
+    # Check parent directories to see if we hit the main project directory containing the target folder
+    prev_working_path = working_path = file_directory
+    while True:
+        
+        # If we find the target folder in the given directory, add it to the python path (if it's not already there)
+        if target_folder in os.listdir(working_path):
+            if working_path not in sys.path:
+                tilde_swarm = "~"*(4 + len(working_path))
+                print("\n{}\nPython path updated:\n  {}\n{}".format(tilde_swarm, working_path, tilde_swarm))
+                sys.path.append(working_path)
+            break
+        
+        # Stop if we hit the filesystem root directory (parent directory isn't changing)
+        prev_working_path, working_path = working_path, os.path.dirname(working_path)
+        path_check.append(prev_working_path)
+        if prev_working_path == working_path:
+            print("\nTried paths:", *path_check, "", sep="\n  ")
+            raise ImportError("Can't find '{}' directory!".format(target_folder))
+            
+find_path_to_local()
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Imports
+
+import argparse
+import cv2
+
+from time import perf_counter, process_time
+
+from local.lib.file_access_utils.video import create_default_capture_options
+from local.lib.launcher_utils.video_setup import create_VideoCapture
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Define functions
+
+# .....................................................................................................................
+
+def parse_benchmark_args():
+    
+    # Set defaults
+    default_max_frames = 500
+    
+    # Set up script arguments
+    ap = argparse.ArgumentParser(formatter_class = argparse.RawTextHelpFormatter,
+                                 description = "Benchmark video decoding speed/cpu usage for different capture options")
+    ap.add_argument("video_path", type = str,
+                    help = "Path to a video file to use for benchmarking")
+    ap.add_argument("-n", "--max_frames", default = default_max_frames, type = int,
+                    help = "Maximum number of frames to read per test (Default: {})".format(default_max_frames))
+    
+    # Get arg inputs into a dictionary
+    args = vars(ap.parse_args())
+    
+    return args
+
+# .....................................................................................................................
+
+def check_backend_available(api_preference):
+    
+    ''' Helper function used to check if a capture backend is available (assumes it is, on older opencv) '''
+    
+    try:
+        return api_preference in cv2.videoio_registry.getBackends()
+    except AttributeError:
+        return True
+
+# .....................................................................................................................
+
+def build_test_options_list(video_wh):
+    
+    ''' Function used to build the list of capture options to be benchmarked '''
+    
+    # Get a reduced resolution for testing (on gstreamer only)
+    video_width, video_height = video_wh
+    half_wh = [max(2, video_width // 2), max(2, video_height // 2)]
+    
+    # Build ffmpeg tests, along with thread counts if supported
+    test_list = [("default", {}, True), ("default (grab only)", {}, False)]
+    if check_backend_available(cv2.CAP_FFMPEG):
+        test_list += [("ffmpeg", {"backend": "ffmpeg"}, True),
+                      ("ffmpeg (hw accel)", {"backend": "ffmpeg", "hardware_acceleration": True}, True)]
+        if hasattr(cv2, "CAP_PROP_N_THREADS"):
+            for each_thread_count in [1, 2, 4]:
+                test_name = "ffmpeg ({} threads)".format(each_thread_count)
+                test_list += [(test_name, {"backend": "ffmpeg", "decode_threads": each_thread_count}, True)]
+    
+    # Build gstreamer tests, if available
+    if check_backend_available(cv2.CAP_GSTREAMER):
+        test_list += [("gstreamer", {"backend": "gstreamer"}, True),
+                      ("gstreamer (half res)", {"backend": "gstreamer", "decode_wh": half_wh}, True)]
+    
+    # Fill in the missing options for each test
+    output_list = []
+    for each_name, each_options_dict, each_decode in test_list:
+        new_options_dict = create_default_capture_options()
+        new_options_dict.update(each_options_dict)
+        output_list.append((each_name, new_options_dict, each_decode))
+    
+    return output_list
+
+# .....................................................................................................................
+
+def run_decode_benchmark(video_path, capture_options_dict, max_frames, enable_decode = True):
+    
+    '''
+    Function used to time video decoding with a given set of capture options
+    
+    Returns:
+        decode_fps, cpu_usage_pct, frame_count, frame_wh
+    
+    Note: cpu usage is reported relative to a single core, so it can exceed 100% with multithreaded decoding
+    '''
+    
+    # Try to open the video, and bail if it fails
+    vcap = create_VideoCapture(video_path, capture_options_dict)
+    if not vcap.isOpened():
+        return None, None, 0, None
+    
+    # Read frames as fast as possible, while recording wall & cpu time
+    frame_wh = None
+    frame_count = 0
+    t_wall_start, t_cpu_start = perf_counter(), process_time()
+    for _ in range(max_frames):
+        
+        # Either fully decode each frame, or grab only (as used when skipping frames)
+        if enable_decode:
+            rec_frame, frame = vcap.read()
+            if rec_frame and frame_wh is None:
+                frame_wh = (frame.shape[1], frame.shape[0])
+        else:
+            rec_frame = vcap.grab()
+        
+        if not rec_frame:
+            break
+        frame_count += 1
+    t_wall_end, t_cpu_end = perf_counter(), process_time()
+    vcap.release()
+    
+    # Calculate results
+    wall_time_sec = max(1E-9, t_wall_end - t_wall_start)
+    cpu_time_sec = (t_cpu_end - t_cpu_start)
+    decode_fps = (frame_count / wall_time_sec)
+    cpu_usage_pct = 100.0 * (cpu_time_sec / wall_time_sec)
+    
+    return decode_fps, cpu_usage_pct, frame_count, frame_wh
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Get video info
+
+# Get script args
+script_args = parse_benchmark_args()
+video_path = script_args["video_path"]
+max_frames = max(1, script_args["max_frames"])
+
+# Get the video size, which is needed to set up reduced resolution tests
+vcap = cv2.VideoCapture(video_path)
+if not vcap.isOpened():
+    raise IOError("Couldn't open video: {}".format(video_path))
+video_wh = (int(vcap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(vcap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+vcap.release()
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Run benchmarks
+
+print("",
+      "Benchmarking video decoding ({} frames max)".format(max_frames),
+      "@ {}".format(video_path),
+      "  Video size: {} x {}".format(*video_wh),
+      "",
+      "{:<24} {:>10} {:>10} {:>8} {:>12}".format("Test", "FPS", "CPU (%)", "Frames", "Frame size"),
+      "-" * 68,
+      sep = "\n")
+
+test_options_list = build_test_options_list(video_wh)
+for each_name, each_options_dict, each_decode in test_options_list:
+    
+    # Run each test & report the results (or failure)
+    decode_fps, cpu_usage_pct, frame_count, frame_wh = \
+    run_decode_benchmark(video_path, each_options_dict, max_frames, each_decode)
+    if decode_fps is None:
+        print("{:<24} {:>10}".format(each_name, "(failed)"))
+        continue
+    
+    frame_wh_str = "-" if frame_wh is None else "{} x {}".format(*frame_wh)
+    print("{:<24} {:>10.1f} {:>10.1f} {:>8} {:>12}".format(each_name, decode_fps, cpu_usage_pct,
+                                                             frame_count, frame_wh_str))
+
+print("",
+      "Capture options can be set per-camera using the file:",
+      "  (location) > (camera) > resources > capture_options.json",
+      "", sep = "\n")
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Scrap
+
+
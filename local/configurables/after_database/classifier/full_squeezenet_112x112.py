@@ -52,7 +52,9 @@ find_path_to_local()
 from local.configurables.after_database.classifier.reference_classifier import Reference_Classifier
 from local.lib.file_access_utils.classifier import build_model_resources_path
 
-from local.lib.classifier_models.squeezenet_variants import Full_SqueezeNet_112x112
+from local.offline_database.object_reconstruction import Object_Reconstruction as Obj_Recon
+
+from local.lib.classifier_models.squeezenet_variants import Full_SqueezeNet_112x112, set_inference_threads
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -158,48 +160,105 @@ class Configurable(Reference_Classifier):
         # Load model using the (configured) model file
         self.classifier_model = Full_SqueezeNet_112x112.load_model_from_path(self.path_to_model_folder,
                                                                              self.model_file_name_no_ext)
+        self.set_to_inference_mode()
+        set_inference_threads(self.num_threads)
+        
+    # .................................................................................................................
+    
+    def request_object_data(self, object_id, object_database):
+        
+        # Only need the object metadata, reconstruction happens once we know the snapshot sizing
+        object_metadata = object_database.load_metadata_by_id(object_id)
+        
+        return object_metadata
+    
+    # .................................................................................................................
+    
+    def classify_one_object(self, object_data, snapshot_database):
+        
+        # Get cropped images of the object, then ask the classifier for a prediction on each crop (one at a time)
+        cropped_images_list = self._get_object_crops(object_data, snapshot_database)
+        prediction_list = [self.classifier_model.predict(each_image) for each_image in cropped_images_list]
+        
+        return self._build_classification_dicts(prediction_list)
+    
+    # .................................................................................................................
+    
+    def run_batch(self, object_id_list, object_database, snapshot_database):
+        
+        # Collect cropped images across all objects, while recording which object each crop came from
+        all_crops_list = []
+        crop_owner_idx_list = []
+        for each_obj_idx, each_obj_id in enumerate(object_id_list):
+            object_data = self.request_object_data(each_obj_id, object_database)
+            cropped_images_list = self._get_object_crops(object_data, snapshot_database)
+            all_crops_list += cropped_images_list
+            crop_owner_idx_list += [each_obj_idx] * len(cropped_images_list)
+        
+        # Run all crops through the model in batches
+        all_predictions_list = self.classifier_model.predict_batch(all_crops_list, self.batch_size)
         
+        # Scatter predictions back to the objects they came from
+        per_object_predictions_list = [[] for _ in object_id_list]
+        for each_obj_idx, each_prediction in zip(crop_owner_idx_list, all_predictions_list):
+            per_object_predictions_list[each_obj_idx].append(each_prediction)
+        
+        results_list = [self._build_classification_dicts(each_prediction_list)
+                        for each_prediction_list in per_object_predictions_list]
+        
+        return results_list
+    
     # .................................................................................................................
     
-    def classify_one_object(self, object_ref, snapshot_database):
+    def _get_object_crops(self, object_metadata, snapshot_database):
         
         # Get bounding times so we can request snapshots for classification
-        start_epoch_ms, end_epoch_ms = object_ref.get_bounding_epoch_ms()
+        start_epoch_ms = object_metadata["first_epoch_ms"]
+        end_epoch_ms = object_metadata["final_epoch_ms"]
         
         # Get snap times to used for grabbing image data to classify the object
         num_snaps_to_classify = self.number_frames_to_classify
         snap_times = snapshot_database.get_n_snapshot_times(start_epoch_ms, end_epoch_ms, num_snaps_to_classify)
         
-        # Loop over several snapshots to get a 'best guess' at the classification
-        num_snap_times = 0
-        prediction_dict = {}
+        # Loop over several snapshots to get multiple crops of the object, for a 'best guess' at the classification
+        object_ref = None
+        cropped_images_list = []
         for each_snap_time in snap_times:
             
-            # Try to get a cropped image of the object for classification purposes
+            # Reconstruct the object using the snapshot sizing, so cropping co-ordinates line up with the image
+            # (global timing is only used for drawing, so fake values are used)
             snap_image, snap_frame_idx = snapshot_database.load_snapshot_image(each_snap_time)
+            if object_ref is None:
+                snap_height, snap_width = snap_image.shape[0:2]
+                object_ref = Obj_Recon(object_metadata, (snap_width, snap_height), 1, 2)
+            
+            # Try to get a cropped image of the object for classification purposes
             cropped_image = object_ref.crop_image(snap_image, snap_frame_idx, 75, 75)
             if cropped_image is None:
                 continue
-            
-            # Assuming we got a cropped image, ask the classifier for a prediction & accumulat scoring per label
-            pred_label, pred_score = self.classifier_model.predict(cropped_image)
-            prediction_dict[pred_label] = prediction_dict.get(pred_label, 0.0) + pred_score
-            num_snap_times += 1
-            
-        # Loop over all predictions and take the class label that accumulated the highest score
-        highest_score = -1.0
-        best_pred_label = "unknown"
-        for each_label, each_score in prediction_dict.items():
-            if each_score > highest_score:
-                best_pred_label = each_label
-                highest_score = each_score
-        best_score_pct = int(round(100*(highest_score / num_snap_times)))
+            cropped_images_list.append(cropped_image)
+        
+        return cropped_images_list
+    
+    # .................................................................................................................
+    
+    def _build_classification_dicts(self, prediction_list):
+        
+        # Accumulate prediction scores per label
+        prediction_dict = {}
+        for each_label, each_score in prediction_list:
+            prediction_dict[each_label] = prediction_dict.get(each_label, 0.0) + each_score
+        
+        # Average the scores over all predictions, so the highest scoring label ends up as the topclass
+        num_predictions = max(1, len(prediction_list))
+        topclass_dict = {each_label: (each_score / num_predictions)
+                         for each_label, each_score in prediction_dict.items()}
         
         # This model doesn't generate any subclass or attribute data...
-        subclass = ""
-        attributes = {}
+        subclass_dict = {}
+        attributes_dict = {}
         
-        return best_pred_label, best_score_pct, subclass, attributes
+        return topclass_dict, subclass_dict, attributes_dict
 
     # .................................................................................................................
     # .................................................................................................................
@@ -57,6 +57,10 @@ from local.configurables.configurable_template import After_Database_Configurabl
 
 class Reference_Classifier(After_Database_Configurable_Base):
     
+    # Settings for classifiers which support batched processing (see run_batch)
+    batch_size = 32
+    num_threads = 0
+    
     # .................................................................................................................
     
     def __init__(self, location_select_folder_path, camera_select, *, file_dunder):
@@ -98,6 +102,41 @@ class Reference_Classifier(After_Database_Configurable_Base):
         return topclass_dict, subclass_dict, attributes_dict
     
     # .................................................................................................................
+    
+    # MAY OVERRIDE. Only useful for classifiers which are faster when processing many objects at once
+    def run_batch(self, object_id_list, object_database, snapshot_database):
+        
+        '''
+        Alternate to the run() function, which classifies a list of objects in a single call
+        Classifiers that can share work across objects (e.g. batched model inference) should override this,
+        otherwise the reference implementation just runs each object independently
+        
+        Returns:
+            results_list -> (List) List of (topclass_dict, subclass_dict, attributes_dict) tuples,
+                            in the same order as the object id list
+        '''
+        
+        results_list = [self.run(each_obj_id, object_database, snapshot_database) for each_obj_id in object_id_list]
+        
+        return results_list
+    
+    # .................................................................................................................
+    
+    @classmethod
+    def set_batch_settings(cls, batch_size = None, num_threads = None):
+        
+        '''
+        Function used to set the batch processing settings for all classifiers
+        Settings given as None are left unchanged. A thread count of 0 leaves the thread count up to the classifier
+        '''
+        
+        if batch_size is not None:
+            cls.batch_size = max(1, int(batch_size))
+        
+        if num_threads is not None:
+            cls.num_threads = max(0, int(num_threads))
+    
+    # .................................................................................................................
 
     # SHOULD OVERRIDE TO PROVIDE APPROPRIATE DATA FORMAT (E.G. NOT ALL METADATA NEEDS TO BE LOADED/RETURNED)
     def request_object_data(self, object_id, object_database):
@@ -53,6 +53,11 @@ import cv2
 import numpy as np
 
 from local.configurables.core.detector.reference_detector import Reference_Detector, Unclassified_Detection_Object
+from local.configurables.core.detector.reference_detector import Detection_Imaging_Frame
+
+from local.eolib.video.imaging import crop_pixels_in_place, get_nonzero_crop_y1y2x1x2
+from local.eolib.video.imaging import filter_components_by_stats
+from local.eolib.math.geometry import Zone_Label_Raster
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -71,6 +76,9 @@ class Configurable(Reference_Detector):
         # Set up blob detection sizing (parent class should have already done this, but just in case...)
         Unclassified_Detection_Object.set_frame_scaling(*input_wh)
         
+        # Allocate storage for (rasterized) ignore zones
+        self._ignore_zone_raster = None
+        
         # Allocate storage for detections on each frame
         self._detection_ref_dict = {}
         self._rejection_ref_dict = {}
@@ -192,26 +200,35 @@ class Configurable(Reference_Detector):
     # .................................................................................................................
     
     def setup(self, variables_changed_dict):
-        # Controls directly alter detection behaviour, so nothing to do here!
-        pass
+        
+        # Rasterize ignore zones, for fast zone checks on every frame
+        self._ignore_zone_raster = Zone_Label_Raster(self.ignore_zones_list)
         
     # .................................................................................................................
     
     def detections_from_frames(self, binary_frame_1ch, preprocessed_frame):
         
         # Use binary frame data to get blobs indicating where objects are in the scene
-        contour_list = get_contour_list_ocv_3_or_4(binary_frame_1ch)
+        # -> Blobs too small to be valid detections are removed up front, except when configuring,
+        #    so that rejected detections can still be displayed
+        keep_components_func = None if self.configure_mode else self._keep_components_by_size
+        contour_list = get_contour_list_ocv_3_or_4(binary_frame_1ch, keep_components_func)
+        
+        # Create a blob object for each contour found, with all detections sharing the same frame for imaging data
+        imaging_frame = Detection_Imaging_Frame(preprocessed_frame)
+        detections_list = [Unclassified_Detection_Object(each_contour, imaging_frame) for each_contour in contour_list]
+        
+        # Check which detections are inside of ignore zones, all at once
+        xy_centers_list = [each_detection.xy_center_array for each_detection in detections_list]
+        in_ignore_array = self._ignore_zone_raster.points_in_zones(xy_centers_list)
         
         # Fill out bounding box list
         new_detection_ref_dict = {}
         reject_ref_dict = {}
-        for each_idx, each_contour in enumerate(contour_list):
-            
-            # Create a blob object for each contour found
-            new_detection = Unclassified_Detection_Object(each_contour, preprocessed_frame)
+        for each_idx, (new_detection, in_ignore) in enumerate(zip(detections_list, in_ignore_array)):
             
             # Check that the bounding box is correctly sized before adding to list
-            no_ignore = (not new_detection.in_zones(self.ignore_zones_list))
+            no_ignore = (not in_ignore)
             goldi_width = (self.min_width_norm < new_detection.width < self.max_width_norm)
             goldi_height = (self.min_height_norm < new_detection.height < self.max_height_norm)
             if no_ignore and goldi_width and goldi_height:
@@ -225,6 +242,27 @@ class Configurable(Reference_Detector):
         
         return new_detection_ref_dict
     
+    # .................................................................................................................
+    
+    def _keep_components_by_size(self, widths_px, heights_px, areas_px):
+        
+        '''
+        Function used to check which blobs could possibly pass the minimum width/height checks,
+        before building detections. Detection width/height come from the bounding box around the
+        blob outline pixel centers (i.e. 1px less than the blob size), so can be checked early
+        '''
+        
+        # Get detection sizing in pixels (blobs without hull area are given a 1px thick box)
+        det_widths_px = np.maximum(widths_px - 1, 1)
+        det_heights_px = np.maximum(heights_px - 1, 1)
+        
+        # Keep blobs which may be large enough. Uses 1px of slack to stay clear of rounding errors
+        frame_width_px, frame_height_px = self.input_wh
+        goldi_width = (det_widths_px + 1) > (self.min_width_norm * (frame_width_px - 1))
+        goldi_height = (det_heights_px + 1) > (self.min_height_norm * (frame_height_px - 1))
+        
+        return np.logical_and(goldi_width, goldi_height)
+    
     # .................................................................................................................
     # .................................................................................................................
 
@@ -278,7 +316,7 @@ def draw_detections(stage_outputs, configurable_ref,
 
 # .....................................................................................................................
 
-def get_contour_list_ocv_3_or_4(binary_frame):
+def get_contour_list_ocv_3_or_4(binary_frame, keep_components_func = None):
     
     # In OpenCV 3:
     # image, contour_list, hierarchy = cv2.findContours(...)
@@ -286,7 +324,21 @@ def get_contour_list_ocv_3_or_4(binary_frame):
     # In OpenCV 4
     # contour_list, hierarchy = cv2.findContours(...)
     
-    contour_list, _ = cv2.findContours(binary_frame, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2:]
+    # Only search for contours in the region containing non-zero pixels
+    # -> Uses a 1px margin, so that contours don't touch the cropped border (unless touching the frame border)
+    roi_y1y2x1x2 = get_nonzero_crop_y1y2x1x2(binary_frame, margin_px = 1)
+    if roi_y1y2x1x2 is None:
+        return []
+    roi_binary_frame = crop_pixels_in_place(binary_frame, roi_y1y2x1x2)
+    
+    # Remove blobs that can't be valid detections before finding contours, if possible
+    if keep_components_func is not None:
+        roi_binary_frame = filter_components_by_stats(roi_binary_frame, keep_components_func)
+    
+    # Offset contour co-ordinates, so they're relative to the full frame
+    roi_y1, _, roi_x1, _ = roi_y1y2x1x2
+    contour_list, _ = cv2.findContours(roi_binary_frame, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                       offset = (roi_x1, roi_y1))[-2:]
     
     return contour_list
 
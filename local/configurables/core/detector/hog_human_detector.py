@@ -53,6 +53,9 @@ import cv2
 import numpy as np
 
 from local.configurables.core.detector.reference_detector import Reference_Detector, Pedestrian_Detection_Object
+from local.configurables.core.detector.reference_detector import Detection_Imaging_Frame
+
+from local.eolib.math.geometry import Zone_Label_Raster
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -89,6 +92,9 @@ class Configurable(Reference_Detector):
         self._width_detection_scaling = None
         self._height_detection_scaling = None
         
+        # Allocate storage for (rasterized) ignore zones
+        self._ignore_zone_raster = None
+        
         # Allocate storage for detections on each frame
         self._detection_ref_dict = {}
         self._rejection_ref_dict = {}
@@ -248,6 +254,9 @@ class Configurable(Reference_Detector):
         self._width_detection_scaling = (self._hog_frame_wh[0] - 1)
         self._height_detection_scaling = (self._hog_frame_wh[1] - 1)
         
+        # Rasterize ignore zones, for fast zone checks on every frame
+        self._ignore_zone_raster = Zone_Label_Raster(self.ignore_zones_list)
+        
     # .................................................................................................................
     
     def detections_from_frames(self, binary_frame_1ch, preprocessed_frame):
@@ -274,7 +283,8 @@ class Configurable(Reference_Detector):
                                                               padding = self._padding_tuple,
                                                               scale = self.hog_scale)
         
-        # Fill out bounding box list
+        # Fill out bounding box list, with all detections sharing the same frame for imaging data
+        imaging_frame = Detection_Imaging_Frame(preprocessed_frame)
         new_detection_ref_dict = {}
         reject_ref_dict = {}
         for each_idx, (each_weight, (x,y,w,h)) in enumerate(zip(weights_list, rects_list)):
@@ -287,11 +297,11 @@ class Configurable(Reference_Detector):
             
             # Create a 'fake' rectangular contour so we can report it as a detected object contour
             rect_contour = np.float32([(tl_x, tl_y), (br_x, tl_y), (br_x, br_y), (tl_x, br_y)])
-            new_detection = Pedestrian_Detection_Object(rect_contour, preprocessed_frame)
+            new_detection = Pedestrian_Detection_Object(rect_contour, imaging_frame)
             
             # Check that the weight is ok and the bounding box is not inside an ignore zone before adding to list
             below_weight_threshold = (each_weight < self.hog_weight_threshold)
-            if below_weight_threshold or new_detection.in_zones(self.ignore_zones_list):
+            if below_weight_threshold or self._ignore_zone_raster.point_in_zones(new_detection.xy_center_array):
                 reject_ref_dict[each_idx] = new_detection
             else:
                 new_detection_ref_dict[each_idx] = new_detection
@@ -123,6 +123,42 @@ class Reference_Detector(Core_Configurable_Base):
 # /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
 
 
+class Detection_Imaging_Frame:
+    
+    # .................................................................................................................
+    
+    def __init__(self, display_frame):
+        
+        '''
+        Wrapper around the display frame used to get imaging data for all detections on a single frame
+        Detectors should create one of these per frame, and pass it to every detection object, so that
+        frame-wide processing (blurring & hsv conversion) is shared. This processing only happens if
+        some detection actually requests imaging data, which is normally only done periodically by the tracker
+        '''
+        
+        self.display_frame = display_frame
+        self._hsv_frame = None
+    
+    # .................................................................................................................
+    
+    @property
+    def hsv_frame(self):
+        
+        # Blur (to help reduce noise) & convert to hsv (not full!), only on first request
+        if self._hsv_frame is None:
+            blurred_frame = cv2.blur(self.display_frame, (3, 3), borderType = cv2.BORDER_REFLECT)
+            self._hsv_frame = cv2.cvtColor(blurred_frame, cv2.COLOR_BGR2HSV)
+        
+        return self._hsv_frame
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
+
+# /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+# /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+
+
 class Reference_Detection_Object:
     
     _xy_loc_scaling = None
@@ -184,8 +220,10 @@ class Reference_Detection_Object:
         # Store width/height in format that allows reconstruction of tl/br using x/y center coords
         self.width, self.height = np.float32(self.bot_right - self.top_left)
         
-        # Store imaging data
-        self.imaging_data_dict = self._get_imaging_data(display_frame)
+        # Hang on to display frame data, so imaging data can be generated if needed (this is slow!)
+        is_shared_frame = isinstance(display_frame, Detection_Imaging_Frame)
+        self._imaging_frame = display_frame if is_shared_frame else Detection_Imaging_Frame(display_frame)
+        self._imaging_data_dict = None
     
     # .................................................................................................................
     
@@ -194,6 +232,24 @@ class Reference_Detection_Object:
     
     # .................................................................................................................
     
+    @property
+    def imaging_data_dict(self):
+        
+        '''
+        Image-based data (e.g. color proportions), which is only generated on first access
+        Most detections are never used for imaging data (unmatched or in-between tracker samples),
+        so this avoids wasting time processing them
+        '''
+        
+        # Generate imaging data on first access, then drop the frame data since we don't need it anymore
+        if self._imaging_data_dict is None:
+            self._imaging_data_dict = self._get_imaging_data(self._imaging_frame)
+            self._imaging_frame = None
+        
+        return self._imaging_data_dict
+    
+    # .................................................................................................................
+    
     @classmethod
     def set_frame_scaling(cls, frame_width_px, frame_height_px):
         cls._xy_loc_scaling = 1.0 / np.float32((frame_width_px - 1, frame_height_px - 1))
@@ -237,16 +293,16 @@ class Reference_Detection_Object:
     
     # .................................................................................................................
     
-    def _get_imaging_data(self, display_frame):
+    def _get_imaging_data(self, imaging_frame):
         
         ''' Function used to bundle together all image-based data values to be included in metadata '''
         
-        # Crop detection from display for further processing
-        cropped_frame = self._get_cropped_display(display_frame)
+        # Crop detection from the (shared) hsv display for further processing
+        cropped_hsv_frame = self._get_cropped_display(imaging_frame.hsv_frame)
         
         # Bin + count pixel colors
-        masked_bgr_rows = self._get_row_of_masked_pixels(cropped_frame)
-        color_proportions = self._get_hsv_color_proportions(masked_bgr_rows)
+        masked_hsv_rows = self._get_row_of_masked_pixels(cropped_hsv_frame)
+        color_proportions = self._get_hsv_color_proportions(masked_hsv_rows)
         
         # Build imaging data
         imaging_data_dict = {"color_proportions": color_proportions}
@@ -255,12 +311,12 @@ class Reference_Detection_Object:
     
     # .................................................................................................................
     
-    def _get_cropped_display(self, display_frame, max_dimension = 50, blur_size = 3):
+    def _get_cropped_display(self, display_frame, max_dimension = 50):
         
         '''
         Helper function which takes in a display image and crops down
         to the bounding box of this detection (based on the hull)
-        Also downscales the result if it is too large and applies bluring
+        Also downscales the result if it is too large
         '''
         
         # Get display scaling
@@ -286,9 +342,6 @@ class Reference_Detection_Object:
             scale_wh = (scale_width, scale_height)
             color_crop_px = cv2.resize(color_crop_px, dsize = scale_wh, interpolation = cv2.INTER_NEAREST)
         
-        # Apply blurring to help reduce noise
-        color_crop_px = cv2.blur(color_crop_px, (3, 3), borderType = cv2.BORDER_REFLECT)
-        
         return color_crop_px
     
     # .................................................................................................................
@@ -297,7 +350,7 @@ class Reference_Detection_Object:
         
         '''
         Helper function which takes a cropped frame, applies masking based on the detection hull,
-        then indexes out only the pixels within the hull. Outputs as a single row of bgr values,
+        then indexes out only the pixels within the hull. Outputs as a single row of (3-channel) pixel values,
         assuming N pixels remain after masking, the result will have shape: N x 1 x 3
         '''
         
@@ -312,17 +365,17 @@ class Reference_Detection_Object:
         # Convert the mask to a 1D logical aray and use it to index out pixels from the cropped image
         # Note: this results in a listing of pixel values, not a useable image!
         hull_mask_1ch_logical = (hull_mask_1ch > 0)
-        masked_bgr_rows = cropped_frame[hull_mask_1ch_logical, :]
+        masked_rows = cropped_frame[hull_mask_1ch_logical, :]
         
         # Convert back to an 'image' format (this way we can directly use opencv functions on the result)
         # -> Result will have dimensions of N x 1 x 3 as opposed to being N x 3
-        masked_bgr_rows = np.expand_dims(masked_bgr_rows, 1)
+        masked_rows = np.expand_dims(masked_rows, 1)
         
-        return masked_bgr_rows
+        return masked_rows
     
     # .................................................................................................................
     
-    def _get_hsv_color_proportions(self, bgr_rows):
+    def _get_hsv_color_proportions(self, hsv_rows):
         
         '''
         Helper function used to bin pixels into 8 regions which can be described (roughly) as follows: 
@@ -348,11 +401,10 @@ class Reference_Detection_Object:
         L represents the 'light' segment,
         and H represents different hue segments
         Note that there are 6 separate hue segments (RYGCBM) which wrap around the cylinder (not shown)
-        '''
         
-        # Convert to hsv (not full!) so we can more easily define meaninngful color bins
-        # hsv mapping: hue -> [0, 179], sat -> [0, 255], val -> [0, 255]
-        hsv_rows = cv2.cvtColor(bgr_rows, cv2.COLOR_BGR2HSV)
+        Input pixels are expected to already be in hsv (not full!) format, so that bins are meaningful
+        hsv mapping: hue -> [0, 179], sat -> [0, 255], val -> [0, 255]
+        '''
         
         # For clarity
         low_sat_l = 63
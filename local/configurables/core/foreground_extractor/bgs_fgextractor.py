@@ -58,6 +58,7 @@ from local.configurables.core.foreground_extractor.reference_fgextractor import
 
 from local.eolib.video.persistence import Frame_Deck
 from local.eolib.video.imaging import get_2d_kernel, create_morphology_element, make_mask_1ch
+from local.eolib.video.imaging import crop_pixels_in_place, paste_crop_into_blank_frame
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -83,6 +84,9 @@ class Configurable(Reference_FG_Extractor):
         
         # Allocate space for dervied variables
         self._scaled_mask_image = None
+        self._roi_y1y2x1x2 = None
+        self._roi_mask_image = None
+        self._roi_wh = None
         self._downscale_wh = None
         self._pre_blur_kernel = None
         self._post_blur_kernel = None
@@ -334,9 +338,17 @@ class Configurable(Reference_FG_Extractor):
         mask_is_meaningful = (np.min(self._scaled_mask_image) == 0)
         self._enable_masking_optimized = (self.enable_masking and mask_is_meaningful)
         
-        # Set up frame decks if needed
+        # Restrict processing to the masked-in region, with enough margin to cover blurring/morphology
+        prev_roi_y1y2x1x2 = self._roi_y1y2x1x2
+        roi_margin_px = self.pre_blur_size + self.post_blur_size + 2 * (self.pre_morph_size + self.post_morph_size)
+        self._roi_y1y2x1x2, self._roi_mask_image = \
+        self.build_roi_masking(self._scaled_mask_image, self._enable_masking_optimized, roi_margin_px)
+        self._roi_wh = self._roi_mask_image.shape[1::-1]
+        
+        # Set up frame decks if needed (decks hold frames cropped to the roi, so resize them if it changes)
         self._sum_deck = self._setup_decks()
-        if "downscale_factor" in variables_changed_dict.keys():
+        roi_changed = (self._roi_y1y2x1x2 != prev_roi_y1y2x1x2)
+        if "downscale_factor" in variables_changed_dict.keys() or roi_changed:
             self._update_decks()
         
         # Update the background image if possible
@@ -348,8 +360,10 @@ class Configurable(Reference_FG_Extractor):
     
     def _setup_decks(self, reset_all = False):
         
-        # Get the input frame size, so we can initialize decks with properly sized blank frames
+        # Get the (cropped) input frame size, so we can initialize decks with properly sized blank frames
         scaled_width, scaled_height = scale_factor_downscale(self.input_wh, self.downscale_factor)
+        if self._roi_wh is not None:
+            scaled_width, scaled_height = self._roi_wh
         input_shape = (scaled_height, scaled_width, 3)
         gray_shape = input_shape[0:2]
         
@@ -367,12 +381,10 @@ class Configurable(Reference_FG_Extractor):
     def _update_decks(self):
         
         # For simplicity
-        resize_kwargs = {"dsize": self._downscale_wh, "interpolation": self.downscale_interpolation}
+        resize_kwargs = {"dsize": self._roi_wh, "interpolation": self.downscale_interpolation}
         
         # Update summation frames
-        for each_idx, each_frame in self._sum_deck.iterate_all():
-            new_frame = cv2.resize(each_frame, **resize_kwargs)
-            self._sum_deck.modify_one(each_idx, new_frame)
+        self._sum_deck.modify_all(lambda each_frame: cv2.resize(each_frame, **resize_kwargs))
         
         return
     
@@ -410,9 +422,10 @@ class Configurable(Reference_FG_Extractor):
         if self._enable_post_morph:
             frame = cv2.morphologyEx(frame, op = self.post_morph_op, kernel = self._post_morph_element)
         
-        # Apply masking
+        # Apply masking & restore the full frame size, if we processed a cropped region
         if self._enable_masking_optimized:
-            frame = cv2.bitwise_and(frame, self._scaled_mask_image)
+            frame = cv2.bitwise_and(frame, self._roi_mask_image)
+            frame = paste_crop_into_blank_frame(frame, self._downscale_wh, self._roi_y1y2x1x2)
         
         return frame
     
@@ -424,6 +437,9 @@ class Configurable(Reference_FG_Extractor):
         if self._enable_downscale:
             frame = cv2.resize(frame, dsize = self._downscale_wh, interpolation = self.downscale_interpolation)
         
+        # Crop to the region-of-interest, so we don't waste time processing masked-off areas
+        frame = crop_pixels_in_place(frame, self._roi_y1y2x1x2)
+        
         # Apply pre-blurring
         if self._enable_pre_blur:
             frame = cv2.blur(frame, self._pre_blur_kernel)
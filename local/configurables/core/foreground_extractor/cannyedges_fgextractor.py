@@ -375,14 +375,10 @@ class Configurable(Reference_FG_Extractor):
         resize_kwargs = {"dsize": self._downscale_wh, "interpolation": self.downscale_interpolation}
         
         # Apply scaling update to difference frames
-        for each_idx, each_frame in self._diff_deck.iterate_all():
-            new_frame = cv2.resize(each_frame, **resize_kwargs)
-            self._diff_deck.modify_one(each_idx, new_frame)
+        self._diff_deck.modify_all(lambda each_frame: cv2.resize(each_frame, **resize_kwargs))
         
         # Update summation frames
-        for each_idx, each_frame in self._sum_deck.iterate_all():
-            new_frame = cv2.resize(each_frame, **resize_kwargs)
-            self._sum_deck.modify_one(each_idx, new_frame)
+        self._sum_deck.modify_all(lambda each_frame: cv2.resize(each_frame, **resize_kwargs))
         
         return
     
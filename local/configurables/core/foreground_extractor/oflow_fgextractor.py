@@ -263,7 +263,8 @@ class Configurable(Reference_FG_Extractor):
         # Initialize the summation deck if needed
         flow_deck = self._flow_deck
         if flow_deck is None or reset_all:
-            deck_length = (1 + self._max_deck_length) if self.configure_mode else (1 + self.flow_depth)
+            # Note: Need at least 2 entries, so the previous frame isn't overwritten when adding the newest frame
+            deck_length = (1 + self._max_deck_length) if self.configure_mode else (1 + max(1, self.flow_depth))
             flow_deck = Frame_Deck(deck_length)
             flow_deck.fill_with_blank_shape(gray_shape)
         
@@ -277,9 +278,7 @@ class Configurable(Reference_FG_Extractor):
         resize_kwargs = {"dsize": self._downscale_wh, "interpolation": self.downscale_interpolation}
         
         # Update summation frames
-        for each_idx, each_frame in self._flow_deck.iterate_all():
-            new_frame = cv2.resize(each_frame, **resize_kwargs)
-            self._flow_deck.modify_one(each_idx, new_frame)
+        self._flow_deck.modify_all(lambda each_frame: cv2.resize(each_frame, **resize_kwargs))
         
         return
     
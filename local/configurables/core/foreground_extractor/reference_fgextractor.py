@@ -55,6 +55,8 @@ from local.lib.common.images import blank_frame_from_frame_wh
 
 from local.configurables.configurable_template import Core_Configurable_Base
 
+from local.eolib.video.imaging import crop_pixels_in_place, get_nonzero_crop_y1y2x1x2
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define classes
@@ -145,13 +147,50 @@ class Reference_FG_Extractor(Core_Configurable_Base):
         
         # Apply background processing to the clean frame data & store it for use in fg-extraction
         if self._clean_bg_frame is not None:
-            new_bg_frame = self._clean_bg_frame.copy()
-            self._processed_bg_frame = self.process_background_frame(new_bg_frame)
+            self._processed_bg_frame = self.process_background_frame(self._clean_bg_frame)
         
         return
     
     # .................................................................................................................
     
+    # SHOULDN'T OVERRIDE
+    def build_roi_masking(self, scaled_mask_image, enable_masking, roi_margin_px = 0):
+        
+        '''
+        Helper function, used to find the region-of-interest (ROI) of a masking image, so that processing
+        can be restricted to the masked-in area, instead of the full frame.
+        The ROI is the bounding box around the masked-in area, expanded by a margin. The margin should cover
+        the reach of any blurring/morphology, so that results inside the mask aren't changed by cropping!
+        If masking isn't enabled (or the mask is entirely blank), the ROI covers the full frame
+        
+        Inputs:
+            scaled_mask_image -> (Image data) Single-channel mask image, white in areas that are masked-in
+            
+            enable_masking -> (Boolean) If False, the ROI will cover the full frame
+            
+            roi_margin_px -> (Integer) Number of pixels to expand the ROI on all sides
+        
+        Outputs:
+            roi_y1y2x1x2, roi_mask_image (i.e. the mask image cropped to the ROI)
+        '''
+        
+        # Find the box around the masked-in area, if possible
+        roi_y1y2x1x2 = None
+        if enable_masking:
+            roi_y1y2x1x2 = get_nonzero_crop_y1y2x1x2(scaled_mask_image, roi_margin_px)
+        
+        # Fallback to processing the full frame if we don't get an ROI
+        if roi_y1y2x1x2 is None:
+            mask_height, mask_width = scaled_mask_image.shape[0:2]
+            roi_y1y2x1x2 = (0, mask_height, 0, mask_width)
+        
+        # Crop the mask image to match the ROI, so it can be applied to cropped frames directly
+        roi_mask_image = crop_pixels_in_place(scaled_mask_image, roi_y1y2x1x2)
+        
+        return roi_y1y2x1x2, roi_mask_image
+    
+    # .................................................................................................................
+    
     # SHOULDN'T OVERRIDE. Instead override process_current_frame(...) function
     def _apply_fg_extraction(self, frame):
         
@@ -162,8 +201,8 @@ class Reference_FG_Extractor(Core_Configurable_Base):
         '''
         
         try:
-            # Perform all frame processing on each new frame (as a copy, so we don't mess up the original!)
-            return self.process_current_frame(frame.copy())
+            # Perform all frame processing on each new frame (not copied, processing must not modify the original!)
+            return self.process_current_frame(frame)
             
         except cv2.error as err:
             self.log("ERROR APPLY FG EXTRACTION ({})".format(self.script_name))
@@ -185,7 +224,7 @@ class Reference_FG_Extractor(Core_Configurable_Base):
         if bg_update or (self._processed_bg_frame is None):
             
             # Store the 'clean' background for reference & apply processing update
-            self._clean_bg_frame = preprocessed_background_frame.copy()
+            self._clean_bg_frame = preprocessed_background_frame
             self.apply_background_processing()
         
         return
@@ -199,6 +238,7 @@ class Reference_FG_Extractor(Core_Configurable_Base):
         Main function to override in sub-classes
         This function should perform necessary foreground-extraction on each incoming frame
         The function should return single-channel binary frame
+        Note: The incoming frame is shared with other stages, it must not be modified in-place!
         '''
         
         # Place frame processing here. Should return a single-channel binary image!
@@ -217,6 +257,7 @@ class Reference_FG_Extractor(Core_Configurable_Base):
         This function is meant to perform any pre-processing on incoming background frames needed
         to make use of the background for performing fg-extraction.
         If a background image is not needed, then this function can be overrided and return the incoming frame
+        Note: The incoming frame is shared with other stages, it must not be modified in-place!
         '''
         
         # Place background processing here
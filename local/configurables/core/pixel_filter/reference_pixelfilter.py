@@ -53,6 +53,8 @@ import cv2
 
 from local.configurables.configurable_template import Core_Configurable_Base
 
+from local.eolib.video.imaging import crop_pixels_in_place, get_nonzero_crop_y1y2x1x2, paste_crop_into_blank_frame
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define classes
@@ -123,6 +125,40 @@ class Reference_Pixel_Filter(Core_Configurable_Base):
     
     # .................................................................................................................
     
+    # SHOULDN'T OVERRIDE
+    def apply_filter_within_roi(self, binary_frame_1ch, scaled_color_frame, color_filter_func):
+        
+        '''
+        Helper function, used to apply a color filter only within the region-of-interest (ROI) of the binary frame,
+        which is the bounding box around all non-zero pixels. Since the filter result is combined with the
+        binary frame, there is no need to filter areas that don't contain any foreground pixels!
+        
+        Inputs:
+            binary_frame_1ch -> (Image data) Binary frame, from the foreground extractor
+            
+            scaled_color_frame -> (Image data) Color frame, sized to match the binary frame
+            
+            color_filter_func -> (Function) Should take a color frame and return a single-channel filter mask
+        
+        Outputs:
+            filtered_binary_frame_1ch
+        '''
+        
+        # Don't bother filtering if there are no foreground pixels
+        roi_y1y2x1x2 = get_nonzero_crop_y1y2x1x2(binary_frame_1ch)
+        if roi_y1y2x1x2 is None:
+            return binary_frame_1ch
+        
+        # Filter the cropped color data & combine with the cropped binary frame
+        roi_binary_frame_1ch = crop_pixels_in_place(binary_frame_1ch, roi_y1y2x1x2)
+        roi_color_frame = crop_pixels_in_place(scaled_color_frame, roi_y1y2x1x2)
+        roi_filter_mask = color_filter_func(roi_color_frame)
+        roi_filtered_binary_frame_1ch = cv2.bitwise_and(roi_filter_mask, roi_binary_frame_1ch)
+        
+        return paste_crop_into_blank_frame(roi_filtered_binary_frame_1ch, self.input_wh, roi_y1y2x1x2)
+    
+    # .................................................................................................................
+    
     # SHOULD OVERRIDE IF USING THE BACKGROUND IMAGE (can be used to store it, for example)
     def update_background(self, preprocessed_background_frame, bg_update):
         
@@ -186,8 +186,14 @@ class Configurable(Reference_Pixel_Filter):
             if not self.enable_filter:
                 return binary_frame_1ch
             
-            # Generate filter mask
+            # Match the color frame to the binary frame sizing
             scaled_color_frame = cv2.resize(color_frame, dsize = self.input_wh)
+            
+            # Only filter the region containing foreground pixels, unless configuring (so the mask can be displayed)
+            if not self.configure_mode:
+                return self.apply_filter_within_roi(binary_frame_1ch, scaled_color_frame, self._color_filter)
+            
+            # Generate filter mask
             self.filter_mask = self._color_filter(scaled_color_frame)
             
             # Apply color mask to existing binary frame
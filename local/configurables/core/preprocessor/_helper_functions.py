@@ -49,8 +49,16 @@ find_path_to_local()
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Imports
 
+import json
+import hashlib
+
+from zipfile import BadZipFile
+
+import cv2
 import numpy as np
 
+from time import perf_counter
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define classes
@@ -125,6 +133,195 @@ def unwarp_from_mapping(warped_input_xy, input_wh, output_wh, x_mapping, y_mappi
 # .....................................................................................................................
 # .....................................................................................................................
 
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Define remapping functions
+
+# Version of the remap cache data, included in every cache key
+# -> Must be incremented whenever a change is made to how mappings are built (in any preprocessor),
+#    so that caches saved by older code are rebuilt instead of silently re-used
+_REMAP_CACHE_VERSION = 1
+
+# .....................................................................................................................
+
+def build_fixed_point_remap(x_mapping, y_mapping, interpolation_type):
+    
+    '''
+    Function which converts floating point x/y mappings (as used by cv2.remap(...)) into the
+    fixed-point (CV_16SC2) format, which is considerably faster to remap with.
+    Fixed-point mappings sample at 1/32 of a pixel (or at integer pixels for nearest-neighbour interpolation).
+    
+    Falls back to returning the original (float32) mappings if the mapping co-ordinates
+    are too large to be represented in fixed-point format.
+    
+    Inputs:
+        x_mapping, y_mapping -> (Float arrays) The x/y mappings, as would be given to cv2.remap(...)
+        
+        interpolation_type -> (Integer) The opencv interpolation code that will be used when remapping
+    
+    Outputs:
+        remap_tables -> (Tuple) Mappings to be used as: cv2.remap(frame, *remap_tables, interpolation_type)
+    '''
+    
+    # Make sure the mappings are in float32 format, as needed by opencv
+    x_mapping_f32 = np.float32(x_mapping)
+    y_mapping_f32 = np.float32(y_mapping)
+    
+    # Fixed-point co-ordinates are stored as 16-bit integers, so can't use extremely large mapping values
+    max_abs_value = max(np.max(np.abs(x_mapping_f32)), np.max(np.abs(y_mapping_f32)))
+    if max_abs_value > 32000:
+        return (x_mapping_f32, y_mapping_f32)
+    
+    # Nearest-neighbour interpolation only requires integer co-ordinates (second map is not needed)
+    use_nearest = (interpolation_type == cv2.INTER_NEAREST)
+    fixed_xy_map, fixed_interp_map = cv2.convertMaps(x_mapping_f32, y_mapping_f32, cv2.CV_16SC2,
+                                                     nninterpolation = use_nearest)
+    
+    return (fixed_xy_map, fixed_interp_map)
+
+# .....................................................................................................................
+
+def check_fixed_point_remap_accuracy(x_mapping, y_mapping, remap_tables, input_wh):
+    
+    '''
+    Function used to check how closely fixed-point remap tables match the original (float) x/y mappings
+    Only mapping co-ordinates that land inside the input frame are checked, since all other
+    co-ordinates sample the (constant) border either way.
+    
+    Returns:
+        max_error_px -> (Float) The largest difference (in pixels) between the fixed-point & float mappings.
+                        Should be no more than 1/64 of a pixel for interpolated remapping, and zero
+                        for nearest-neighbour remapping (compared to rounded float co-ordinates)
+    '''
+    
+    # Tables are not fixed-point, so there is no error
+    fixed_xy_map, fixed_interp_map = remap_tables
+    if fixed_xy_map.dtype != np.int16:
+        return 0.0
+    
+    # Convert fixed-point maps back into float co-ordinates, which can be compared to the original mapping
+    x_mapping_f32, y_mapping_f32 = np.float32(x_mapping), np.float32(y_mapping)
+    use_nearest = (fixed_interp_map is None)
+    if use_nearest:
+        recon_x, recon_y = np.float32(fixed_xy_map[:, :, 0]), np.float32(fixed_xy_map[:, :, 1])
+        x_mapping_f32, y_mapping_f32 = np.round(x_mapping_f32), np.round(y_mapping_f32)
+    else:
+        recon_x, recon_y = cv2.convertMaps(fixed_xy_map, fixed_interp_map, cv2.CV_32FC1)
+    
+    # Only check co-ordinates which sample from inside the input frame
+    input_width, input_height = input_wh
+    in_bounds = (x_mapping_f32 >= 0) & (x_mapping_f32 <= input_width - 1) \
+                & (y_mapping_f32 >= 0) & (y_mapping_f32 <= input_height - 1)
+    if not np.any(in_bounds):
+        return 0.0
+    
+    x_error = np.max(np.abs(recon_x[in_bounds] - x_mapping_f32[in_bounds]))
+    y_error = np.max(np.abs(recon_y[in_bounds] - y_mapping_f32[in_bounds]))
+    
+    return float(max(x_error, y_error))
+
+# .....................................................................................................................
+
+def time_remap_tables(input_wh, remap_tables, interpolation_type, num_iterations = 3):
+    
+    '''
+    Function used to measure how long it takes to remap a (blank) frame using the given remap tables
+    Used to confirm that fixed-point tables are actually faster than float mappings,
+    since the relative speed depends on the opencv version & the shape of the mapping
+    
+    Returns:
+        best_time_sec
+    '''
+    
+    # Create a blank frame for timing, since the pixel values don't affect remapping speed
+    input_width, input_height = input_wh
+    blank_frame = np.zeros((input_height, input_width, 3), dtype = np.uint8)
+    
+    # Keep the fastest time, to reduce the influence of other processes
+    best_time_sec = None
+    for _ in range(max(1, num_iterations)):
+        t1 = perf_counter()
+        cv2.remap(blank_frame, *remap_tables, interpolation_type)
+        t2 = perf_counter()
+        iter_time_sec = (t2 - t1)
+        best_time_sec = iter_time_sec if best_time_sec is None else min(best_time_sec, iter_time_sec)
+    
+    return best_time_sec
+
+# .....................................................................................................................
+
+def build_remap_cache_key(*key_data):
+    
+    '''
+    Function used to build a (string) key from json-friendly data, used to check if cached mappings are valid
+    The cache version is always included, so that code changes can invalidate older caches
+    '''
+    
+    key_json = json.dumps((_REMAP_CACHE_VERSION, *key_data), sort_keys = True, default = str)
+    
+    return hashlib.sha1(key_json.encode("utf-8")).hexdigest()
+
+# .....................................................................................................................
+
+def load_remap_cache(cache_file_path, cache_key):
+    
+    '''
+    Function used to load cached x/y mappings & remap tables
+    
+    Returns:
+        None (if the cache is missing/invalid) or x_mapping, y_mapping, remap_tables
+    '''
+    
+    # Bail if there is no cache file
+    if not os.path.exists(cache_file_path):
+        return None
+    
+    # Try to load the cache data, but don't fail if something is wrong with it (we'll just rebuild)
+    # -> Empty or truncated files (e.g. from an interrupted save) raise eof/zip errors
+    try:
+        with np.load(cache_file_path, allow_pickle = False) as cache_data:
+            
+            # Don't use the cached data if it was saved for different settings
+            saved_key = str(cache_data["cache_key"])
+            if saved_key != cache_key:
+                return None
+            
+            x_mapping = cache_data["x_mapping"]
+            y_mapping = cache_data["y_mapping"]
+            remap_table_1 = cache_data["remap_table_1"]
+            remap_table_2 = cache_data["remap_table_2"] if "remap_table_2" in cache_data else None
+            
+    except (OSError, KeyError, ValueError, EOFError, BadZipFile):
+        return None
+    
+    return x_mapping, y_mapping, (remap_table_1, remap_table_2)
+
+# .....................................................................................................................
+
+def save_remap_cache(cache_file_path, cache_key, x_mapping, y_mapping, remap_tables):
+    
+    ''' Function used to save x/y mappings & remap tables, so they don't need to be rebuilt on start-up '''
+    
+    # Bundle data for saving (fixed-point, nearest-neighbour remap tables don't have a second table)
+    remap_table_1, remap_table_2 = remap_tables
+    save_data_dict = {"cache_key": np.array(cache_key),
+                      "x_mapping": x_mapping,
+                      "y_mapping": y_mapping,
+                      "remap_table_1": remap_table_1}
+    if remap_table_2 is not None:
+        save_data_dict["remap_table_2"] = remap_table_2
+    
+    # Save to a temporary file first, so that a partially written file is never loaded
+    os.makedirs(os.path.dirname(cache_file_path), exist_ok = True)
+    temp_file_path = "{}.tmp.npz".format(cache_file_path)
+    np.savez(temp_file_path, **save_data_dict)
+    os.replace(temp_file_path, cache_file_path)
+    
+    return
+
+# .....................................................................................................................
+# .....................................................................................................................
+
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Demo
     
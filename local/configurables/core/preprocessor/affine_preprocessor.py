@@ -76,6 +76,7 @@ class Configurable(Reference_Preprocessor):
         # Allocate storage for calculated mapping
         self._x_mapping = None
         self._y_mapping = None
+        self._remap_tables = None
         
         # .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  . Control Group 1 .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  .
         
@@ -270,7 +271,8 @@ class Configurable(Reference_Preprocessor):
                                   or self.enable_shearing 
                                   or self.enable_translation)
         
-        self.build_mapping()
+        # Rebuild the x/y transformation mappings (or load them from cache)
+        self._x_mapping, self._y_mapping, self._remap_tables = self.build_remap_tables(self.build_mapping)
     
     # .................................................................................................................
     
@@ -281,7 +283,7 @@ class Configurable(Reference_Preprocessor):
             return frame
         
         try:
-            return cv2.remap(frame, self._x_mapping, self._y_mapping, self.interpolation_type)
+            return cv2.remap(frame, *self._remap_tables, self.interpolation_type)
         
         except cv2.error as err:
             self.log("ERROR TRANSFORMING ({})".format(self.script_name))
@@ -327,8 +329,10 @@ class Configurable(Reference_Preprocessor):
         out_x_norm_map, out_y_norm_map, _ = np.tensordot(total_transform, xyz_matrix, 1)
         
         # Convert normalized (transformed) co-ordinates back into pixel co-ords
-        self._x_mapping = input_width * (max_x + out_x_norm_map) / (2.0 * max_x)
-        self._y_mapping = input_height * (max_y + out_y_norm_map) / (2.0 * max_y)
+        x_mapping = input_width * (max_x + out_x_norm_map) / (2.0 * max_x)
+        y_mapping = input_height * (max_y + out_y_norm_map) / (2.0 * max_y)
+        
+        return x_mapping, y_mapping
       
     # .................................................................................................................
     
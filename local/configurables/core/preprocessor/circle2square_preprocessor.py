@@ -71,6 +71,11 @@ class Configurable(Reference_Preprocessor):
         # Inherit reference functionality
         super().__init__(location_select_folder_path, camera_select, input_wh, file_dunder = __file__)
         
+        # Allocate storage for calculated mapping
+        self.x_mapping = None
+        self.y_mapping = None
+        self._remap_tables = None
+        
         # .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  . Control Group 1 .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  .
         
         self.ctrl_spec.new_control_group("Transformation Controls")
@@ -211,8 +216,8 @@ class Configurable(Reference_Preprocessor):
     
     def setup(self, variables_changed_dict):
         
-        # Rebuild the x/y transformation mappings
-        self.build_mapping()
+        # Rebuild the x/y transformation mappings (or load them from cache)
+        self.x_mapping, self.y_mapping, self._remap_tables = self.build_remap_tables(self.build_mapping)
         
     # .................................................................................................................
     
@@ -223,7 +228,7 @@ class Configurable(Reference_Preprocessor):
             return frame
         
         try:
-            return cv2.remap(frame, self.x_mapping, self.y_mapping, self.interpolation_type)
+            return cv2.remap(frame, *self._remap_tables, self.interpolation_type)
         except cv2.error as err:
             self.log("ERROR TRANSFORMING ({})".format(self.script_name))
             if self.configure_mode:
@@ -270,8 +275,10 @@ class Configurable(Reference_Preprocessor):
                                                               x_center = 0.5, y_center = 0.5)
         
         # Convert normalized circular co-ordinates back into pixel co-ords
-        self.x_mapping = mid_x * (rot_x_recenter + rot_circ_x)
-        self.y_mapping = mid_y * (rot_y_recenter + rot_circ_y) 
+        x_mapping = mid_x * (rot_x_recenter + rot_circ_x)
+        y_mapping = mid_y * (rot_y_recenter + rot_circ_y)
+        
+        return x_mapping, y_mapping
     
     # .................................................................................................................
     
@@ -81,6 +81,7 @@ class Configurable(Reference_Preprocessor):
         # Allocate storage for calculated mapping
         self.x_mapping = None
         self.y_mapping = None
+        self._remap_tables = None
         
         # .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  . Control Group 1 .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  .
         
@@ -195,7 +196,8 @@ class Configurable(Reference_Preprocessor):
     
     def setup(self, variable_update_dictionary):
         
-        self.x_mapping, self.y_mapping = self.build_mapping()
+        # Rebuild the x/y transformation mappings (or load them from cache)
+        self.x_mapping, self.y_mapping, self._remap_tables = self.build_remap_tables(self.build_mapping)
         
         return
     
@@ -296,7 +298,7 @@ class Configurable(Reference_Preprocessor):
             return frame
         
         try:
-            return cv2.remap(frame, self.x_mapping, self.y_mapping, self.interpolation_type)
+            return cv2.remap(frame, *self._remap_tables, self.interpolation_type)
         
         except cv2.error as err:
             self.log("ERROR TRANSFORMING ({})".format(self.script_name))
@@ -73,6 +73,7 @@ class Configurable(Reference_Preprocessor):
         # Allocate storage for calculated mapping
         self.x_mapping = None
         self.y_mapping = None
+        self._remap_tables = None
         self.output_w = None
         self.output_h = None        
         
@@ -220,8 +221,8 @@ class Configurable(Reference_Preprocessor):
     
     def setup(self, variable_update_dictionary):
 
-        # Rebuild the x/y transformation mappings
-        self.build_mapping()
+        # Rebuild the x/y transformation mappings (or load them from cache)
+        self.x_mapping, self.y_mapping, self._remap_tables = self.build_remap_tables(self.build_mapping)
     
     # .................................................................................................................
     
@@ -232,7 +233,7 @@ class Configurable(Reference_Preprocessor):
             return frame
         
         try:
-            return cv2.remap(frame, self.x_mapping, self.y_mapping, self.interpolation_type)
+            return cv2.remap(frame, *self._remap_tables, self.interpolation_type)
         
         except cv2.error as err:
             self.log("ERROR TRANSFORMING ({})".format(self.script_name))
@@ -389,8 +390,8 @@ class Configurable(Reference_Preprocessor):
         y_ar_scale = 2 - min(1.0, input_ar_balance)
         
         # Finally, generate convert the transformed mappings into pixel indices
-        self.x_mapping = cen_x_px + (mapped_nx_mesh/2) * (in_width_scaling * out_apt_orig * x_ar_scale)
-        self.y_mapping = cen_y_px + (mapped_ny_mesh/2) * (in_height_scaling * out_apt_orig * y_ar_scale)
+        x_mapping = cen_x_px + (mapped_nx_mesh/2) * (in_width_scaling * out_apt_orig * x_ar_scale)
+        y_mapping = cen_y_px + (mapped_ny_mesh/2) * (in_height_scaling * out_apt_orig * y_ar_scale)
     
         # . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . . 
         
@@ -402,6 +403,8 @@ class Configurable(Reference_Preprocessor):
         self._in_apert_xy_px = np.int32(np.round(in_aperture_radius_px))        
         self._out_apert_xy_px = np.int32(np.round(out_aperture_radius_px))
         self._cen_xy = np.int32(np.round((cen_x_px, cen_y_px)))
+        
+        return x_mapping, y_mapping
     
     # .................................................................................................................
     
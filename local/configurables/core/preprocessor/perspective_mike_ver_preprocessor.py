@@ -72,6 +72,7 @@ class Configurable(Reference_Preprocessor):
         # Allocate storage for calculated mapping
         self.x_mapping = None
         self.y_mapping = None
+        self._remap_tables = None
         
         # Allocate storage for calculated values
         self._extended_quad_px = None
@@ -312,9 +313,10 @@ class Configurable(Reference_Preprocessor):
         self._output_h = output_h
         self.set_output_wh()
         
-        # Rebuild the x/y transformation mappings
-        self.x_mapping, self.y_mapping = \
-        self.build_mapping(self._output_w, self._output_h, zone_tl, zone_tr, zone_br, zone_bl)
+        # Rebuild the x/y transformation mappings (or load them from cache)
+        self.x_mapping, self.y_mapping, self._remap_tables = \
+        self.build_remap_tables(self.build_mapping,
+                                self._output_w, self._output_h, zone_tl, zone_tr, zone_br, zone_bl)
     
     # .................................................................................................................
     
@@ -325,7 +327,7 @@ class Configurable(Reference_Preprocessor):
             return frame
         
         try:
-            return cv2.remap(frame, self.x_mapping, self.y_mapping, self.interpolation_type)
+            return cv2.remap(frame, *self._remap_tables, self.interpolation_type)
         
         except cv2.error as err:
             self.log("ERROR TRANSFORMING ({})".format(self.script_name))
@@ -73,6 +73,7 @@ class Configurable(Reference_Preprocessor):
         # Allocate storage for calculated mapping
         self.x_mapping = None
         self.y_mapping = None
+        self._remap_tables = None
         self._in_to_out_matrix = None
         self._out_to_in_matrix = None
         
@@ -229,8 +230,9 @@ class Configurable(Reference_Preprocessor):
         self._in_to_out_matrix, self._out_to_in_matrix = \
         self.get_warp_matrices(output_w, output_h, zone_tl, zone_tr, zone_br, zone_bl)
         
-        # Build the x/y sampling maps needed by remap function
-        self.x_mapping, self.y_mapping = self.build_mapping(self._out_to_in_matrix, output_w, output_h)
+        # Build the x/y sampling maps needed by remap function (or load them from cache)
+        self.x_mapping, self.y_mapping, self._remap_tables = \
+        self.build_remap_tables(self.build_mapping, self._out_to_in_matrix, output_w, output_h)
     
     # .................................................................................................................
     
@@ -241,7 +243,7 @@ class Configurable(Reference_Preprocessor):
             return frame
         
         try:
-            return cv2.remap(frame, self.x_mapping, self.y_mapping, self.interpolation_type)
+            return cv2.remap(frame, *self._remap_tables, self.interpolation_type)
         
         except cv2.error as err:
             self.log("ERROR TRANSFORMING ({})".format(self.script_name))
@@ -50,8 +50,16 @@ find_path_to_local()
 #%% Imports
 
 import cv2
+import numpy as np
 
 from local.configurables.configurable_template import Core_Configurable_Base
+from local.configurables.core.preprocessor._helper_functions import build_fixed_point_remap
+from local.configurables.core.preprocessor._helper_functions import check_fixed_point_remap_accuracy
+from local.configurables.core.preprocessor._helper_functions import time_remap_tables
+from local.configurables.core.preprocessor._helper_functions import build_remap_cache_key
+from local.configurables.core.preprocessor._helper_functions import load_remap_cache, save_remap_cache
+
+from local.lib.file_access_utils.resources import build_preprocessor_cache_path
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -104,6 +112,7 @@ class Reference_Preprocessor(Core_Configurable_Base):
         # This function must maintain this input/output structure!
         #   - Used to ensure live video data + background image getting to foreground extractor are matched
         #   - Any modifications applied by the preprocessor should be applied to the background frame before return
+        #   - Input frames are shared with other stages, so must not be modified in-place (see core bundle run_all)
         
         # Apply preprocessing transformation to background images (when available) and all live video frames
         preprocessed_bg_frame = self.preprocess_background(bg_frame, bg_update)
@@ -124,7 +133,7 @@ class Reference_Preprocessor(Core_Configurable_Base):
         # Apply preprocessing transformation to the background image to match live video frames
         if bg_update or (self.current_background is None):
             modified_background = self.apply_transformation(background_frame)
-            self.current_background = modified_background.copy()
+            self.current_background = modified_background
         else:
             modified_background = self.current_background
         
@@ -132,11 +141,11 @@ class Reference_Preprocessor(Core_Configurable_Base):
     
     # .................................................................................................................
     
-    # SHOULD OVERRIDE
+    # SHOULD OVERRIDE. Must not modify the input frame in-place! Return a new frame if modifications are needed
     def apply_transformation(self, frame):
         
         try:
-            return frame.copy()
+            return frame
         
         except cv2.error as err:
             self.log("ERROR TRANSFORMING ({})".format(self.script_name))
@@ -147,6 +156,66 @@ class Reference_Preprocessor(Core_Configurable_Base):
     
     # .................................................................................................................
     
+    # SHOULDN'T OVERRIDE
+    def build_remap_tables(self, build_xy_mapping_func, *build_args, max_fixed_point_error_px = 0.05):
+        
+        '''
+        Helper function used by remap-based preprocessors to build x/y mappings,
+        along with (faster) fixed-point remap tables. Outside of configuration, results are
+        cached on disk (keyed by the current settings) so they don't need to be rebuilt on start-up.
+        Requires the preprocessor to have an 'interpolation_type' control!
+        Note: If the mapping code of any preprocessor changes, the cache version
+        (in the preprocessor _helper_functions) must be incremented, so that older caches aren't re-used
+        
+        Inputs:
+            build_xy_mapping_func -> (Function) Called as build_xy_mapping_func(*build_args),
+                                     must return float x_mapping, y_mapping arrays
+            
+            max_fixed_point_error_px -> (Float) If the fixed-point tables differ from the float mappings
+                                        by more than this amount, the float mappings are used instead
+        
+        Outputs:
+            x_mapping, y_mapping, remap_tables
+            -> Frames should be transformed using: cv2.remap(frame, *remap_tables, interpolation_type)
+        '''
+        
+        # Use cached mappings if they were saved using the current settings
+        cache_file_path = build_preprocessor_cache_path(self.location_select_folder_path, self.camera_select,
+                                                        self.script_name)
+        settings_data = self.current_settings()[:4]
+        cache_key = build_remap_cache_key(self.script_name, self.input_wh, self.output_wh, settings_data)
+        if not self.configure_mode:
+            cache_data = load_remap_cache(cache_file_path, cache_key)
+            if cache_data is not None:
+                return cache_data
+        
+        # Build new mappings & convert to fixed-point, as long as the conversion is accurate
+        x_mapping, y_mapping = build_xy_mapping_func(*build_args)
+        float_tables = (np.float32(x_mapping), np.float32(y_mapping))
+        remap_tables = build_fixed_point_remap(x_mapping, y_mapping, self.interpolation_type)
+        max_error_px = check_fixed_point_remap_accuracy(x_mapping, y_mapping, remap_tables, self.input_wh)
+        if max_error_px > max_fixed_point_error_px:
+            self.log("Fixed-point remap error too large ({:.3f} px), using float mapping".format(max_error_px))
+            remap_tables = float_tables
+        
+        # Outside of configuration, make sure fixed-point tables are actually faster (depends on opencv version)
+        # and save results for re-use on start-up. Skip this during configuration, since settings change constantly
+        if not self.configure_mode:
+            
+            fixed_time_sec = time_remap_tables(self.input_wh, remap_tables, self.interpolation_type)
+            float_time_sec = time_remap_tables(self.input_wh, float_tables, self.interpolation_type)
+            if fixed_time_sec > float_time_sec:
+                remap_tables = float_tables
+            
+            try:
+                save_remap_cache(cache_file_path, cache_key, x_mapping, y_mapping, remap_tables)
+            except OSError as err:
+                self.log("Error saving preprocessor cache ({}): {}".format(self.script_name, err))
+        
+        return x_mapping, y_mapping, remap_tables
+    
+    # .................................................................................................................
+    
     # SHOULD OVERRIDE
     def unwarp_required(self):
         
@@ -63,6 +63,100 @@ from scipy.optimize import linear_sum_assignment
 
 # .....................................................................................................................
 
+def get_object_state_arrays(object_ref_list):
+    
+    '''
+    Function which gathers the (current) state of a list of objects into contiguous arrays,
+    so that per-frame checks (e.g. decay & overlap) can be done using whole-array operations
+    
+    Inputs:
+        object_ref_list -> (List) List of trackable objects
+    
+    Outputs:
+        xy_center_array (shape: N x 2), final_match_epoch_ms_array (shape: N), track_status_array (shape: N)
+    '''
+    
+    # Handle empty case, so we still get properly shaped arrays
+    num_objs = len(object_ref_list)
+    if num_objs == 0:
+        return np.empty((0, 2), dtype = np.float32), np.empty(0, dtype = np.int64), np.empty(0, dtype = np.int32)
+    
+    xy_center_array = np.float32([each_obj.xy_center_array for each_obj in object_ref_list])
+    final_match_epoch_ms_array = np.int64([each_obj.final_match_epoch_ms for each_obj in object_ref_list])
+    track_status_array = np.int32([each_obj.track_status for each_obj in object_ref_list])
+    
+    return xy_center_array, final_match_epoch_ms_array, track_status_array
+
+# .....................................................................................................................
+
+def find_decayed_objects(object_ref_list, current_epoch_ms, decay_timeout_ms, decay_zone_raster = None):
+    
+    '''
+    Function which checks which objects should be considered dead, using whole-array operations
+    Objects are dead if they've gone unmatched for longer than the decay timeout
+    or if they are inside any of the decay zones (if provided, as a Zone_Label_Raster)
+    
+    Outputs:
+        is_dead_array (boolean array of shape: N)
+    '''
+    
+    # Gather object data for (vectorized) checks
+    xy_center_array, final_match_epoch_ms_array, _ = get_object_state_arrays(object_ref_list)
+    
+    # Check which objects have timed out, as well as which are inside decay zones
+    is_dead_array = ((current_epoch_ms - final_match_epoch_ms_array) > decay_timeout_ms)
+    if decay_zone_raster is not None:
+        is_dead_array |= decay_zone_raster.points_in_zones(xy_center_array)
+    
+    return is_dead_array
+
+# .....................................................................................................................
+
+def find_multi_object_detections(detection_tlbr_list, object_xy_list):
+    
+    '''
+    Function which finds detections that contain the (xy center) positions of multiple objects
+    Detections are checked in order, with objects claimed by one detection being excluded from later checks
+    (i.e. each object can only be 'overlapped' by one detection)
+    
+    Inputs:
+        detection_tlbr_list -> (List) List of detection bounding boxes, in tl_br format
+        
+        object_xy_list -> (List) List of object xy positions
+    
+    Outputs:
+        is_overlap_det_array (boolean array, one entry per detection),
+        is_overlapped_obj_array (boolean array, one entry per object)
+    '''
+    
+    # Initialize outputs
+    num_dets = len(detection_tlbr_list)
+    num_objs = len(object_xy_list)
+    is_overlap_det_array = np.zeros(num_dets, dtype = np.bool_)
+    is_overlapped_obj_array = np.zeros(num_objs, dtype = np.bool_)
+    if num_dets == 0 or num_objs < 2:
+        return is_overlap_det_array, is_overlapped_obj_array
+    
+    # Build detection-by-object matrix indicating which objects are (strictly) inside each detection box
+    tlbr_array = np.float32(detection_tlbr_list).reshape(-1, 4)
+    obj_xy_array = np.float32(object_xy_list).reshape(-1, 2)
+    obj_x, obj_y = obj_xy_array[:, 0], obj_xy_array[:, 1]
+    det_x1, det_y1, det_x2, det_y2 = [tlbr_array[:, [k]] for k in range(4)]
+    contains_matrix = (det_x1 < obj_x) & (obj_x < det_x2) & (det_y1 < obj_y) & (obj_y < det_y2)
+    
+    # Skip (sequential) claiming of objects if no detection contains more than one object
+    if np.max(np.count_nonzero(contains_matrix, axis = 1)) < 2:
+        return is_overlap_det_array, is_overlapped_obj_array
+    
+    # Find detections containing multiple (unclaimed) objects
+    for each_det_idx, each_contains_row in enumerate(contains_matrix):
+        contains_unclaimed = (each_contains_row & ~is_overlapped_obj_array)
+        if np.count_nonzero(contains_unclaimed) > 1:
+            is_overlap_det_array[each_det_idx] = True
+            is_overlapped_obj_array |= contains_unclaimed
+    
+    return is_overlap_det_array, is_overlapped_obj_array
+
 # .....................................................................................................................
 # .....................................................................................................................
 
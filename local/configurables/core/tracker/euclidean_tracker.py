@@ -56,6 +56,9 @@ from local.configurables.core.tracker.reference_tracker import Reference_Tracker
 from local.configurables.core.tracker._helper_functions import naive_object_detection_match
 from local.configurables.core.tracker._helper_functions import greedy_object_detection_match
 from local.configurables.core.tracker._helper_functions import minsum_object_detection_match
+from local.configurables.core.tracker._helper_functions import find_decayed_objects, find_multi_object_detections
+
+from local.eolib.math.geometry import Zone_Label_Raster
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -73,6 +76,7 @@ class Configurable(Reference_Tracker):
         
         # Allocate storage for helper variables/functions
         self._approximate_zero = 1 / 1000
+        self._edge_zone_raster = None
         
         # .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  . Drawing Controls  .  .  .  .  .  .  .  .  .  .  .  .  .  .  .
         
@@ -139,6 +143,16 @@ class Configurable(Reference_Tracker):
                 tooltip = "Maximum number of tracking data samples to store",
                 visible = False)
         
+        self.use_array_history = \
+        self.ctrl_spec.attach_toggle(
+                "use_array_history",
+                label = "Compact History Storage",
+                default_value = False,
+                tooltip = ["If enabled, object history data (e.g. positions & outlines) is stored in",
+                           "preallocated arrays rather than as many small arrays,",
+                           "which reduces memory usage in busy scenes. Saved data is not affected."],
+                visible = False)
+        
         self.validation_time_ms = \
         self.ctrl_spec.attach_slider(
                 "validation_time_ms",
@@ -298,9 +312,13 @@ class Configurable(Reference_Tracker):
         # Update the (smoothed) tracking class with new shared settings
         Smoothed_Trackable_Object.set_matching_style(self.match_with_speed)
         Smoothed_Trackable_Object.set_max_samples(self.track_history_samples)
+        Smoothed_Trackable_Object.set_history_style(self.use_array_history)
         Smoothed_Trackable_Object.set_smoothing_parameters(x_weight = self.smooth_x,
                                                            y_weight = self.smooth_y,
                                                            speed_weight = self.smooth_speed)
+        
+        # Rasterize edge decay zones, for fast zone checks on every frame
+        self._edge_zone_raster = Zone_Label_Raster(self.edge_zones_list)
     
     # .................................................................................................................
     
@@ -392,43 +410,31 @@ class Configurable(Reference_Tracker):
         if no_propagation:
             return tracked_object_dict, unmatched_tobj_ids, unmatched_detection_ids
         
-        # Initialize variables used to track overlapping detection/objects
-        unmatched_tobj_id_set = set(unmatched_tobj_ids)
-        remove_tobj_ids_set = set()
-        still_unmatched_det_ids = []
-        
         # Check if any unmatched detection contains multiple tracked objects
         # (i.e. if the x/y tracking co-ord of multiple tracked objects fall inside the bounding box of a detection)
-        for each_det_id in unmatched_detection_ids:
-            
-            # Get reference to detection and it's bounding box
-            det_ref = detection_ref_dict[each_det_id]
-            (det_x1, det_y1), (det_x2, det_y2) = det_ref.tl_br
-            
-            # Check if there is more than 1 object contained in the detection box
-            contains_obj_ids = []
-            for each_tobj_id in unmatched_tobj_id_set:
-                obj_xcen, obj_ycen = tracked_object_dict[each_tobj_id].xy_center_tuple
-                if (det_x1 < obj_xcen < det_x2) and (det_y1 < obj_ycen < det_y2):
-                    contains_obj_ids.append(each_tobj_id)
-            
-            # If the detection contains one or no tracked objects, consider it 'still unmatched'
-            no_obj_overlap = (len(contains_obj_ids) < 2)
-            if no_obj_overlap:
-                still_unmatched_det_ids.append(each_det_id)
-                
+        # -> This is done for all detection/object pairs at once, using whole-array operations
+        det_tlbr_list = [detection_ref_dict[each_det_id].tl_br for each_det_id in unmatched_detection_ids]
+        obj_xy_list = [tracked_object_dict[each_tobj_id].xy_center_array for each_tobj_id in unmatched_tobj_ids]
+        is_overlap_det_array, is_overlapped_obj_array = find_multi_object_detections(det_tlbr_list, obj_xy_list)
+        
+        # If the detection contains one or no tracked objects, consider it 'still unmatched'
+        still_unmatched_det_ids = [each_det_id 
+                                   for each_det_id, is_overlap in zip(unmatched_detection_ids, is_overlap_det_array)
+                                   if not is_overlap]
+        
+        # Split objects based on whether they were overlapped by a detection
+        remove_tobj_ids_list = []
+        still_unmatched_tobj_ids = []
+        for each_tobj_id, is_overlapped in zip(unmatched_tobj_ids, is_overlapped_obj_array):
+            if is_overlapped:
+                remove_tobj_ids_list.append(each_tobj_id)
             else:
-                # If overlap exists, remove the objects from the unmatched list
-                remove_tobj_ids_set.update(contains_obj_ids)
-                unmatched_tobj_id_set = unmatched_tobj_id_set.difference(contains_obj_ids)
-            
+                still_unmatched_tobj_ids.append(each_tobj_id)
+        
         # Propagate all removed objects forward in time (based on their momentum)
-        for each_tobj_id in remove_tobj_ids_set:
+        for each_tobj_id in remove_tobj_ids_list:
             tracked_object_dict[each_tobj_id].update_from_self(self.overlap_propagation_weight)
         
-        # Create 'still unmatched' tobj id list by removing the ids that were tagged for overlap
-        still_unmatched_tobj_ids = list(unmatched_tobj_id_set)
-        
         return tracked_object_dict, still_unmatched_tobj_ids, still_unmatched_det_ids
     
     # .................................................................................................................
@@ -481,23 +487,16 @@ class Configurable(Reference_Tracker):
     
     def _decay_objs(self, object_dict, unmatched_obj_ids_list, decay_timeout_ms, current_epoch_ms):
         
-        # Loop over all unmatched object ids and check how long they've been unmatched
-        # Add them to dead list if they've been unmatched 'too long' or if they're are in a decay zone
-        dead_obj_ids_list = []
-        for each_obj_id in unmatched_obj_ids_list:
-            
-            # Get object reference for convenience
-            each_obj = object_dict[each_obj_id]
-            
-            # Check if the object decay timer is up, in which case it's a dead object
-            unmatch_time = each_obj.get_match_decay_time_ms(current_epoch_ms)
-            if unmatch_time > decay_timeout_ms:
-                dead_obj_ids_list.append(each_obj_id)
-                continue
-            
-            # Any object in a decay zone is immediately dead (since it was unmatched)
-            if self.enabled_edge_decay_zones and each_obj.in_zones(self.edge_zones_list):
-                dead_obj_ids_list.append(each_obj_id)
+        # Check all unmatched objects at once, to see how long they've been unmatched
+        # Objects are dead if they've been unmatched 'too long' or if they're are in a decay zone
+        unmatched_obj_ref_list = [object_dict[each_obj_id] for each_obj_id in unmatched_obj_ids_list]
+        decay_zone_raster = self._edge_zone_raster if self.enabled_edge_decay_zones else None
+        is_dead_array = find_decayed_objects(unmatched_obj_ref_list, current_epoch_ms,
+                                             decay_timeout_ms, decay_zone_raster)
+        
+        # Convert dead object indices back into object ids
+        dead_obj_ids_list = [each_obj_id for each_obj_id, is_dead in zip(unmatched_obj_ids_list, is_dead_array)
+                             if is_dead]
         
         return object_dict, dead_obj_ids_list
     
@@ -606,18 +605,11 @@ def calculate_squared_distance_pairing_matrix(row_entry_xy_tuple_list, col_entry
     row_xy_array = np.float32(row_entry_xy_tuple_list) * np.float32((x_scale, y_scale))
     col_xy_array = np.float32(col_entry_xy_tuple_list) * np.float32((x_scale, y_scale))
     
-    # Calculate the x-difference between the row and column object locations
-    row_x_array = row_xy_array[:, 0]
-    col_x_array = col_xy_array[:, 0]
-    delta_x = np.tile(row_x_array, (num_cols, 1)).T - np.tile(col_x_array, (num_rows, 1))
-    
-    # Calculate the y-difference between the row and column object locations
-    row_y_array = row_xy_array[:, 1]
-    col_y_array = col_xy_array[:, 1]
-    delta_y = np.tile(row_y_array, (num_cols, 1)).T - np.tile(col_y_array, (num_rows, 1))
+    # Calculate the x/y-difference between every row and column object location (using broadcasting)
+    delta_xy = row_xy_array[:, np.newaxis, :] - col_xy_array[np.newaxis, :, :]
     
     # Square and sum the x/y distances to get our results!
-    square_distance_matrix = np.square(delta_x) + np.square(delta_y)
+    square_distance_matrix = np.sum(np.square(delta_xy), axis = 2)
     
     return square_distance_matrix
 
@@ -53,6 +53,13 @@ import numpy as np
 
 from local.configurables.core.tracker.reference_tracker import Reference_Tracker, Reference_Trackable_Object
 
+from local.configurables.core.tracker._helper_functions import naive_object_detection_match
+from local.configurables.core.tracker._helper_functions import greedy_object_detection_match
+from local.configurables.core.tracker._helper_functions import minsum_object_detection_match
+from local.configurables.core.tracker._helper_functions import find_decayed_objects
+
+from local.eolib.math.geometry import Zone_Label_Raster
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define classes
@@ -69,6 +76,7 @@ class Configurable(Reference_Tracker):
         
         # Allocate storage for helper variables/functions
         self._approximate_zero = 1 / 1000
+        self._edge_zone_raster = None
         
         # .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  . Drawing Controls  .  .  .  .  .  .  .  .  .  .  .  .  .  .  .
         
@@ -85,6 +93,17 @@ class Configurable(Reference_Tracker):
         
         self.ctrl_spec.new_control_group("Tracking Controls")
         
+        self.use_fast_fallback_matching = \
+        self.ctrl_spec.attach_toggle(
+                "use_fast_fallback_matching",
+                label = "Fast Fallback Algorithm",
+                default_value = True,
+                tooltip = ["When a simple unique object-to-detection pairing doesn't exist,",
+                           "this value controls the fallback algorithm used to determine a unique pairing.",
+                           "When enabled a 'greedy' algorithm is used, which (unlike the slower algorithm)",
+                           "does not take into account all possible pairings.",
+                           "However, it is around ~10 times faster than the slower fallback."])
+        
         self.validation_min_jaccard_index = \
         self.ctrl_spec.attach_slider(
                 "validation_min_jaccard_index",
@@ -119,6 +138,16 @@ class Configurable(Reference_Tracker):
                 tooltip = "Maximum number of tracking data samples to store",
                 visible = False)
         
+        self.use_array_history = \
+        self.ctrl_spec.attach_toggle(
+                "use_array_history",
+                label = "Compact History Storage",
+                default_value = False,
+                tooltip = ["If enabled, object history data (e.g. positions & outlines) is stored in",
+                           "preallocated arrays rather than as many small arrays,",
+                           "which reduces memory usage in busy scenes. Saved data is not affected."],
+                visible = False)
+        
         self.validation_time_ms = \
         self.ctrl_spec.attach_slider(
                 "validation_time_ms",
@@ -212,6 +241,10 @@ class Configurable(Reference_Tracker):
         # Update the (smoothed) tracking class with new shared settings
         Reference_Trackable_Object.set_matching_style(match_with_speed = False)
         Reference_Trackable_Object.set_max_samples(self.track_history_samples)
+        Reference_Trackable_Object.set_history_style(self.use_array_history)
+        
+        # Rasterize edge decay zones, for fast zone checks on every frame
+        self._edge_zone_raster = Zone_Label_Raster(self.edge_zones_list)
     
     # .................................................................................................................
     
@@ -250,7 +283,8 @@ class Configurable(Reference_Tracker):
         objid_detid_match_list, still_unmatched_obj_ids, still_unmatched_det_ids = \
         pair_objects_to_detections(object_dict, unmatched_object_ids_list,
                                    detection_ref_dict, unmatched_detection_ids_list,
-                                   min_jaccard_index)
+                                   min_jaccard_index,
+                                   self.use_fast_fallback_matching)
         
         # Update objects using detection data, based on the pairing results from above
         for each_obj_id, each_det_id in objid_detid_match_list:
@@ -288,21 +322,16 @@ class Configurable(Reference_Tracker):
     
     def _decay_objs(self, object_dict, unmatched_obj_ids_list, decay_timeout_ms, current_epoch_ms):
         
-        dead_obj_ids_list = []
-        for each_obj_id in unmatched_obj_ids_list:
-            
-            # Get object reference for convenience
-            each_obj = object_dict[each_obj_id]
-            
-            # Check if the object decay timer is up, in which case it's a dead object
-            unmatch_time = each_obj.get_match_decay_time_ms(current_epoch_ms)
-            if unmatch_time > decay_timeout_ms:
-                dead_obj_ids_list.append(each_obj_id)
-                continue
-            
-            # Any object in a decay zone is immediately dead (since it was unmatched)
-            if self.enabled_edge_decay_zones and each_obj.in_zones(self.edge_zones_list):
-                dead_obj_ids_list.append(each_obj_id)
+        # Check all unmatched objects at once, to see how long they've been unmatched
+        # Objects are dead if they've been unmatched 'too long' or if they're are in a decay zone
+        unmatched_obj_ref_list = [object_dict[each_obj_id] for each_obj_id in unmatched_obj_ids_list]
+        decay_zone_raster = self._edge_zone_raster if self.enabled_edge_decay_zones else None
+        is_dead_array = find_decayed_objects(unmatched_obj_ref_list, current_epoch_ms,
+                                             decay_timeout_ms, decay_zone_raster)
+        
+        # Convert dead object indices back into object ids
+        dead_obj_ids_list = [each_obj_id for each_obj_id, is_dead in zip(unmatched_obj_ids_list, is_dead_array)
+                             if is_dead]
         
         return object_dict, dead_obj_ids_list
     
@@ -408,9 +437,52 @@ def calculate_jaccard_index(tlbr_a, tlbr_b):
 
 # .....................................................................................................................
 
+def calculate_jaccard_index_pairing_matrix(row_entry_tlbr_list, col_entry_tlbr_list):
+    
+    '''
+    Function which calculates the jaccard index (intersection-over-union) between each pair of row/col boxes,
+    using whole-array operations (as opposed to calling calculate_jaccard_index(...) for every pairing)
+    Boxes are expected in tl_br format: ((x1, y1), (x2, y2))
+    
+    Returns a matrix with one row per row entry and one column per column entry (e.g. objects-by-detections)
+    '''
+    
+    # Get number of rows & columns. Bail if either is zero
+    num_rows = len(row_entry_tlbr_list)
+    num_cols = len(col_entry_tlbr_list)
+    if num_rows == 0 or num_cols == 0:
+        return np.array(())
+    
+    # Convert to arrays of (x1, y1, x2, y2), shaped so that row/col entries broadcast against each other
+    row_tlbr_array = np.float32(row_entry_tlbr_list).reshape(num_rows, 1, 4)
+    col_tlbr_array = np.float32(col_entry_tlbr_list).reshape(1, num_cols, 4)
+    
+    # Get intersection box widths & heights (clipped to zero if there is no intersection)
+    intersect_tl = np.maximum(row_tlbr_array[:, :, 0:2], col_tlbr_array[:, :, 0:2])
+    intersect_br = np.minimum(row_tlbr_array[:, :, 2:4], col_tlbr_array[:, :, 2:4])
+    intersect_wh = np.clip(intersect_br - intersect_tl, 0.0, None)
+    intersection_area = intersect_wh[:, :, 0] * intersect_wh[:, :, 1]
+    
+    # Calculate the union area (i.e. the common area, but don't double count overlapping region)
+    row_wh = row_tlbr_array[:, :, 2:4] - row_tlbr_array[:, :, 0:2]
+    col_wh = col_tlbr_array[:, :, 2:4] - col_tlbr_array[:, :, 0:2]
+    row_area = row_wh[:, :, 0] * row_wh[:, :, 1]
+    col_area = col_wh[:, :, 0] * col_wh[:, :, 1]
+    union_area = (row_area + col_area - intersection_area)
+    
+    # Avoid division by zero for boxes that don't overlap
+    valid_union = (union_area >= 0.00001)
+    iou_matrix = np.zeros((num_rows, num_cols), dtype = np.float32)
+    np.divide(intersection_area, union_area, out = iou_matrix, where = valid_union)
+    
+    return iou_matrix
+
+# .....................................................................................................................
+
 def pair_objects_to_detections(object_ref_dict, pairable_obj_ids_list,
                                detection_ref_dict, pairable_det_ids_list,
-                               minimum_jaccard_index = 0.05):
+                               minimum_jaccard_index = 0.05,
+                               use_fast_fallback = True):
     
     # Create lists of pairable objects & detections, so that we can rely on a fixed ordering!
     pobj_ref_list = [object_ref_dict[each_obj_id] for each_obj_id in pairable_obj_ids_list]
@@ -427,29 +499,32 @@ def pair_objects_to_detections(object_ref_dict, pairable_obj_ids_list,
     object_tlbrs = [each_obj.tl_br for each_obj in pobj_ref_list]
     detection_tlbrs = [each_detection.tl_br for each_detection in pdet_ref_list]
     
-    # For each detection bounding box, get list of overlapping objects
-    unmatched_obj_ids_set = set(pairable_obj_ids_list)
-    unmatched_det_ids_set = set(pairable_det_ids_list)
-    for each_det_idx, each_det_tlbr in enumerate(detection_tlbrs):
-        jaccard_indices = [calculate_jaccard_index(each_det_tlbr, each_obj_tlbr) for each_obj_tlbr in object_tlbrs]
-        
-        # Find the best match (i.e. largest jaccard index), if present, otherwise add detection to unmatched listing
-        best_match_obj_idx = np.argmax(jaccard_indices)
-        best_match_jaccard = jaccard_indices[best_match_obj_idx]
-        if best_match_jaccard > minimum_jaccard_index:
-            
-            # Convert list indexing into pairable object/detection ids values
-            best_match_obj_id = pairable_obj_ids_list[best_match_obj_idx]
-            best_match_det_id = pairable_det_ids_list[each_det_idx]
-            
-            # Store object/detection matching pairs and remove corresponding entries from the unmatched sets
-            objid_detid_match_list.append((best_match_obj_id, best_match_det_id))
-            unmatched_obj_ids_set.discard(best_match_obj_id)
-            unmatched_det_ids_set.discard(best_match_det_id)
-    
-    # Convert unique sets of object/detection indices to lists for output
-    unmatched_obj_ids_list = list(unmatched_obj_ids_set)
-    unmatched_det_ids_list = list(unmatched_det_ids_set)    
+    # Convert jaccard index into a cost (lower is better), so we can re-use the same matching functions
+    # as the other trackers. Pairings must be above the minimum jaccard index to be considered valid
+    obj_det_jaccard_matrix = calculate_jaccard_index_pairing_matrix(object_tlbrs, detection_tlbrs)
+    obj_det_cost_matrix = 1.0 - obj_det_jaccard_matrix
+    max_allowable_cost = 1.0 - minimum_jaccard_index
+    
+    # Try to find a unique mapping from (previous) objects to (current) detections
+    unique_mapping, obj_det_idx_match_list, unmatched_objref_idx_list, unmatched_detref_idx_list = \
+    naive_object_detection_match(obj_det_cost_matrix, max_allowable_cost)
+    
+    # If the unique mapping failed, then try using a (slower) method that guarantees a unique pairing
+    if not unique_mapping:
+        if use_fast_fallback:
+            obj_det_idx_match_list, unmatched_objref_idx_list, unmatched_detref_idx_list = \
+            greedy_object_detection_match(obj_det_cost_matrix, max_allowable_cost)
+        else:
+            obj_det_idx_match_list, unmatched_objref_idx_list, unmatched_detref_idx_list = \
+            minsum_object_detection_match(obj_det_cost_matrix, max_allowable_cost)
+    
+    # Finally, convert matched/unmatched reference id values (which are relative to the pobj/pdet ref lists) 
+    # back into their respective pairable id values
+    unmatched_obj_ids_list = [pairable_obj_ids_list[each_ref_idx] for each_ref_idx in unmatched_objref_idx_list]
+    unmatched_det_ids_list = [pairable_det_ids_list[each_ref_idx] for each_ref_idx in unmatched_detref_idx_list]
+    for each_obj_ref_idx, each_det_ref_idx in obj_det_idx_match_list:
+        converted_pair = (pairable_obj_ids_list[each_obj_ref_idx], pairable_det_ids_list[each_det_ref_idx])
+        objid_detid_match_list.append(converted_pair)
     
     return objid_detid_match_list, unmatched_obj_ids_list, unmatched_det_ids_list
 
@@ -468,5 +543,4 @@ if __name__ == "__main__":
 
 # TODO
 # - implement kalman filter for updating x/y position and assigning matches (instead of matching purely by IoU)
-# - implement better pairing -> get rid of greedy matching approach!
 
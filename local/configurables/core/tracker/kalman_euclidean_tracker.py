@@ -58,6 +58,10 @@ from local.configurables.core.tracker.reference_tracker import Reference_Tracker
 
 from local.configurables.core.tracker.euclidean_tracker import pair_objects_to_detections
 
+from local.configurables.core.tracker._helper_functions import find_decayed_objects
+
+from local.eolib.math.geometry import Zone_Label_Raster
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define classes
@@ -74,6 +78,7 @@ class Configurable(Reference_Tracker):
         
         # Allocate storage for helper variables/functions
         self._approximate_zero = 1 / 1000
+        self._edge_zone_raster = None
         
         # .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  . Drawing Controls  .  .  .  .  .  .  .  .  .  .  .  .  .  .  .
         
@@ -133,6 +138,16 @@ class Configurable(Reference_Tracker):
                 tooltip = "Maximum number of tracking data samples to store",
                 visible = False)
         
+        self.use_array_history = \
+        self.ctrl_spec.attach_toggle(
+                "use_array_history",
+                label = "Compact History Storage",
+                default_value = False,
+                tooltip = ["If enabled, object history data (e.g. positions & outlines) is stored in",
+                           "preallocated arrays rather than as many small arrays,",
+                           "which reduces memory usage in busy scenes. Saved data is not affected."],
+                visible = False)
+        
         self.validation_time_ms = \
         self.ctrl_spec.attach_slider(
                 "validation_time_ms",
@@ -297,6 +312,10 @@ class Configurable(Reference_Tracker):
         Kalman_Trackable_Object.set_smoothing_exponent(self.smoothing_exponent)
         Kalman_Trackable_Object.set_velocity_decay(cubed_x_decay, cubed_y_decay)
         Kalman_Trackable_Object.set_outline_style(self.store_box_in_place_of_hull)
+        Kalman_Trackable_Object.set_history_style(self.use_array_history)
+        
+        # Rasterize edge decay zones, for fast zone checks on every frame
+        self._edge_zone_raster = Zone_Label_Raster(self.edge_zones_list)
     
     # .................................................................................................................
     
@@ -375,23 +394,16 @@ class Configurable(Reference_Tracker):
     
     def _decay_objs(self, object_dict, unmatched_obj_ids_list, decay_timeout_ms, current_epoch_ms):
         
-        # Loop over all unmatched object ids and check how long they've been unmatched
-        # Add them to dead list if they've been unmatched 'too long' or if they're are in a decay zone
-        dead_obj_ids_list = []
-        for each_obj_id in unmatched_obj_ids_list:
-            
-            # Get object reference for convenience
-            each_obj = object_dict[each_obj_id]
-            
-            # Check if the object decay timer is up, in which case it's a dead object
-            unmatch_time = each_obj.get_match_decay_time_ms(current_epoch_ms)
-            if unmatch_time > decay_timeout_ms:
-                dead_obj_ids_list.append(each_obj_id)
-                continue
-            
-            # Any unmatched object in a decay zone is immediately dead
-            if self.enabled_edge_decay_zones and each_obj.in_zones(self.edge_zones_list):
-                dead_obj_ids_list.append(each_obj_id)
+        # Check all unmatched objects at once, to see how long they've been unmatched
+        # Objects are dead if they've been unmatched 'too long' or if they're are in a decay zone
+        unmatched_obj_ref_list = [object_dict[each_obj_id] for each_obj_id in unmatched_obj_ids_list]
+        decay_zone_raster = self._edge_zone_raster if self.enabled_edge_decay_zones else None
+        is_dead_array = find_decayed_objects(unmatched_obj_ref_list, current_epoch_ms,
+                                             decay_timeout_ms, decay_zone_raster)
+        
+        # Convert dead object indices back into object ids
+        dead_obj_ids_list = [each_obj_id for each_obj_id, is_dead in zip(unmatched_obj_ids_list, is_dead_array)
+                             if is_dead]
         
         return object_dict, dead_obj_ids_list
     
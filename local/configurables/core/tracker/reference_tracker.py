@@ -409,6 +409,12 @@ class Reference_Trackable_Object:
     match_with_speed = False
     max_samples = 20000
     max_allowable_samples = 20000
+    use_array_history = False
+    
+    # Imaging data is only pulled from detections periodically, since it is expensive to generate and
+    # gets downsampled for reporting anyways (see reporting period & _get_reporting_data function)
+    imaging_report_period_ms = 500
+    imaging_sample_period_ms = 250
     
     # .................................................................................................................
     
@@ -441,10 +447,20 @@ class Reference_Trackable_Object:
         self.before_db_classification = {}
         
         # Allocate storage for historical variables
-        self.hull_history = deque([], maxlen = self.max_samples)
-        self.xy_center_history = deque([], maxlen = self.max_samples)
-        self.track_status_history = deque([], maxlen = self.max_samples)
+        # -> Array history stores data in (preallocated) numpy buffers, instead of a deque of small arrays
+        self._use_array_history = self.use_array_history
+        if self._use_array_history:
+            self.hull_history = Hull_History(self.max_samples)
+            self.xy_center_history = Array_History(self.max_samples)
+            self.track_status_history = Array_History(self.max_samples)
+            self.tl_br_history = Array_History(self.max_samples)
+        else:
+            self.hull_history = deque([], maxlen = self.max_samples)
+            self.xy_center_history = deque([], maxlen = self.max_samples)
+            self.track_status_history = deque([], maxlen = self.max_samples)
+            self.tl_br_history = None
         self.imaging_data_historys = defaultdict(deque)
+        self._last_imaging_epoch_ms = None
         
         # Initialize history data
         self.update_id(nice_id, full_id)
@@ -475,6 +491,12 @@ class Reference_Trackable_Object:
         cls.frame_width = int(round(width))
         cls.frame_height = int(round(height))
     
+    # .................................................................................................................
+    
+    @classmethod
+    def set_history_style(cls, use_array_history):
+        cls.use_array_history = use_array_history
+    
     # .................................................................................................................
     #%% Updating functions
     
@@ -564,7 +586,8 @@ class Reference_Trackable_Object:
         
         # Get detection data
         new_track_status = 1
-        new_hull_array, new_xy_cen_array, new_imaging_data_dict = self.get_detection_parameters(detection_object)
+        new_hull_array, new_xy_cen_array, new_imaging_data_dict = \
+        self.get_detection_parameters(detection_object, current_epoch_ms)
         
         # Copy new data into object
         self.verbatim_update(new_hull_array, new_xy_cen_array, new_imaging_data_dict, new_track_status)
@@ -580,14 +603,40 @@ class Reference_Trackable_Object:
     
     # .................................................................................................................
     
-    def get_detection_parameters(self, detection_object):
+    def get_detection_parameters(self, detection_object, current_epoch_ms = None):
         
         '''
         Pull data from a detection object. 
         See the reference_detector.py for the reference detection object and it's available properties
+        If timing info is given, imaging data will only be pulled from the detection periodically
         '''
         
-        return detection_object.hull_array, detection_object.xy_center_array, detection_object.imaging_data_dict
+        new_imaging_data_dict = self._get_sampled_imaging_data(detection_object, current_epoch_ms)
+        
+        return detection_object.hull_array, detection_object.xy_center_array, new_imaging_data_dict
+    
+    # .................................................................................................................
+    
+    def _get_sampled_imaging_data(self, detection_object, current_epoch_ms = None):
+        
+        '''
+        Helper used to limit how often imaging data is pulled from detections, since it is slow to generate
+        In between samples, the most recent imaging data is repeated, so that the imaging history
+        still has one entry per sample (as needed by the reporting downsampling)
+        '''
+        
+        # Always sample if we're missing timing info or don't have any imaging data yet
+        need_sample = (current_epoch_ms is None) or (self._last_imaging_epoch_ms is None)
+        if not need_sample:
+            need_sample = ((current_epoch_ms - self._last_imaging_epoch_ms) >= self.imaging_sample_period_ms)
+        
+        # Re-use the most recent imaging data if we don't need a new sample yet
+        if not need_sample:
+            return self.imaging_data_dict
+        
+        self._last_imaging_epoch_ms = current_epoch_ms
+        
+        return detection_object.imaging_data_dict
     
     # .................................................................................................................
     
@@ -603,6 +652,10 @@ class Reference_Trackable_Object:
         # Update object outline
         self.hull_history.append(new_hull_array)
         
+        # Update bounding box, if we're storing it (otherwise it gets calculated from the hull as needed)
+        if self.tl_br_history is not None:
+            self.tl_br_history.append(self._calculate_tl_br(new_hull_array))
+        
         # Update centering position
         self.xy_center_history.append(new_xy_center_array)
         
@@ -715,20 +768,30 @@ class Reference_Trackable_Object:
         num_decay_samples_removed = abs(last_good_rel_idx) - 1
         
         # Calculate downsampled imaging data (roughly 2 samples per second)
-        num_imaging_samples = 1 + int(lifetime_ms / 500)
+        num_imaging_samples = 1 + int(lifetime_ms / self.imaging_report_period_ms)
         downsample_idxs = np.int32(np.round(np.linspace(0, final_num_samples - 1, num_imaging_samples)))
         report_imaging_data_dict = {}
         for each_field, each_history in self.imaging_data_historys.items():
             report_imaging_data_dict[each_field] = [each_history[k] for k in downsample_idxs]
         
+        # Convert history data to json-friendly lists
+        if self._use_array_history:
+            track_status_list = self.track_status_history.to_list(final_num_samples)
+            xy_center_list = self.xy_center_history.to_list(final_num_samples)
+            hull_list = self.hull_history.to_list(final_num_samples)
+        else:
+            track_status_list = list(self.track_status_history)[:final_num_samples]
+            xy_center_list = self._deque_of_arrays_to_list(self.xy_center_history, final_num_samples)
+            hull_list = self._deque_of_arrays_to_list(self.hull_history, final_num_samples)
+        
         # Bundle tracking data together for clarity
         tracking_data_dict = {"num_validation_samples": self.num_validation_samples,
                               "num_decay_samples_removed": num_decay_samples_removed,
                               "frame_width": self.frame_width,
                               "frame_height": self.frame_height,
-                              "track_status": list(self.track_status_history)[:final_num_samples],
-                              "xy_center": self._deque_of_arrays_to_list(self.xy_center_history, final_num_samples),
-                              "hull": self._deque_of_arrays_to_list(self.hull_history, final_num_samples)}
+                              "track_status": track_status_list,
+                              "xy_center": xy_center_list,
+                              "hull": hull_list}
         
         return report_imaging_data_dict, tracking_data_dict, final_num_samples
     
@@ -747,6 +810,16 @@ class Reference_Trackable_Object:
     def _deque_of_arrays_to_list(deque_of_arrays, final_sample_index):
         return [each_array.tolist() for each_array in deque_of_arrays][:final_sample_index]
     
+    # .................................................................................................................
+    
+    @staticmethod
+    def _calculate_tl_br(hull_array):
+        
+        tl = np.min(hull_array, axis = 0)
+        br = np.max(hull_array, axis = 0)
+        
+        return np.float32((tl, br))
+    
     # .................................................................................................................
     #%% Postioning functions
     
@@ -845,11 +918,11 @@ class Reference_Trackable_Object:
     @property
     def tl_br(self):
         
-        hull_array = self.hull_array
-        tl = np.min(hull_array, axis = 0)
-        br = np.max(hull_array, axis = 0)
+        # Use stored bounding box if available, otherwise calculate it from the most recent hull
+        if self.tl_br_history is not None:
+            return self.tl_br_history[-1]
         
-        return np.float32((tl, br))
+        return self._calculate_tl_br(self.hull_array)
     
     # .................................................................................................................
     # .................................................................................................................
@@ -905,7 +978,8 @@ class Smoothed_Trackable_Object(Reference_Trackable_Object):
         self._update_final_match_data(current_frame_index, current_epoch_ms, current_datetime)
         
         # Get detection data
-        new_hull_array, new_xy_cen_array, new_imaging_data_dict = self.get_detection_parameters(detection_object)
+        new_hull_array, new_xy_cen_array, new_imaging_data_dict = \
+        self.get_detection_parameters(detection_object, current_epoch_ms)
         
         # Apply smooth updates
         self.smooth_update(new_hull_array, new_xy_cen_array, new_imaging_data_dict)
@@ -1046,6 +1120,239 @@ class ID_Manager:
 # /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
 # /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
 
+
+class Array_History:
+    
+    '''
+    Ring buffer used to store a history of fixed-shape samples (e.g. xy positions) in a single numpy array
+    Acts as a replacement for a deque of small arrays (with a maxlen), but without the per-sample allocations.
+    Storage is allocated on the first append (matching the shape & dtype of the first sample),
+    and grows as needed, up to the maximum number of samples. After that, the oldest samples are overwritten
+    '''
+    
+    # .................................................................................................................
+    
+    def __init__(self, max_samples, initial_size = 64):
+        
+        # Store inputs
+        self.max_samples = max(1, max_samples)
+        self._initial_size = max(1, min(initial_size, self.max_samples))
+        
+        # Allocate storage for buffer & ring indexing
+        self._data = None
+        self._start_idx = 0
+        self._num_samples = 0
+    
+    # .................................................................................................................
+    
+    def __len__(self):
+        return self._num_samples
+    
+    # .................................................................................................................
+    
+    def __getitem__(self, index):
+        
+        # Return plain python values for scalar samples (to match storing values in a deque)
+        sample = self._data[self._get_buffer_index(index)]
+        
+        return sample.copy() if sample.ndim > 0 else sample.item()
+    
+    # .................................................................................................................
+    
+    def __iter__(self):
+        return (self[each_idx] for each_idx in range(self._num_samples))
+    
+    # .................................................................................................................
+    
+    def __array__(self, dtype = None, copy = None):
+        ordered_array = self.to_array()
+        return ordered_array if dtype is None else ordered_array.astype(dtype)
+    
+    # .................................................................................................................
+    
+    def append(self, new_sample):
+        
+        # Allocate storage on first use, so we can match the sample shape/type
+        new_sample = np.asarray(new_sample)
+        if self._data is None:
+            self._data = np.empty((self._initial_size, *new_sample.shape), dtype = new_sample.dtype)
+        
+        # Grow the buffer if we're out of space (but aren't at the max sample count yet)
+        buffer_size = len(self._data)
+        is_full = (self._num_samples == buffer_size)
+        if is_full and buffer_size < self.max_samples:
+            self._grow()
+            buffer_size = len(self._data)
+            is_full = False
+        
+        # Overwrite the oldest sample if we're at the max sample count
+        if is_full:
+            self._data[self._start_idx] = new_sample
+            self._start_idx = (self._start_idx + 1) % buffer_size
+            return
+        
+        write_idx = (self._start_idx + self._num_samples) % buffer_size
+        self._data[write_idx] = new_sample
+        self._num_samples += 1
+    
+    # .................................................................................................................
+    
+    def to_array(self, num_samples = None):
+        
+        ''' Returns a copy of the history data, in order (oldest first), optionally limited to num_samples '''
+        
+        # Handle empty case
+        if self._data is None:
+            return np.empty(0)
+        
+        # Unwrap ring buffer so oldest data is first
+        end_idx = self._start_idx + self._num_samples
+        if end_idx <= len(self._data):
+            ordered_array = self._data[self._start_idx:end_idx].copy()
+        else:
+            ordered_array = np.concatenate((self._data[self._start_idx:], self._data[:(end_idx - len(self._data))]))
+        
+        return ordered_array if num_samples is None else ordered_array[:num_samples]
+    
+    # .................................................................................................................
+    
+    def to_list(self, num_samples = None):
+        return self.to_array(num_samples).tolist()
+    
+    # .................................................................................................................
+    
+    def _get_buffer_index(self, index):
+        
+        # Convert (possibly negative) sample index into buffer index, with deque-like out-of-range errors
+        sample_idx = (index + self._num_samples) if index < 0 else index
+        if not (0 <= sample_idx < self._num_samples):
+            raise IndexError("History index out of range")
+        
+        return (self._start_idx + sample_idx) % len(self._data)
+    
+    # .................................................................................................................
+    
+    def _grow(self):
+        
+        # Double the storage size (up to the max sample count), with the existing data unwrapped to the start
+        new_buffer_size = min(2 * len(self._data), self.max_samples)
+        new_data = np.empty((new_buffer_size, *self._data.shape[1:]), dtype = self._data.dtype)
+        new_data[:self._num_samples] = self.to_array()
+        
+        self._data = new_data
+        self._start_idx = 0
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
+
+# /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+# /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+
+
+class Hull_History:
+    
+    '''
+    Storage for a history of hulls (which can each have a different number of points)
+    All hull points are stored in a single flat array, with each sample indexed by its start/end offsets.
+    Offsets are 'absolute' (they only ever increase), so that the point buffer can be compacted
+    (i.e. have data from old/overwritten samples removed) without needing to update every stored offset
+    '''
+    
+    # .................................................................................................................
+    
+    def __init__(self, max_samples, initial_num_points = 1024):
+        
+        # Store inputs
+        self.max_samples = max_samples
+        self._initial_num_points = initial_num_points
+        
+        # Allocate storage for point data and the start/end offsets of each hull
+        self._points = None
+        self._base_offset = 0
+        self._end_offset = 0
+        self._offsets_history = Array_History(max_samples)
+    
+    # .................................................................................................................
+    
+    def __len__(self):
+        return len(self._offsets_history)
+    
+    # .................................................................................................................
+    
+    def __getitem__(self, index):
+        start_offset, end_offset = self._offsets_history[index]
+        return self._points[(start_offset - self._base_offset):(end_offset - self._base_offset)].copy()
+    
+    # .................................................................................................................
+    
+    def __iter__(self):
+        return (self[each_idx] for each_idx in range(len(self)))
+    
+    # .................................................................................................................
+    
+    def append(self, new_hull_array):
+        
+        # Allocate storage on first use, so we can match the point shape/type
+        new_hull_array = np.asarray(new_hull_array)
+        num_new_points = len(new_hull_array)
+        if self._points is None:
+            buffer_size = max(self._initial_num_points, num_new_points)
+            self._points = np.empty((buffer_size, *new_hull_array.shape[1:]), dtype = new_hull_array.dtype)
+        
+        # Make room for the new points if needed
+        num_used_points = self._end_offset - self._base_offset
+        if num_used_points + num_new_points > len(self._points):
+            self._compact(num_new_points)
+        
+        # Copy the new hull into the point buffer & record where it was stored
+        write_idx = self._end_offset - self._base_offset
+        self._points[write_idx:(write_idx + num_new_points)] = new_hull_array
+        self._offsets_history.append((self._end_offset, self._end_offset + num_new_points))
+        self._end_offset += num_new_points
+    
+    # .................................................................................................................
+    
+    def to_list(self, num_samples = None):
+        
+        ''' Returns the hull history as a (json-friendly) list of lists, optionally limited to num_samples '''
+        
+        points_list = []
+        for start_offset, end_offset in self._offsets_history.to_array(num_samples):
+            start_idx, end_idx = (start_offset - self._base_offset), (end_offset - self._base_offset)
+            points_list.append(self._points[start_idx:end_idx].tolist())
+        
+        return points_list
+    
+    # .................................................................................................................
+    
+    def _compact(self, num_new_points):
+        
+        '''
+        Helper used to remove point data belonging to overwritten samples, when the point buffer is full
+        Also resizes the buffer so that it has (at least) as much free space as used space after compacting
+        '''
+        
+        # Figure out how much of the existing point data is still in use
+        oldest_offset = self._offsets_history[0][0] if len(self._offsets_history) > 0 else self._end_offset
+        num_live_points = self._end_offset - oldest_offset
+        
+        # Copy live points into a new buffer
+        new_buffer_size = max(self._initial_num_points, 2 * (num_live_points + num_new_points))
+        new_points = np.empty((new_buffer_size, *self._points.shape[1:]), dtype = self._points.dtype)
+        start_idx = oldest_offset - self._base_offset
+        new_points[:num_live_points] = self._points[start_idx:(start_idx + num_live_points)]
+        
+        self._points = new_points
+        self._base_offset = oldest_offset
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
+
+# /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+# /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define functions
 
@@ -146,6 +146,57 @@ def load_all_valid_captures(capture_image_iter, max_captures_to_load, target_wid
 
 # .....................................................................................................................
 
+def update_approximate_median(median_estimate_uint8, signed_step_int8, new_frame_uint8, max_step_size = 127):
+    
+    '''
+    Helper function which folds a new frame into a (per-pixel) approximate median estimate, without needing
+    to keep any of the previous frames. Each pixel of the estimate is moved towards the new frame
+    by a step size, which grows by 1 with every consecutive step in the same direction and resets
+    back to 1 when the direction changes. Steps never move past the new frame value.
+    
+    This means that the estimate only creeps towards short-lived changes (e.g. objects passing through a
+    capture), while persistent changes (e.g. lighting) are picked up after a number of captures,
+    similar to a median over a window of captures.
+    
+    Note that this is only an approximation! The step size keeps growing while the estimate chases noise,
+    so with noisy frames (e.g. std. dev. of 8 grey levels) the estimate is typically off from a windowed
+    median by ~2-3 levels on average, ~5-10 levels at the 99th percentile and occasionally up to ~20 levels.
+    
+    Inputs:
+        median_estimate_uint8 -> (Image data) The current median estimate
+        
+        signed_step_int8 -> (Array) Size of the previous step for each pixel, with the sign indicating direction
+        
+        new_frame_uint8 -> (Image data) New frame to fold into the estimate. Must match the estimate shape!
+        
+        max_step_size -> (Integer) Largest step (per pixel, per update) allowed. Must fit into an int8!
+    
+    Outputs:
+        new_median_estimate_uint8, new_signed_step_int8
+    '''
+    
+    # Work with signed values so we can take differences
+    estimate_int16 = np.int16(median_estimate_uint8)
+    prev_step_int16 = np.int16(signed_step_int8)
+    frame_difference = np.int16(new_frame_uint8) - estimate_int16
+    step_direction = np.sign(frame_difference)
+    
+    # Grow the step size if we're moving in the same direction as the last step, otherwise start over
+    same_direction = (step_direction == np.sign(prev_step_int16))
+    step_size = np.where(same_direction, np.minimum(np.abs(prev_step_int16) + 1, max_step_size), 1)
+    
+    # Don't step past the new frame value
+    step_size = np.minimum(step_size, np.abs(frame_difference))
+    new_signed_step = step_direction * step_size
+    
+    # Apply the step to the estimate
+    new_median_estimate_uint8 = np.uint8(estimate_int16 + new_signed_step)
+    new_signed_step_int8 = np.int8(new_signed_step)
+    
+    return new_median_estimate_uint8, new_signed_step_int8
+
+# .....................................................................................................................
+
 def load_newest_image_from_iter(image_iterator):
     
     # Initialize outputs
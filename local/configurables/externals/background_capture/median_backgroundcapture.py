@@ -54,6 +54,7 @@ import numpy as np
 from local.configurables.externals.background_capture.reference_backgroundcapture import Reference_Background_Capture
 from local.configurables.externals.background_capture._helper_functions import load_all_valid_captures
 from local.configurables.externals.background_capture._helper_functions import check_frame_loading_ram_limits
+from local.configurables.externals.background_capture._helper_functions import update_approximate_median
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -72,6 +73,11 @@ class Configurable(Reference_Background_Capture):
         self._ram_limited_min_captures_to_use = None
         self._ram_limited_max_captures_to_use = None        
         
+        # Allocate storage for incremental median state (only used if incremental generation is enabled)
+        self._incremental_median_uint8 = None
+        self._incremental_step_int8 = None
+        self._incremental_capture_count = 0
+        
         # .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  . Control Group 1 .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  .
         
         self.ctrl_spec.new_control_group("Capture Controls")
@@ -161,6 +167,22 @@ class Configurable(Reference_Background_Capture):
                 tooltip = ["Maximum amount of RAM to use when generating a new background.",
                            "Note that this setting works by limiting the number of captures that are used.",
                            "Therefore, this setting may override the 'Min/Max Captures Per Update' settings!"])
+        
+        self.use_incremental_median = \
+        self.ctrl_spec.attach_toggle(
+                "use_incremental_median",
+                label = "Incremental Generation",
+                default_value = False,
+                tooltip = ["If enabled, an approximate median is updated as each new capture is saved,",
+                           "instead of loading all captures and computing the median on every generation.",
+                           "This is much faster and uses far less RAM (independent of the number of captures),",
+                           "but the result is only an approximation of the median, not a drop-in replacement.",
+                           "With noisy captures (e.g. +/- 8 grey levels), the estimate is typically off by",
+                           "~2-3 grey levels on average, ~5-10 for 1% of pixels and up to ~20 for a few pixels,",
+                           "with larger errors for a few captures after sudden (e.g. lighting) changes.",
+                           "The estimate starts from the current background, and generation waits for",
+                           "the 'Minimum Captures Per Update'.",
+                           "Note that the 'Maximum' and RAM usage settings do not apply in this mode!"])
     
     # .................................................................................................................
     
@@ -179,6 +201,42 @@ class Configurable(Reference_Background_Capture):
     
     # .................................................................................................................
     
+    def reset(self):
+        
+        # Clear out incremental median state, so it is re-started from the current background
+        self._incremental_median_uint8 = None
+        self._incremental_step_int8 = None
+        self._incremental_capture_count = 0
+        
+        return super().reset()
+    
+    # .................................................................................................................
+    
+    def process_new_capture(self, capture_image):
+        
+        # Only need to keep track of new captures if we're generating incrementally
+        if not self.use_incremental_median:
+            return
+        
+        # Start the estimate from the current background, if we don't have one already (or the sizing changed)
+        missing_estimate = (self._incremental_median_uint8 is None)
+        if missing_estimate or (self._incremental_median_uint8.shape != capture_image.shape):
+            initial_image = self._current_background_image
+            if (initial_image is None) or (initial_image.shape != capture_image.shape):
+                initial_image = capture_image
+            self._incremental_median_uint8 = initial_image.copy()
+            self._incremental_step_int8 = np.zeros(capture_image.shape, dtype = np.int8)
+            self._incremental_capture_count = 0
+        
+        # Fold the new capture into the median estimate
+        self._incremental_median_uint8, self._incremental_step_int8 = \
+        update_approximate_median(self._incremental_median_uint8, self._incremental_step_int8, capture_image)
+        self._incremental_capture_count += 1
+        
+        return
+    
+    # .................................................................................................................
+    
     def generate_background_from_resources(self,
                                            number_of_captures, capture_image_iter,
                                            num_generates, generate_image_iter,
@@ -189,6 +247,10 @@ class Configurable(Reference_Background_Capture):
         # Initialize (bad) output
         new_background_image = None
         
+        # Use the incrementally updated median estimate, if enabled, instead of loading all the captures
+        if self.use_incremental_median:
+            return self._generate_from_incremental_median(target_width, target_height)
+        
         # Bail if we don't have enough captures
         not_enough_captures = (number_of_captures < self._ram_limited_min_captures_to_use)
         if not_enough_captures:
@@ -224,6 +286,24 @@ class Configurable(Reference_Background_Capture):
     
     # .................................................................................................................
     
+    def _generate_from_incremental_median(self, target_width, target_height):
+        
+        # Bail if we haven't folded in enough captures since starting the estimate
+        not_enough_captures = (self._incremental_capture_count < self.min_captures_to_use)
+        if not_enough_captures or (self._incremental_median_uint8 is None):
+            return None
+        
+        # Make sure the estimate has the target sizing
+        bg_height, bg_width = self._incremental_median_uint8.shape[0:2]
+        correct_shape = (bg_width == target_width) and (bg_height == target_height)
+        if not correct_shape:
+            print("Error generating background!", "  Incremental median has the wrong shape!", sep = "\n")
+            return None
+        
+        return self._incremental_median_uint8.copy()
+    
+    # .................................................................................................................
+    
     def _check_ram_limiting(self):
         
         # Figure out how many captures we're allowed to used base on RAM usage setting        
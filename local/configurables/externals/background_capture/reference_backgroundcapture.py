@@ -230,6 +230,16 @@ class Reference_Background_Capture(Externals_Configurable_Base):
     
     # .................................................................................................................
     
+    # SHOULDN'T OVERRIDE
+    def get_saver_stats(self):
+        
+        ''' Function used to get saver queue/timing info for reporting (entries are None without threading) '''
+        
+        return {"report": self._report_data_saver.get_stats(),
+                "capture": self._capture_data_saver.get_stats()}
+    
+    # .................................................................................................................
+    
     # SHOULDN'T OVERRIDE
     def set_jpg_quality(self, jpg_quality_0_to_100):
         
@@ -359,6 +369,28 @@ class Reference_Background_Capture(Externals_Configurable_Base):
     
     # .................................................................................................................
     
+    # MAY OVERRIDE
+    def process_new_capture(self, capture_image):
+        
+        '''
+        Function called every time a new capture is saved (after saving), with the captured image data.
+        Can be used to incrementally update any internal state used for generating backgrounds,
+        so that generation doesn't need to reload all captures.
+        Note that any state updated here is copied into the parallel generation process when it starts
+        
+        Inputs:
+            capture_image -> (Image data) The newly captured frame
+        
+        Outputs:
+            Nothing!
+        '''
+        
+        # Reference does nothing with new captures...
+        
+        return
+    
+    # .................................................................................................................
+    
     # SHOULD OVERRIDE
     def generate_background_from_resources(self,
                                            num_captures, capture_image_iter,
@@ -560,6 +592,7 @@ class Reference_Background_Capture(Externals_Configurable_Base):
         if need_new_capture:
             self._wait_for_parallel_process()
             self._save_capture_data(input_frame)
+            self.process_new_capture(input_frame)
         
         return need_new_capture
     
@@ -155,6 +155,15 @@ class Reference_Object_Capture(Externals_Configurable_Base):
     
     # .................................................................................................................
     
+    # SHOULDN'T OVERRIDE
+    def get_saver_stats(self):
+        
+        ''' Function used to get saver queue/timing info for reporting (entries are None without threading) '''
+        
+        return {"report": self._report_data_saver.get_stats()}
+    
+    # .................................................................................................................
+    
     #SHOULDN'T OVERRIDE
     def set_json_double_precision(self, json_double_precision):
         self._json_double_precision = json_double_precision
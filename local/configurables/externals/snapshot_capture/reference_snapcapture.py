@@ -147,6 +147,15 @@ class Reference_Snapshot_Capture(Externals_Configurable_Base):
     
     # .................................................................................................................
     
+    # SHOULDN'T OVERRIDE
+    def get_saver_stats(self):
+        
+        ''' Function used to get saver queue/timing info for reporting (entries are None without threading) '''
+        
+        return {"report": self._report_data_saver.get_stats()}
+    
+    # .................................................................................................................
+    
     #SHOULDN'T OVERRIDE
     def set_snapshot_quality(self, snapshot_jpg_quality_0_to_100):
         
@@ -585,6 +585,38 @@ def build_cropping_dataset(frame_wh, station_zones_list, padding_wh = (0, 0)):
     
     return crop_y1y2x1x2_list, cropmask_2d3ch_list, logical_cropmask_1d_list
 
+# .....................................................................................................................
+
+def get_zone_pixel_indices(frame_wh, crop_y1y2x1x2, logical_cropmask_1d):
+    
+    '''
+    Function used to convert cropping & (logical) masking data into a list of pixel indices
+    relative to the full (flattened) frame. Indexing a flattened frame with these indices gives the
+    same pixels (in the same order) as cropping and then applying inmask_pixels_1ch/3ch
+    
+    Inputs:
+        frame_wh -> (Tuple) The width and height of the full frame
+        
+        crop_y1y2x1x2 -> (Tuple) Crop co-ordinates, as given by the build_cropping_dataset(...) function
+        
+        logical_cropmask_1d -> (Numpy array) Logical cropmask, as given by the build_cropping_dataset(...) function
+    
+    Outputs:
+        zone_pixel_indices_1d_array (numpy array)
+    '''
+    
+    # For clarity
+    frame_width, _ = frame_wh
+    crop_y1, _, crop_x1, crop_x2 = crop_y1y2x1x2
+    crop_width = (crop_x2 - crop_x1)
+    
+    # Figure out the row/column (in the cropped frame) of every in-mask pixel, then offset into full frame
+    inmask_crop_indices = np.flatnonzero(logical_cropmask_1d)
+    inmask_crop_rows, inmask_crop_cols = np.divmod(inmask_crop_indices, crop_width)
+    zone_pixel_indices_1d_array = (inmask_crop_rows + crop_y1) * frame_width + (inmask_crop_cols + crop_x1)
+    
+    return zone_pixel_indices_1d_array
+
 # .....................................................................................................................
 # .....................................................................................................................
 
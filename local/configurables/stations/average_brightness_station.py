@@ -120,7 +120,25 @@ class Configurable(Reference_Station):
         cropmask_values_1d_array = inmask_pixels_1ch(cropped_gray_frame, self._logical_cropmask_1ch)
         
         # Now average brightness values
-        one_frame_result = int(np.round(np.mean(cropmask_values_1d_array)))
+        average_brightness = np.mean(cropmask_values_1d_array)
+        one_frame_result = self.process_reduced_frame(average_brightness,
+                                                      current_frame_index, current_epoch_ms, current_datetime)
+        
+        return one_frame_result
+    
+    # .................................................................................................................
+    
+    def get_fused_reduction_spec(self):
+        
+        # Station output only depends on the average brightness value of the zone, so it can be fused
+        return "gray", self._crop_y1y2x1x2, self._logical_cropmask_1ch
+    
+    # .................................................................................................................
+    
+    def process_reduced_frame(self, average_value, current_frame_index, current_epoch_ms, current_datetime):
+        
+        # Output the rounded average brightness
+        one_frame_result = int(np.round(average_value))
         
         return one_frame_result
     
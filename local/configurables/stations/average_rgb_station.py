@@ -117,8 +117,26 @@ class Configurable(Reference_Station):
         cropped_frame = crop_pixels_in_place(frame, self._crop_y1y2x1x2)
         cropmask_values_1d_array = inmask_pixels_3ch(cropped_frame, self._logical_cropmask_1ch)
         
-        # Now average BGR values and re-arrange as RGB for output
-        average_bgr = np.round(np.uint8(np.mean(cropmask_values_1d_array, axis = 0)))
+        # Now average BGR values
+        average_bgr = np.mean(cropmask_values_1d_array, axis = 0)
+        one_frame_result = self.process_reduced_frame(average_bgr,
+                                                      current_frame_index, current_epoch_ms, current_datetime)
+        
+        return one_frame_result
+    
+    # .................................................................................................................
+    
+    def get_fused_reduction_spec(self):
+        
+        # Station output only depends on the average BGR value of the zone, so it can be fused
+        return "bgr", self._crop_y1y2x1x2, self._logical_cropmask_1ch
+    
+    # .................................................................................................................
+    
+    def process_reduced_frame(self, average_value, current_frame_index, current_epoch_ms, current_datetime):
+        
+        # Re-arrange averaged BGR values as RGB for output
+        average_bgr = np.round(np.uint8(average_value))
         one_frame_result = np.flip(average_bgr).tolist()
         
         return one_frame_result
@@ -140,6 +140,44 @@ class Reference_Station(Stations_Configurable_Base):
     
     # .................................................................................................................
     
+    # SHOULDN'T OVERRIDE. Instead override the process_reduced_frame() function
+    def run_reduced(self, average_value, background_image, background_was_updated,
+                    current_frame_index, current_epoch_ms, current_datetime):
+        
+        '''
+        Alternate to the run() function, used when the station bundle evaluates stations in a fused pass
+        Only called for stations which provide a reduction spec (see get_fused_reduction_spec)
+        Behaves exactly like the run() function, except that the station receives the (already computed)
+        average pixel value of its zone, instead of the full video frame
+        
+        Input:
+            average_value -> (Float or numpy array) Average of the masked-in zone pixels, in the color space
+                             requested by the station. Will be a single value for grayscale,
+                             otherwise an array of 3 values
+            
+            (all other inputs are the same as the run() function)
+        
+        Returns:
+            Nothing
+        '''
+        
+        # Update stored background data, if needed
+        if background_was_updated:
+            self._current_background_image = background_image
+            self.process_new_background_image(background_image)
+        
+        # Process the pre-computed zone average with timing info if needed
+        one_frame_result = self.process_reduced_frame(average_value,
+                                                      current_frame_index, current_epoch_ms, current_datetime)
+        
+        # Store the processed result
+        self._latest_one_frame_result_for_config = one_frame_result
+        self._store_one_frame_result(one_frame_result)
+        
+        return
+    
+    # .................................................................................................................
+    
     # SHOULD OVERRIDE
     def process_one_frame(self, frame, current_frame_index, current_epoch_ms, current_datetime):
             
@@ -171,6 +209,53 @@ class Reference_Station(Stations_Configurable_Base):
     
     # .................................................................................................................
     
+    # MAY OVERRIDE. Only for stations whose per-frame result depends on the average value of the zone pixels
+    def get_fused_reduction_spec(self):
+        
+        '''
+        Function used to indicate that a station can be evaluated as part of a fused (shared) pass over
+        the video frame, which is much faster than running every station separately.
+        This is only possible if the per-frame result depends only on the average pixel value within the
+        station zone. Stations providing a spec must also override the process_reduced_frame() function!
+        
+        Inputs:
+            Nothing!
+        
+        Outputs:
+            None (if the station can't be fused, this is the default)
+            
+            Otherwise: color_space, crop_y1y2x1x2, logical_cropmask_1d
+            -> Where color_space is one of "bgr", "gray" or "hsv", and the crop/mask data is
+               in the format given by the build_cropping_dataset(...) helper function
+        '''
+        
+        return None
+    
+    # .................................................................................................................
+    
+    # MAY OVERRIDE. Must be overriden if get_fused_reduction_spec() is overriden!
+    def process_reduced_frame(self, average_value, current_frame_index, current_epoch_ms, current_datetime):
+        
+        '''
+        Function used to process a single frame of data, when the station is evaluated as part of a fused pass
+        Instead of a frame, this function is given the average pixel value of the station zone
+        (in the color space given by the get_fused_reduction_spec() function).
+        Must give the same output as the process_one_frame(...) function!
+        
+        Inputs:
+            average_value -> (Float or numpy array) Average of the masked-in zone pixels.
+                             Will be a single value for grayscale, otherwise an array of 3 values
+            
+            current_frame_index, current_epoch_ms, current_datetime -> Timing data
+        
+        Outputs:
+            one_frame_result
+        '''
+        
+        raise NotImplementedError("Must implement process_reduced_frame() for {}".format(self.class_name))
+    
+    # .................................................................................................................
+    
     # MAY OVERRIDE
     def post_process_output_data(self, current_dataset_list):
         
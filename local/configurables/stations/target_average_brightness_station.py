@@ -162,7 +162,25 @@ class Configurable(Reference_Station):
         cropmask_values_1d_array = inmask_pixels_1ch(cropped_gray_frame, self._logical_cropmask_1ch)
         
         # Now average brightness values
-        average_brightness = np.int32(np.round(np.mean(cropmask_values_1d_array)))
+        average_brightness = np.mean(cropmask_values_1d_array)
+        one_frame_result = self.process_reduced_frame(average_brightness,
+                                                      current_frame_index, current_epoch_ms, current_datetime)
+        
+        return one_frame_result
+    
+    # .................................................................................................................
+    
+    def get_fused_reduction_spec(self):
+        
+        # Station output only depends on the average brightness value of the zone, so it can be fused
+        return "gray", self._crop_y1y2x1x2, self._logical_cropmask_1ch
+    
+    # .................................................................................................................
+    
+    def process_reduced_frame(self, average_value, current_frame_index, current_epoch_ms, current_datetime):
+        
+        # Round the averaged brightness value for comparison against the target range
+        average_brightness = np.int32(np.round(average_value))
         
         # Store averaged brightness value for display purposes (only during config)
         self._latest_average_brightness_for_config = average_brightness
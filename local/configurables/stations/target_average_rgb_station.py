@@ -241,7 +241,25 @@ class Configurable(Reference_Station):
         cropmask_values_1d_array = inmask_pixels_3ch(cropped_frame, self._logical_cropmask_1ch)
         
         # Now average BGR values
-        average_bgr = np.round(np.int32(np.mean(cropmask_values_1d_array, axis = 0)))
+        average_bgr = np.mean(cropmask_values_1d_array, axis = 0)
+        one_frame_result = self.process_reduced_frame(average_bgr,
+                                                      current_frame_index, current_epoch_ms, current_datetime)
+        
+        return one_frame_result
+    
+    # .................................................................................................................
+    
+    def get_fused_reduction_spec(self):
+        
+        # Station output only depends on the average BGR value of the zone, so it can be fused
+        return "bgr", self._crop_y1y2x1x2, self._logical_cropmask_1ch
+    
+    # .................................................................................................................
+    
+    def process_reduced_frame(self, average_value, current_frame_index, current_epoch_ms, current_datetime):
+        
+        # Convert averaged BGR values to integers for comparison against the target ranges
+        average_bgr = np.round(np.int32(average_value))
         
         # Store averaged BGR value for display purposes (only during config)
         self._latest_average_bgr_for_config = average_bgr
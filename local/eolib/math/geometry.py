@@ -525,6 +525,198 @@ class Fixed_Line_Cross:
     # .................................................................................................................
     # .................................................................................................................
 
+
+# /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+# /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+
+
+class Zone_Label_Raster:
+    
+    '''
+    Class used to speed up checks of whether points are inside a set of (normalized) zones
+    All zones are rasterized into a single 'label' image, where every pixel stores bit-flags
+    indicating which zones contain it (i.e. bit k is set if the pixel is inside of zone k).
+    Checking zone membership for an entire array of points then only requires a single lookup,
+    regardless of the number of zones.
+    
+    Pixels close to zone boundaries are ambiguous at the raster resolution, so they are recorded separately.
+    Points landing on these pixels (or outside the raster) can optionally be re-checked
+    using an exact polygon test, in which case results match cv2.pointPolygonTest(...) > 0
+    
+    Note: To match the (per-object) in_zones(...) behavior,
+    zones are only used up until the first empty zone entry is found
+    '''
+    
+    # Shared default settings, used when settings aren't given on initialization
+    default_raster_size_px = 1024
+    default_exact_boundary_check = True
+    
+    # Limit on the number of zones, due to storing zone membership as bit-flags
+    max_zones = 64
+    
+    # .................................................................................................................
+    
+    def __init__(self, zones_list, raster_size_px = None, exact_boundary_check = None):
+        
+        '''
+        Inputs:
+            zones_list -> (List) List of zones, where each zone is a list of normalized xy points
+            
+            raster_size_px -> (Integer or None) Side length of the (square) label image. Larger values
+                              reduce the number of points needing an exact check, at the cost of RAM.
+                              If None, the shared default setting is used
+            
+            exact_boundary_check -> (Boolean or None) If True, points near a zone boundary are checked
+                                    using an exact polygon test. Otherwise the raster result is used as-is.
+                                    If None, the shared default setting is used
+        '''
+        
+        # Fill in shared defaults where needed
+        if raster_size_px is None:
+            raster_size_px = self.default_raster_size_px
+        if exact_boundary_check is None:
+            exact_boundary_check = self.default_exact_boundary_check
+        
+        # Only use zones up until the first empty entry
+        zone_arrays_list = []
+        for each_zone in zones_list:
+            if len(each_zone) == 0:
+                break
+            zone_arrays_list.append(np.float32(each_zone))
+        
+        # Make sure we can store all the zones
+        num_zones = len(zone_arrays_list)
+        if num_zones > self.max_zones:
+            raise ValueError("Can't rasterize more than {} zones! Got {}".format(self.max_zones, num_zones))
+        
+        # Store zone data & settings
+        self.zone_arrays_list = zone_arrays_list
+        self.num_zones = num_zones
+        self.raster_size_px = max(2, int(raster_size_px))
+        self.exact_boundary_check = exact_boundary_check
+        self._raster_scaling = np.float32(self.raster_size_px - 1)
+        
+        # Build the label image, along with an image indicating which pixels are near zone boundaries
+        self.label_image, self.boundary_image = self._build_label_raster()
+    
+    # .................................................................................................................
+    
+    def __repr__(self):
+        return "Zone Label Raster ({} zones @ {} px)".format(self.num_zones, self.raster_size_px)
+    
+    # .................................................................................................................
+    
+    @classmethod
+    def set_default_settings(cls, raster_size_px, exact_boundary_check):
+        cls.default_raster_size_px = raster_size_px
+        cls.default_exact_boundary_check = exact_boundary_check
+    
+    # .................................................................................................................
+    
+    def get_zone_flags(self, xy_array):
+        
+        '''
+        Function which gets the zone membership bit-flags for an array of (normalized) points
+        
+        Inputs:
+            xy_array -> (Array) Array of points to check, with shape: N x 2
+        
+        Outputs:
+            zone_flags_array (integer array of shape: N, where bit k is set if the point is inside of zone k)
+        '''
+        
+        # Handle empty cases, so we still get properly shaped outputs
+        xy_array = np.float32(xy_array).reshape(-1, 2)
+        num_points = len(xy_array)
+        if num_points == 0 or self.num_zones == 0:
+            return np.zeros(num_points, dtype = self.label_image.dtype)
+        
+        # Convert points into raster pixel indices
+        xy_px = np.int32(np.round(xy_array * self._raster_scaling))
+        in_bounds = np.all((xy_px >= 0) & (xy_px < self.raster_size_px), axis = 1)
+        x_px, y_px = np.clip(xy_px, 0, self.raster_size_px - 1).T
+        
+        # Look up zone membership for all points at once
+        zone_flags_array = self.label_image[y_px, x_px]
+        
+        # Re-check ambiguous points with an exact test, if needed
+        if self.exact_boundary_check:
+            needs_exact_check = np.logical_or(np.logical_not(in_bounds), self.boundary_image[y_px, x_px] > 0)
+            if np.any(needs_exact_check):
+                zone_flags_array[needs_exact_check] = self._get_exact_zone_flags(xy_array[needs_exact_check])
+        
+        return zone_flags_array
+    
+    # .................................................................................................................
+    
+    def points_in_zones(self, xy_array):
+        
+        ''' Function which checks which (normalized) points are inside any zone. Returns a boolean array '''
+        
+        return (self.get_zone_flags(xy_array) > 0)
+    
+    # .................................................................................................................
+    
+    def point_in_zones(self, xy_point):
+        
+        ''' Function which checks if a single (normalized) point is inside any zone '''
+        
+        return bool(self.get_zone_flags(xy_point)[0] > 0)
+    
+    # .................................................................................................................
+    
+    def _build_label_raster(self):
+        
+        ''' Helper used to rasterize all zones into a single bit-flag label image '''
+        
+        # Use the smallest integer type which can hold a bit for every zone
+        label_dtype = np.uint8
+        for each_dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+            label_dtype = each_dtype
+            if self.num_zones <= (8 * np.dtype(each_dtype).itemsize):
+                break
+        
+        # Allocate blank label & boundary images
+        raster_shape = (self.raster_size_px, self.raster_size_px)
+        label_image = np.zeros(raster_shape, dtype = label_dtype)
+        boundary_image = np.zeros(raster_shape, dtype = np.uint8)
+        zone_mask_1ch = np.empty(raster_shape, dtype = np.uint8)
+        
+        for each_idx, each_zone_array in enumerate(self.zone_arrays_list):
+            
+            # Draw each zone separately and record its bit-flag in the label image
+            zone_array_px = np.int32(np.round(each_zone_array * self._raster_scaling))
+            zone_mask_1ch.fill(0)
+            cv2.fillPoly(zone_mask_1ch, [zone_array_px], 255, cv2.LINE_8)
+            zone_flag = label_dtype(1 << each_idx)
+            np.bitwise_or(label_image, zone_flag, out = label_image, where = (zone_mask_1ch > 0))
+            
+            # Mark pixels along the zone boundary, where the raster may disagree with an exact test
+            # -> Thick lines cover errors from rounding the zone points & points to the nearest pixel
+            cv2.polylines(boundary_image, [zone_array_px], True, 255, 5, cv2.LINE_8)
+        
+        return label_image, boundary_image
+    
+    # .................................................................................................................
+    
+    def _get_exact_zone_flags(self, xy_array):
+        
+        ''' Helper used to get zone membership bit-flags using an exact (but slow) polygon test '''
+        
+        zone_flags_array = np.zeros(len(xy_array), dtype = self.label_image.dtype)
+        for each_idx, each_zone_array in enumerate(self.zone_arrays_list):
+            zone_flag = self.label_image.dtype.type(1 << each_idx)
+            for each_pt_idx, (each_x, each_y) in enumerate(xy_array):
+                in_zone = (cv2.pointPolygonTest(each_zone_array, (float(each_x), float(each_y)), False) > 0)
+                if in_zone:
+                    zone_flags_array[each_pt_idx] |= zone_flag
+        
+        return zone_flags_array
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define functions
 
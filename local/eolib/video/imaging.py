@@ -617,6 +617,103 @@ def crop_pixels_and_copy(frame, crop_y1y2x1x2):
     cy1, cy2, cx1, cx2 = crop_y1y2x1x2
     return frame.copy()[cy1:cy2, cx1:cx2]
 
+# .....................................................................................................................
+
+def get_nonzero_crop_y1y2x1x2(frame_1ch, margin_px = 0):
+    
+    '''
+    Function which finds the crop co-ordinates (in the sequence y1, y2, x1, x2) of the bounding box
+    around all non-zero pixels of a single-channel image (for example, a mask or binary frame)
+    The box can be expanded by a margin, which is clipped to the frame boundaries.
+    Useful for restricting processing to a region-of-interest, when everything else is going to be masked off.
+    
+    Inputs:
+        frame_1ch -> (Image data) A single-channel (uint8) image
+    
+        margin_px -> (Integer) Number of pixels to expand the crop box on all sides
+    
+    Outputs:
+        crop_y1y2x1x2 (or None, if there are no non-zero pixels!)
+    '''
+    
+    # Bounding rect of an image gives the box around all non-zero pixels
+    x1, y1, box_w, box_h = cv2.boundingRect(frame_1ch)
+    if box_w == 0 or box_h == 0:
+        return None
+    
+    # Expand the box by the given margin, without going outside the frame
+    frame_h, frame_w = frame_1ch.shape[0:2]
+    crop_x1 = max(0, x1 - margin_px)
+    crop_y1 = max(0, y1 - margin_px)
+    crop_x2 = min(frame_w, x1 + box_w + margin_px)
+    crop_y2 = min(frame_h, y1 + box_h + margin_px)
+    
+    return (crop_y1, crop_y2, crop_x1, crop_x2)
+
+# .....................................................................................................................
+
+def paste_crop_into_blank_frame(cropped_frame, frame_wh, crop_y1y2x1x2):
+    
+    '''
+    Function which places a cropped image back into a full-sized (blank) frame, at the given crop co-ordinates
+    Intended to reverse cropping (see crop_pixels_in_place), when everything outside of the crop is blank anyway.
+    If the crop covers the full frame, the cropped frame is returned as-is (no copying)
+    '''
+    
+    # Don't bother pasting if the crop already covers the full frame
+    frame_w, frame_h = frame_wh
+    cy1, cy2, cx1, cx2 = crop_y1y2x1x2
+    if (cy1, cy2, cx1, cx2) == (0, frame_h, 0, frame_w):
+        return cropped_frame
+    
+    # Create blank frame to paste the cropped data into
+    blank_shape = (frame_h, frame_w, *cropped_frame.shape[2:])
+    full_frame = np.zeros(blank_shape, dtype = cropped_frame.dtype)
+    full_frame[cy1:cy2, cx1:cx2] = cropped_frame
+    
+    return full_frame
+
+# .....................................................................................................................
+
+def filter_components_by_stats(binary_frame_1ch, keep_components_func, connectivity = 8):
+    
+    '''
+    Function which removes connected components (i.e. blobs) from a binary image, based on their stats
+    All components are checked at once (as arrays), so this is much faster than examining
+    blobs one-at-a-time when there are many (noisy) blobs that would be discarded anyways.
+    
+    Inputs:
+        binary_frame_1ch -> (Image data) A single-channel (uint8) binary image
+    
+        keep_components_func -> (Function) Function of the form: func(widths_px, heights_px, areas_px)
+                                where each input is an array with one entry per component
+                                (width/height are bounding box sizes, area is the pixel count).
+                                Must return a boolean array indicating which components to keep
+    
+        connectivity -> (Integer) Either 4 or 8. Should be 8 to match contour finding
+    
+    Outputs:
+        filtered_binary_frame_1ch (or the original frame, if all components are kept)
+    '''
+    
+    # Get stats for all components, ignoring the background label (index 0)
+    _, label_frame, stats_array, _ = cv2.connectedComponentsWithStats(binary_frame_1ch, connectivity = connectivity)
+    widths_px = stats_array[1:, cv2.CC_STAT_WIDTH]
+    heights_px = stats_array[1:, cv2.CC_STAT_HEIGHT]
+    areas_px = stats_array[1:, cv2.CC_STAT_AREA]
+    keep_array = keep_components_func(widths_px, heights_px, areas_px)
+    
+    # Don't bother re-drawing the frame if we're keeping everything
+    if np.all(keep_array):
+        return binary_frame_1ch
+    
+    # Use a lookup table to re-draw only the kept components (background label always maps to zero)
+    keep_lut = np.zeros(1 + len(keep_array), dtype = np.uint8)
+    keep_lut[1:][keep_array] = 255
+    filtered_binary_frame_1ch = keep_lut[label_frame]
+    
+    return filtered_binary_frame_1ch
+
 # .....................................................................................................................
 # .....................................................................................................................
 
@@ -13,8 +13,6 @@ Created on Fri Jul 10 14:56:55 2020
 import cv2
 import numpy as np
 
-from collections import deque
-
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define classes
@@ -26,11 +24,30 @@ class Frame_Deck:
     
     def __init__(self, max_deck_length):
         
-        ''' Used for rolling storage of frame data. Mainly intended for use with frame differencing or summing '''
+        '''
+        Used for rolling storage of frame data. Mainly intended for use with frame differencing or summing
+        
+        Frames are stored in a single preallocated ring array (shape: max_length x frame shape), which is
+        allocated from the first frame added to the deck. Frames are copied into the ring when added,
+        and frames read back out of the deck are views into the ring, so they will be overwritten once
+        the deck wraps around (i.e. after max_length more frames are added)!
+        
+        Summation results are maintained as a running sum (newest frame added, frame leaving
+        the summation window subtracted), so that windowed sums don't depend on the summation depth
+        '''
         
-        # Initialize the deck and store max length for reference
-        self.deck = deque([], maxlen = max_deck_length)
+        # Store max length for reference
         self.max_length = max_deck_length
+        
+        # Allocate storage for the ring array & ring indexing
+        self._ring = None
+        self._newest_slot = -1
+        self._length = 0
+        
+        # Allocate storage for cached results
+        self._running_sum = None
+        self._running_sum_length = None
+        self._absdiff_cache_dict = {}
     
     # .................................................................................................................
     
@@ -46,7 +63,7 @@ class Frame_Deck:
     
     @property
     def length(self):
-        return len(self.deck)
+        return self._length
     
     # .................................................................................................................
     
@@ -67,26 +84,27 @@ class Frame_Deck:
             new_max_length -> (Integer) New max length to use for the frame deck
             
             clear_on_resize -> (Boolean) If true, the contents of the existing deck will be cleared after
-                               resizing the deck. Otherwise, the old data will be kept, but there may be
-                               missing data or empty entries in the deck due to change in max size!
+                               resizing the deck. Otherwise, the newest frames from the old deck will be kept
+                               (as many as will fit in the new deck size)
         
         Outputs:
             Nothing!
         '''
         
-        # First create an empty deque with the new max length
-        new_deck = deque([], maxlen = new_max_length)
-        
-        # If we're not clearing, we need to take frames from the old deck and move them into the new one
+        # Grab the newest frames from the old deck (in newest-to-oldest order), if we're not clearing
+        frames_to_keep_list = []
         if not clear_on_resize:
-            old_deck_length = self.length
-            for k in range(old_deck_length):
-                frame_from_old_deck = self.read_from_oldest(k)
-                new_deck.append(frame_from_old_deck)
+            num_to_keep = min(self.length, new_max_length)
+            frames_to_keep_list = [self.read_from_newest(k).copy() for k in range(num_to_keep)]
         
-        # Update internal record of max length & deck
-        self.new_max_length = new_max_length
-        self.deck = new_deck
+        # Update internal record of max length & wipe out the old ring, so it gets re-allocated at the new size
+        self.max_length = new_max_length
+        self._ring = None
+        self.clear_deck()
+        
+        # Re-insert old frames, oldest first, so that the newest frame ends up at the front of the deck
+        for each_frame in reversed(frames_to_keep_list):
+            self.add_to_deck(each_frame)
         
         return
     
@@ -100,21 +118,18 @@ class Frame_Deck:
         Inputs:
             frame -> (Image data) The frame to fill the deck with
             
-            fill_width_copys -> (Boolean) If True, the provided frame will be copied for each entry into the
-                                deck. If the frame data will not be modified,
-                                this can be set to False for improved performance
+            fill_width_copys -> (Boolean) Kept for compatibility only. The deck always stores
+                                its own copy of frame data, so this setting has no effect
         
         Outputs:
             Nothing!
         '''
         
         self.clear_deck()
-        if fill_with_copys:
-            for k in range(self.max_length):
-                self.deck.appendleft(frame.copy())
-        else:
-            for k in range(self.max_length):
-                self.deck.appendleft(frame)
+        self._allocate_ring_like(frame)
+        self._ring[:] = frame
+        self._newest_slot = 0
+        self._length = self.max_length
         
         return
     
@@ -129,9 +144,7 @@ class Frame_Deck:
             frame -> (Image data) A frame which will be used as a reference for creating
                      blank frames (i.e. all zeros) with the same shape/type that will be used to fill the deck
             
-            fill_with_copys -> (Boolean) If True, the blanks will be copied for each entry into the
-                               deck. If the blank frame data will not be modified,
-                               this can be set to False for improved performance
+            fill_with_copys -> (Boolean) Kept for compatibility only, has no effect
         
         Outputs:
             Nothing!
@@ -154,9 +167,7 @@ class Frame_Deck:
                            Normally, this tuple would either be (height, width, channel) or in the case of
                            single channel frames (e.g. binary or grayscale), it would just be (height, width)
             
-            fill_with_copys -> (Boolean) If True, the blanks will be copied for each entry into the
-                               deck. If the blank frame data will not be modified,
-                               this can be set to False for improved performance
+            fill_with_copys -> (Boolean) Kept for compatibility only, has no effect
         
         Outputs:
             Nothing!
@@ -171,17 +182,44 @@ class Frame_Deck:
     
     def clear_deck(self):
         
-        ''' Function used to empty all contents of the frame deck '''
+        ''' Function used to empty all contents of the frame deck. Ring storage is kept for re-use '''
         
-        self.deck.clear()
+        self._newest_slot = -1
+        self._length = 0
+        self._clear_cached_results()
     
     # .................................................................................................................
     
     def add_to_deck(self, frame):
         
-        ''' Function used to add new frame data to the deck '''
+        '''
+        Function used to add new frame data to the deck
+        Note that the frame data is copied into the deck, so the given frame can be safely modified afterwards
+        If the frame shape/type doesn't match the existing deck contents, the deck will be reset!
+        '''
         
-        self.deck.appendleft(frame)
+        # Re-allocate (and empty) the deck if the incoming frame doesn't match the stored frames
+        if not self._ring_matches_frame(frame):
+            self.clear_deck()
+            self._allocate_ring_like(frame)
+        
+        # Remove the frame leaving the summation window from the running sum, before it can be overwritten
+        if self._running_sum is not None:
+            if self.length >= self._running_sum_length:
+                leaving_frame = self.read_from_newest(self._running_sum_length - 1)
+                np.subtract(self._running_sum, leaving_frame, out = self._running_sum)
+            else:
+                self._running_sum = None
+        
+        # Overwrite the oldest slot in the ring with the new frame
+        self._newest_slot = (self._newest_slot + 1) % self.max_length
+        self._ring[self._newest_slot] = frame
+        self._length = min(1 + self.length, self.max_length)
+        
+        # Add new frame to the running sum & clear any (now out-dated) differencing results
+        if self._running_sum is not None:
+            np.add(self._running_sum, self._ring[self._newest_slot], out = self._running_sum)
+        self._absdiff_cache_dict = {}
     
     # .................................................................................................................
     
@@ -189,6 +227,8 @@ class Frame_Deck:
         
         '''
         Function used to read frames from the deck, relative to the 'newest' data
+        Note that the returned frame is a view into the deck storage, it should not be modified directly
+        (use the modify_one() function instead) and will be overwritten as new frames are added to the deck
         
         Inputs:
             relative_index -> (Integer) Index of frame data to read,
@@ -200,8 +240,7 @@ class Frame_Deck:
             frame_data
         '''
         
-        new_idx = relative_index
-        return self.deck[new_idx]
+        return self._ring[self._get_ring_slot(relative_index)]
     
     # .................................................................................................................
     
@@ -209,6 +248,7 @@ class Frame_Deck:
         
         '''
         Function used to read frames from the deck, relative to the 'oldest' data
+        Note that the returned frame is a view into the deck storage (see read_from_newest() function)
         
         Inputs:
             relative_index -> (Integer) Index of frame data to read,
@@ -221,7 +261,7 @@ class Frame_Deck:
         '''
         
         old_idx = self.last_index - relative_index
-        return self.deck[old_idx]
+        return self.read_from_newest(old_idx)
     
     # .................................................................................................................
     
@@ -232,6 +272,9 @@ class Frame_Deck:
         some older frame in the deck. Note that if the older frame isn't in the deck already,
         a blank (all zeros) frame will be returned instead, with the same shape as the newest frame
         
+        Results are cached until the deck is next modified, so repeated calls are cheap.
+        The returned frame should therefore not be modified in-place!
+        
         Inputs:
             difference_depth -> (Integer) The index of the frame to use for differencing with the first frame
         
@@ -239,6 +282,11 @@ class Frame_Deck:
             absolute_frame_difference
         '''
         
+        # Re-use existing result if possible
+        absolute_frame_difference = self._absdiff_cache_dict.get(difference_depth, None)
+        if absolute_frame_difference is not None:
+            return absolute_frame_difference
+        
         # Take difference with some simple error handling
         newest_frame = self.read_from_newest(0)
         try:
@@ -248,6 +296,9 @@ class Frame_Deck:
         except (IndexError, cv2.error):
             absolute_frame_difference = np.zeros_like(newest_frame)
         
+        # Hang on to result in case it's requested again before the deck changes
+        self._absdiff_cache_dict[difference_depth] = absolute_frame_difference
+        
         return absolute_frame_difference
     
     # .................................................................................................................
@@ -265,13 +316,7 @@ class Frame_Deck:
             summed_frame (float32 image data)
         '''
         
-        # Gather all the frames needed for summing
-        frame_list = [self.read_from_newest(each_idx) for each_idx in range(num_frames_to_sum)]
-        
-        # Sum up all frames in float format so we avoid overflow
-        summed_frame = np.sum(frame_list, axis = 0, dtype = np.float32)
-        
-        return summed_frame
+        return np.float32(self._get_running_sum(num_frames_to_sum))
     
     # .................................................................................................................
     
@@ -290,16 +335,30 @@ class Frame_Deck:
         '''
         
         # Force returned result to be a 'proper' uint8 image
-        return np.uint8(np.clip(self.sum_from_deck_float32(num_frames_to_sum), 0, 255))
+        return np.uint8(np.clip(self._get_running_sum(num_frames_to_sum), 0, 255))
     
     # .................................................................................................................
     
     def modify_all(self, frame_modifier_callback):
         
-        ''' Function used to apply a callback to all frames in the deck '''
+        '''
+        Function used to apply a callback to all frames in the deck
+        Unlike the modify_one() function, the callback is allowed to change the shape/type of
+        the frames (e.g. resizing), as long as every frame ends up with the same shape/type
+        '''
         
-        for each_idx, each_frame in enumerate(self.deck):
-            self.deck[each_idx] = frame_modifier_callback(each_frame)
+        # Bail if there's nothing to modify
+        if self.length == 0:
+            return
+        
+        # Apply callback to all frames, in newest-to-oldest order
+        modified_frames_list = [frame_modifier_callback(self.read_from_newest(k)) for k in range(self.length)]
+        
+        # Re-build the ring, since modified frames may not match the existing storage
+        self._ring = None
+        self.clear_deck()
+        for each_frame in reversed(modified_frames_list):
+            self.add_to_deck(each_frame)
         
         return
     
@@ -310,6 +369,8 @@ class Frame_Deck:
         '''
         Helper function which allows overwriting a specific frame in the deck
         Intended for use with 'iterate_all() function
+        Note that the new frame must have the same shape/type as the existing deck frames.
+        To change the shape of all frames (e.g. resizing), use the modify_all() function instead!
         
         Inputs:
             deck_index -> (Integer) The deck index of the frame to modify
@@ -320,7 +381,12 @@ class Frame_Deck:
             Nothing!
         '''
         
-        self.deck[deck_index] = new_frame
+        # Make sure we don't end up with mixed frame shapes/types in the deck
+        if not self._ring_matches_frame(new_frame):
+            raise ValueError("Can't modify frame deck entry with a different shape/type! Use modify_all() instead")
+        
+        self._ring[self._get_ring_slot(deck_index)] = new_frame
+        self._clear_cached_results()
     
     # .................................................................................................................
     
@@ -336,11 +402,87 @@ class Frame_Deck:
                 frame_deck.modify_one(each_idx, new_frame)
         '''
         
-        for each_idx, each_frame in enumerate(self.deck):
-            yield each_idx, each_frame
+        for each_idx in range(self.length):
+            yield each_idx, self.read_from_newest(each_idx)
+        
+        return
+    
+    # .................................................................................................................
+    
+    def _get_ring_slot(self, relative_index):
+        
+        ''' Helper used to convert deck indexing (relative to the newest frame) into a ring array index '''
+        
+        # Allow negative indexing from the oldest frame, like a regular list/deque
+        deck_index = (relative_index + self.length) if relative_index < 0 else relative_index
+        if not (0 <= deck_index < self.length):
+            raise IndexError("Frame deck index out of range ({}, deck length: {})".format(relative_index, self.length))
+        
+        return (self._newest_slot - deck_index) % self.max_length
+    
+    # .................................................................................................................
+    
+    def _ring_matches_frame(self, frame):
+        
+        ''' Helper used to check if a given frame can be stored in the existing ring array '''
+        
+        if self._ring is None:
+            return False
+        
+        return (self._ring.shape[1:] == frame.shape) and (self._ring.dtype == frame.dtype)
+    
+    # .................................................................................................................
+    
+    def _allocate_ring_like(self, frame):
+        
+        ''' Helper used to (re-)allocate ring storage for frames with the same shape/type as the given frame '''
+        
+        if not self._ring_matches_frame(frame):
+            ring_shape = (self.max_length, *frame.shape)
+            self._ring = np.empty(ring_shape, dtype = frame.dtype)
         
         return
     
+    # .................................................................................................................
+    
+    def _clear_cached_results(self):
+        
+        ''' Helper used to wipe out cached results, whenever the deck contents are altered '''
+        
+        self._running_sum = None
+        self._running_sum_length = None
+        self._absdiff_cache_dict = {}
+    
+    # .................................................................................................................
+    
+    def _get_running_sum(self, num_frames_to_sum):
+        
+        '''
+        Helper used to get the sum of a number of frames, starting from the newest frame in the deck
+        The sum is kept up-to-date as frames are added to the deck, so it only needs to be
+        fully re-computed if the number of frames to sum changes or if the deck is modified
+        '''
+        
+        # Re-use the existing running sum if possible
+        if self._running_sum is not None and self._running_sum_length == num_frames_to_sum:
+            return self._running_sum
+        
+        # Sum using integers when possible, so that adding/subtracting frames over time can't accumulate errors
+        frame_dtype = self._ring.dtype
+        is_small_int = (np.issubdtype(frame_dtype, np.integer) and frame_dtype.itemsize <= 2)
+        sum_dtype = np.int32 if is_small_int else np.float64
+        
+        # Add up all frames in the summation window
+        running_sum = np.zeros(self._ring.shape[1:], dtype = sum_dtype)
+        for each_idx in range(num_frames_to_sum):
+            np.add(running_sum, self.read_from_newest(each_idx), out = running_sum)
+        
+        # Store running sum for re-use as new frames are added
+        self._running_sum = running_sum
+        self._running_sum_length = num_frames_to_sum
+        
+        return running_sum
+    
     # .................................................................................................................
     # .................................................................................................................
 
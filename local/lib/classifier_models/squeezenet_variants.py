@@ -260,6 +260,57 @@ class Full_SqueezeNet_112x112(nn.Module):
     
     # .................................................................................................................
     
+    def predict_batch(self, cropped_image_numpy_list, batch_size = 32):
+        
+        '''
+        Batched equivalent of the predict(...) function, intended for classifying many images at once
+        Images are copied into a fixed-size (pre-allocated) batch tensor, which is run through the model
+        in one call (with gradient tracking disabled), rather than paying the per-call overhead for every image
+        
+        Inputs:
+            cropped_image_numpy_list -> (List) List of (BGR) images to classify. Can be any size
+            
+            batch_size -> (Integer) Maximum number of images to run through the model at once
+        
+        Outputs:
+            prediction_list -> (List) List of (predicted_class_label, prediction_score) tuples,
+                               in the same order as the input image list
+        '''
+        
+        # Allocate storage for outputs
+        num_images = len(cropped_image_numpy_list)
+        prediction_list = []
+        if num_images == 0:
+            return prediction_list
+        
+        # Allocate a fixed-size batch tensor, which gets re-filled for every batch
+        batch_size = max(1, min(batch_size, num_images))
+        input_width, input_height = self.expected_input_wh
+        batch_tensor = torch.empty((batch_size, 3, input_height, input_width), dtype = torch.float32)
+        
+        with torch.no_grad():
+            for batch_start_idx in range(0, num_images, batch_size):
+                
+                # Copy prepared images into the batch tensor
+                batch_image_list = cropped_image_numpy_list[batch_start_idx:(batch_start_idx + batch_size)]
+                num_in_batch = len(batch_image_list)
+                for each_idx, each_image in enumerate(batch_image_list):
+                    batch_tensor[each_idx] = self.prepare_numpy_inputs(each_image)
+                
+                # Run raw computation step to get model outputs for the whole batch
+                model_outputs = self(batch_tensor[:num_in_batch])
+                predicted_raw_scores, predicted_class_idxs = torch.max(model_outputs, 1)
+                prediction_scores = predicted_raw_scores / torch.sum(model_outputs, 1)
+                
+                # Convert model outputs to class labels & scores
+                for each_class_idx, each_score in zip(predicted_class_idxs.tolist(), prediction_scores.tolist()):
+                    predicted_class_label = self.ordered_class_labels_list[each_class_idx]
+                    prediction_list.append((predicted_class_label, float(each_score)))
+        
+        return prediction_list
+    
+    # .................................................................................................................
+    
     def set_to_inference_mode(self):
         
         '''
@@ -554,6 +605,20 @@ def initialize_weights(model, final_conv_layer, enable = True):
 
 # .....................................................................................................................
 
+def set_inference_threads(num_threads = 0):
+    
+    '''
+    Helper function used to limit the number of (cpu) threads used by pytorch when running models
+    A thread count of 0 (or less) leaves the pytorch default in place
+    '''
+    
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+    
+    return torch.get_num_threads()
+
+# .....................................................................................................................
+
 def load_state_dict_no_classifier(new_model):
         
     # Remove original state dictionary entries containing classifier weights/biases
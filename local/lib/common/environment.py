@@ -121,6 +121,112 @@ def get_env_autopost_period_mins():
 # .....................................................................................................................
 
 
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Saving functions
+
+# .....................................................................................................................
+
+def get_env_deferred_encoding():
+    return get_env("SAVER_DEFERRED_ENCODING", 0, bool)
+
+# .....................................................................................................................
+
+def get_env_saver_num_workers():
+    return get_env("SAVER_NUM_WORKERS", 1, int)
+
+# .....................................................................................................................
+
+def get_env_saver_backpressure_policy():
+    return get_env("SAVER_BACKPRESSURE_POLICY", "block", str)
+
+# .....................................................................................................................
+
+def get_env_saver_sync_batches():
+    return get_env("SAVER_SYNC_BATCHES", 0, bool)
+
+# .....................................................................................................................
+
+def get_env_object_report_format():
+    return str(get_env("OBJECT_REPORT_FORMAT", "jsongz", str)).lower()
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Processing functions
+
+# .....................................................................................................................
+
+def get_env_fused_station_evaluation():
+    return get_env("STATION_FUSED_EVALUATION", 1, bool)
+
+# .....................................................................................................................
+
+def get_env_station_num_workers():
+    return get_env("STATION_NUM_WORKERS", 0, int)
+
+# .....................................................................................................................
+
+def get_env_rtsp_adaptive_frame_skip():
+    return get_env("RTSP_ADAPTIVE_FRAME_SKIP", 0, bool)
+
+# .....................................................................................................................
+
+def get_env_rtsp_target_analysis_fps():
+    return get_env("RTSP_TARGET_ANALYSIS_FPS", 0, float)
+
+# .....................................................................................................................
+
+def get_env_telemetry_enabled():
+    return get_env("TELEMETRY_ENABLED", 1, bool)
+
+# .....................................................................................................................
+
+def get_env_telemetry_period_sec():
+    return get_env("TELEMETRY_PERIOD_SEC", 30, float)
+
+# .....................................................................................................................
+
+def get_env_core_readonly_check():
+    return get_env("CORE_READONLY_CHECK", 0, bool)
+
+# .....................................................................................................................
+
+def get_env_zone_raster_size():
+    return get_env("ZONE_RASTER_SIZE", 1024, int)
+
+# .....................................................................................................................
+
+def get_env_zone_raster_exact_boundary():
+    return get_env("ZONE_RASTER_EXACT_BOUNDARY", 1, bool)
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Database functions
+
+# .....................................................................................................................
+
+def get_env_file_db_cache():
+    return get_env("FILE_DB_CACHE", 1, bool)
+
+# .....................................................................................................................
+
+def get_env_classifier_batch_size():
+    return get_env("CLASSIFIER_BATCH_SIZE", 32, int)
+
+# .....................................................................................................................
+
+def get_env_classifier_num_threads():
+    return get_env("CLASSIFIER_NUM_THREADS", 0, int)
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Pathing functions
 
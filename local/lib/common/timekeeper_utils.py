@@ -159,6 +159,22 @@ class Timekeeper:
         self._frame_index += 1
         
         return current_frame_index
+    
+    # .................................................................................................................
+    
+    def skip_frame_index(self, num_skipped_frames):
+        
+        '''
+        Function used to advance the frame index counter for frames that were read but never processed.
+        Intended for RTSP streams that skip frames when processing can't keep up, so that the
+        frame index keeps counting source frames (as if every frame had been processed)
+        '''
+        
+        # Skipping can't occur before the first frame, but guard against it anyways
+        if self._frame_index is not None:
+            self._frame_index += num_skipped_frames
+        
+        return
 
     # .................................................................................................................
     # .................................................................................................................
@@ -108,6 +108,12 @@ def build_state_file_path(location_select_folder_path, camera_select):
 
 # .....................................................................................................................
 
+def build_metrics_file_path(location_select_folder_path, camera_select):
+    ''' Build pathing to the file used to store performance metrics for running processes '''
+    return build_system_log_path(location_select_folder_path, camera_select, "state", "metrics.json")
+
+# .....................................................................................................................
+
 def build_stdout_log_file_path(location_select_folder_path, camera_select):
     
     ''' Build pathing to a file used to store stdout log for a running camera '''
@@ -49,9 +49,12 @@ find_path_to_local()
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Imports
 
+import io
 import ujson
 import gzip
 
+import numpy as np
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define utility functions
@@ -104,6 +107,56 @@ def encode_jsongz_data(metadata_dict, json_double_precision):
     
     return encd_jsongz_data
 
+# .....................................................................................................................
+
+def encode_npz_data(metadata_dict, json_double_precision, use_float16 = False):
+    
+    '''
+    Function which encodes metadata into a binary (npz) format, intended for object reporting.
+    Large tracking data (xy_center, hull & track_status) is stored as packed numpy arrays,
+    while all other data is stored as a (small) json header. This is much faster to encode/decode
+    and takes up less space compared to (gzipped) json, especially for long-lived objects.
+    
+    Hull data is stored as a single flattened array of points, along with an array of offsets
+    indicating where each hull starts/ends (since each hull can have a different number of points)
+    
+    Metadata without tracking data is stored with just the json header
+    '''
+    
+    # Pull tracking data out of the metadata, so it isn't json encoded
+    header_dict = dict(metadata_dict)
+    tracking_dict = dict(header_dict.get("tracking", {}))
+    xy_center_list = tracking_dict.pop("xy_center", None)
+    hull_list = tracking_dict.pop("hull", None)
+    track_status_list = tracking_dict.pop("track_status", None)
+    if "tracking" in header_dict:
+        header_dict["tracking"] = tracking_dict
+    
+    # Record the packed array names, so we know how to reconstruct the original data when loading
+    float_dtype = np.float16 if use_float16 else np.float32
+    packed_array_dict = {}
+    if xy_center_list is not None:
+        packed_array_dict["xy_center"] = np.array(xy_center_list, dtype = float_dtype).reshape(-1, 2)
+    if hull_list is not None:
+        hull_arrays_list = [np.array(each_hull, dtype = float_dtype).reshape(-1, 2) for each_hull in hull_list]
+        hull_lengths_list = [len(each_hull_array) for each_hull_array in hull_arrays_list]
+        empty_points = np.empty((0, 2), dtype = float_dtype)
+        packed_array_dict["hull_points"] = np.concatenate(hull_arrays_list) if hull_arrays_list else empty_points
+        packed_array_dict["hull_offsets"] = np.int32(np.cumsum([0, *hull_lengths_list]))
+    if track_status_list is not None:
+        packed_array_dict["track_status"] = np.int8(track_status_list)
+    
+    # Encode header as json, stored as a byte array so that everything fits in the same file
+    encd_header = encode_json_data(header_dict, json_double_precision)
+    packed_array_dict["header"] = np.frombuffer(bytes(encd_header, "ascii"), dtype = np.uint8)
+    
+    # Write everything into a (compressed) npz file, in memory
+    bytes_io = io.BytesIO()
+    np.savez_compressed(bytes_io, **packed_array_dict)
+    encd_npz_data = bytes_io.getvalue()
+    
+    return encd_npz_data
+
 # .....................................................................................................................
 # .....................................................................................................................
 
@@ -122,6 +175,19 @@ def decode_jsongz_data(jsongz_byte_data):
     
     return python_data
 
+# .....................................................................................................................
+
+def decode_npz_data(npz_byte_data, arrays_as_lists = True, json_double_precision = 3):
+    
+    '''
+    Function which takes in npz byte data (see encode_npz_data) and converts it back to python data types
+    If arrays_as_lists is False, the tracking data will be returned as numpy arrays (hulls as a list of arrays),
+    which is faster, but won't be json-serializable!
+    When returning lists, float values are rounded (to the json_double_precision) to match json-saved metadata
+    '''
+    
+    return _unpack_npz_metadata(io.BytesIO(npz_byte_data), arrays_as_lists, json_double_precision)
+
 # .....................................................................................................................
 # .....................................................................................................................
 
@@ -155,6 +221,19 @@ def write_encoded_jsongz(save_folder_path, save_name_no_ext, encoded_jsongz_data
     
     return save_path
 
+# .....................................................................................................................
+
+def write_encoded_npz(save_folder_path, save_name_no_ext, encoded_npz_data):
+    
+    ''' Helper function used to write encoded npz data to disk '''
+    
+    save_name = "{}.npz".format(save_name_no_ext)
+    save_path = os.path.join(save_folder_path, save_name)
+    with open(save_path, "wb") as out_file:
+        out_file.write(encoded_npz_data)
+    
+    return save_path
+
 # .....................................................................................................................
 # .....................................................................................................................
 
@@ -257,9 +336,72 @@ def load_metadata(load_path):
         loaded_data (dictionary)
     '''
     
+    # Handle binary (npz) metadata separately
+    is_npz = load_path.endswith(".npz")
+    if is_npz:
+        return load_npz_metadata(load_path)
+    
     is_gzipped = load_path.endswith("gz")
     return load_jsongz_metadata(load_path) if is_gzipped else load_json_metadata(load_path)
 
+# .....................................................................................................................
+
+def load_npz_metadata(load_path, arrays_as_lists = True, json_double_precision = 3):
+    
+    '''
+    Function which loads a binary (npz) metadata file from a specified loading path
+    Does not check if the pathing is valid
+    
+    Inputs:
+        load_path -> String. Path to file to be loaded. Expects npz files (i.e. ending with .npz)
+        
+        arrays_as_lists -> Boolean. If False, tracking data is returned as numpy arrays instead of lists
+        
+        json_double_precision -> Integer. Number of decimal places to keep on float values, when returning lists.
+                                 Should match the precision used when saving json metadata
+    
+    Outputs:
+        loaded_data (dictionary)
+    '''
+    
+    return _unpack_npz_metadata(load_path, arrays_as_lists, json_double_precision)
+
+# .....................................................................................................................
+
+def _unpack_npz_metadata(npz_file, arrays_as_lists, json_double_precision = 3):
+    
+    ''' Helper function which rebuilds metadata from npz data (either a file path or file-like object) '''
+    
+    # Float arrays are stored with reduced precision, so round values when converting to lists
+    # -> Gives the same values as json-saved data, instead of values like 0.12300000339
+    to_rounded_list = lambda float_array: np.round(np.float64(float_array), json_double_precision).tolist()
+    
+    with np.load(npz_file, allow_pickle = False) as npz_data:
+        
+        # Start with json header data, which holds all non-tracking data
+        loaded_data = ujson.loads(npz_data["header"].tobytes().decode("ascii"))
+        stored_names_set = set(npz_data.files)
+        if "tracking" not in loaded_data:
+            return loaded_data
+        
+        # Add tracking data back into the metadata
+        tracking_dict = loaded_data["tracking"]
+        if "track_status" in stored_names_set:
+            track_status_array = npz_data["track_status"]
+            tracking_dict["track_status"] = track_status_array.tolist() if arrays_as_lists else track_status_array
+        if "xy_center" in stored_names_set:
+            xy_center_array = np.float32(npz_data["xy_center"])
+            tracking_dict["xy_center"] = to_rounded_list(xy_center_array) if arrays_as_lists else xy_center_array
+        if "hull_points" in stored_names_set:
+            hull_points_array = np.float32(npz_data["hull_points"])
+            hull_offsets_array = npz_data["hull_offsets"]
+            hull_arrays_list = [hull_points_array[each_start:each_end]
+                                for each_start, each_end in zip(hull_offsets_array[:-1], hull_offsets_array[1:])]
+            tracking_dict["hull"] = [to_rounded_list(each_hull) for each_hull in hull_arrays_list] \
+                                    if arrays_as_lists else hull_arrays_list
+    
+    return loaded_data
+
 # .....................................................................................................................
 # .....................................................................................................................
 
@@ -50,11 +50,14 @@ find_path_to_local()
 #%% Imports
 
 from local.lib.common.timekeeper_utils import datetime_to_isoformat_string
+from local.lib.common.environment import get_env_object_report_format
 
 from local.lib.file_access_utils.threaded_read_write import Threaded_JPG_and_JSON_Saver
 from local.lib.file_access_utils.threaded_read_write import Nonthreaded_JPG_and_JSON_Saver
 from local.lib.file_access_utils.threaded_read_write import Threaded_Compressed_JSON_Saver
 from local.lib.file_access_utils.threaded_read_write import Nonthreaded_Compressed_JSON_Saver
+from local.lib.file_access_utils.threaded_read_write import Threaded_NPZ_Saver, Nonthreaded_NPZ_Saver
+from local.lib.file_access_utils.threaded_read_write import get_threaded_saver_config, get_saver_stats
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -97,7 +100,8 @@ class Background_Report_Data_Saver:
                 self._data_saver = \
                 Threaded_JPG_and_JSON_Saver(thread_name = "backgrounds-report",
                                             jpg_folder_path = self.image_save_folder_path,
-                                            json_folder_path = self.metadata_save_folder_path)
+                                            json_folder_path = self.metadata_save_folder_path,
+                                            **get_threaded_saver_config())
             else:
                 self._data_saver = \
                 Nonthreaded_JPG_and_JSON_Saver(jpg_folder_path = self.image_save_folder_path,
@@ -127,6 +131,11 @@ class Background_Report_Data_Saver:
         
         return
     
+    # .................................................................................................................
+    
+    def get_stats(self):
+        return get_saver_stats(self._data_saver)
+    
     # .................................................................................................................
     # .................................................................................................................
 
@@ -165,11 +174,26 @@ class Object_Report_Data_Saver:
             # Make sure the save folder exists
             os.makedirs(self.metadata_save_folder_path, exist_ok = True)
             
+            # Check if we should save using a binary format (for tracking data), instead of gzipped json
+            report_format = get_env_object_report_format()
+            use_npz_format = (report_format in {"npz", "npz16"})
+            use_float16 = (report_format == "npz16")
+            
             # Select between different types of saving implementations
-            if self.threading_enabled:
+            if self.threading_enabled and use_npz_format:
+                self._data_saver = \
+                Threaded_NPZ_Saver(thread_name = "objects",
+                                   npz_folder_path = self.metadata_save_folder_path,
+                                   use_float16 = use_float16,
+                                   **get_threaded_saver_config())
+            elif self.threading_enabled:
                 self._data_saver = \
                 Threaded_Compressed_JSON_Saver(thread_name = "objects",
-                                               jsongz_folder_path = self.metadata_save_folder_path)
+                                               jsongz_folder_path = self.metadata_save_folder_path,
+                                               **get_threaded_saver_config())
+            elif use_npz_format:
+                self._data_saver = \
+                Nonthreaded_NPZ_Saver(npz_folder_path = self.metadata_save_folder_path, use_float16 = use_float16)
             else:
                 self._data_saver = \
                 Nonthreaded_Compressed_JSON_Saver(jsongz_folder_path = self.metadata_save_folder_path)
@@ -196,6 +220,11 @@ class Object_Report_Data_Saver:
         
         return
     
+    # .................................................................................................................
+    
+    def get_stats(self):
+        return get_saver_stats(self._data_saver)
+    
     # .................................................................................................................
     # .................................................................................................................
 
@@ -241,7 +270,8 @@ class Snapshot_Report_Data_Saver:
                 self._data_saver = \
                 Threaded_JPG_and_JSON_Saver(thread_name = "snapshots",
                                             jpg_folder_path = self.image_save_folder_path,
-                                            json_folder_path = self.metadata_save_folder_path)
+                                            json_folder_path = self.metadata_save_folder_path,
+                                            **get_threaded_saver_config())
             else:
                 self._data_saver = \
                 Nonthreaded_JPG_and_JSON_Saver(jpg_folder_path = self.image_save_folder_path,
@@ -271,6 +301,11 @@ class Snapshot_Report_Data_Saver:
         
         return
     
+    # .................................................................................................................
+    
+    def get_stats(self):
+        return get_saver_stats(self._data_saver)
+    
     # .................................................................................................................
     # .................................................................................................................
 
@@ -313,7 +348,8 @@ class Station_Report_Data_Saver:
             if self.threading_enabled:
                 self._data_saver = \
                 Threaded_Compressed_JSON_Saver(thread_name = "stations",
-                                               jsongz_folder_path = self.metadata_save_folder_path)
+                                               jsongz_folder_path = self.metadata_save_folder_path,
+                                               **get_threaded_saver_config())
             else:
                 self._data_saver = \
                 Nonthreaded_Compressed_JSON_Saver(jsongz_folder_path = self.metadata_save_folder_path)
@@ -340,6 +376,11 @@ class Station_Report_Data_Saver:
         
         return
     
+    # .................................................................................................................
+    
+    def get_stats(self):
+        return get_saver_stats(self._data_saver)
+    
     # .................................................................................................................
     # .................................................................................................................
 
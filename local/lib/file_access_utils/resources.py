@@ -55,6 +55,7 @@ from shutil import rmtree
 
 from local.lib.file_access_utils.threaded_read_write import Threaded_PNG_Saver
 from local.lib.file_access_utils.threaded_read_write import Nonthreaded_PNG_Saver
+from local.lib.file_access_utils.threaded_read_write import get_threaded_saver_config, get_saver_stats
 
 from local.eolib.utils.files import get_file_list_by_age
 
@@ -94,7 +95,8 @@ class Background_Resources_Data_Saver:
             # Select between different types of saving implementations
             if self.threading_enabled:
                 self._data_saver = Threaded_PNG_Saver(thread_name = "backgrounds-captures",
-                                                      png_folder_path = self.image_save_folder_path)
+                                                      png_folder_path = self.image_save_folder_path,
+                                                      **get_threaded_saver_config())
             else:
                 self._data_saver = Nonthreaded_PNG_Saver(png_folder_path = self.image_save_folder_path)
         
@@ -120,6 +122,11 @@ class Background_Resources_Data_Saver:
         
         return
     
+    # .................................................................................................................
+    
+    def get_stats(self):
+        return get_saver_stats(self._data_saver)
+    
     # .................................................................................................................
     # .................................................................................................................
 
@@ -144,6 +151,32 @@ def build_base_resources_path(location_select_folder_path, camera_select, *path_
 # .....................................................................................................................
 # .....................................................................................................................
 
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% File DB cache functions
+
+# .....................................................................................................................
+
+def build_file_db_cache_path(location_select_folder_path, camera_select):
+    return build_base_resources_path(location_select_folder_path, camera_select, "file_db", "cache.sqlite")
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Preprocessor cache functions
+
+# .....................................................................................................................
+
+def build_preprocessor_cache_path(location_select_folder_path, camera_select, script_name):
+    cache_file_name = "{}.npz".format(os.path.splitext(script_name)[0])
+    return build_base_resources_path(location_select_folder_path, camera_select, "preprocessor_cache", cache_file_name)
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Backgrounds folder functions
 
@@ -49,6 +49,7 @@ find_path_to_local()
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Imports
 
+import json
 import subprocess
 
 from signal import SIGTERM
@@ -57,7 +58,7 @@ from time import sleep
 
 from local.lib.common.timekeeper_utils import get_human_readable_timestamp
 
-from local.lib.file_access_utils.logging import build_state_file_path
+from local.lib.file_access_utils.logging import build_state_file_path, build_metrics_file_path
 from local.lib.file_access_utils.json_read_write import save_config_json, load_config_json
 
 
@@ -174,6 +175,46 @@ def delete_state_file(location_select_folder_path, camera_select):
     
     return
 
+# .....................................................................................................................
+
+def save_metrics_file(location_select_folder_path, camera_select, metrics_dict):
+    
+    '''
+    Function which saves a (compact) performance metrics file, used to report on running processes
+    The file is written to a temporary path and then swapped in place,
+    so that readers (e.g. the control server) never see a partially written file
+    '''
+    
+    # Build pathing to the metrics file, and make sure the folder exists
+    file_save_path = build_metrics_file_path(location_select_folder_path, camera_select)
+    os.makedirs(os.path.dirname(file_save_path), exist_ok = True)
+    
+    # Write the data to a temporary file, then replace any existing metrics file
+    temp_save_path = "{}.tmp".format(file_save_path)
+    with open(temp_save_path, "w") as out_file:
+        json.dump(metrics_dict, out_file, separators = (",", ":"))
+    os.replace(temp_save_path, file_save_path)
+    
+    return file_save_path
+
+# .....................................................................................................................
+
+def load_metrics_file(location_select_folder_path, camera_select):
+    
+    '''
+    Function which tries to load existing performance metrics data for a given camera
+    If no existing metrics data exists, the function returns None
+    '''
+    
+    # Build pathing to the metrics file (if one exists)
+    metrics_file_path = build_metrics_file_path(location_select_folder_path, camera_select)
+    
+    # Try to load the metrics data but skip it if the file is missing
+    loaded_metrics_data = load_config_json(metrics_file_path, error_if_missing = False)
+    no_metrics_data = (loaded_metrics_data is None)
+    
+    return no_metrics_data, loaded_metrics_data
+
 # .....................................................................................................................
 # .....................................................................................................................
 
@@ -52,109 +52,433 @@ find_path_to_local()
 import queue
 import threading
 
-from time import sleep
+from time import perf_counter
+
+from local.lib.common.environment import get_env_deferred_encoding, get_env_saver_num_workers
+from local.lib.common.environment import get_env_saver_backpressure_policy, get_env_saver_sync_batches
 
 from local.lib.file_access_utils.metadata_read_write import encode_json_data, write_encoded_json
 from local.lib.file_access_utils.metadata_read_write import encode_jsongz_data, write_encoded_jsongz
+from local.lib.file_access_utils.metadata_read_write import encode_npz_data, write_encoded_npz
 from local.lib.file_access_utils.image_read_write import encode_jpg_data, encode_png_data
 from local.lib.file_access_utils.image_read_write import write_encoded_jpg, write_encoded_png
 
 
 # ---------------------------------------------------------------------------------------------------------------------
-#%% Background Resource savers
+#%% Saver engine
 
-class Threaded_PNG_Saver:
+
+class Threaded_Saver_Engine:
+    
+    '''
+    Class which manages a pool of worker threads used to handle (encoding &) writing of data to disk.
+    Workers block while waiting on data, and are shut down using a sentinel value placed in the queue,
+    so all data queued before closing is guaranteed to be saved.
+    Data is processed in batches (whatever is available in the queue, up to a max batch size),
+    with an optional disk sync (fsync of the files written in the batch) after each batch.
+    
+    If an encoding function is provided, it will be called (on the worker thread) on the queued data,
+    and the results are passed to the write function. Otherwise the queued data is passed directly
+    to the write function (i.e. the data is assumed to already be encoded).
+    The write function must return the number of bytes written (used for throughput reporting),
+    along with a list of the file paths that were written (used for syncing).
+    
+    Supports back-pressure policies for handling a full queue:
+        "block"       -> Caller waits until there is room in the queue (no data loss)
+        "drop_oldest" -> The oldest queued data is discarded to make room for new data
+        "drop_newest" -> The new data is discarded
+    '''
+    
+    valid_backpressure_policies = ("block", "drop_oldest", "drop_newest")
     
     # .................................................................................................................
     
-    def __init__(self, *, thread_name, png_folder_path):
+    def __init__(self, *, thread_name, write_function, encode_function = None,
+                 num_workers = 1, max_queue_size = 250, backpressure_policy = "block",
+                 max_batch_size = 16, sync_on_batch = False):
+        
+        # Catch bad back-pressure settings early
+        if backpressure_policy not in self.valid_backpressure_policies:
+            raise ValueError("Unrecognized back-pressure policy ({}). Must be one of: {}"
+                             .format(backpressure_policy, ", ".join(self.valid_backpressure_policies)))
         
         # Store inputs
         self.thread_name = thread_name
-        self.png_folder_path = png_folder_path
+        self.num_workers = max(1, int(num_workers))
+        self.backpressure_policy = backpressure_policy
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.sync_on_batch = sync_on_batch
+        self._encode_function = encode_function
+        self._write_function = write_function
         
         # For clarity
-        max_queue_size = 250
         auto_kill_when_main_thread_closes = True
         
         # Set up threading resources
         self._data_queue = queue.Queue(max_queue_size)
-        self._run_thread_event = threading.Event()
-        thread_args = (png_folder_path, self._data_queue, self._run_thread_event)
+        self._stats_lock = threading.Lock()
+        self._shutdown_signal = object()
+        self._is_closed = False
+        
+        # Allocate storage for reporting stats
+        self._start_time_sec = perf_counter()
+        self._max_queue_depth = 0
+        self._num_saved = 0
+        self._num_bytes_saved = 0
+        self._num_batches = 0
+        self._num_dropped = 0
+        self._num_errors = 0
+        self._num_encoded = 0
+        self._total_encode_time_sec = 0.0
+        self._max_encode_time_sec = 0.0
+        self._total_write_time_sec = 0.0
+        
+        # Start all worker threads
+        self._thread_ref_list = []
+        for k in range(self.num_workers):
+            worker_name = thread_name if self.num_workers == 1 else "{}-{}".format(thread_name, k)
+            new_thread_ref = threading.Thread(name = worker_name,
+                                              target = self._wait_for_data_to_save,
+                                              daemon = auto_kill_when_main_thread_closes)
+            new_thread_ref.start()
+            self._thread_ref_list.append(new_thread_ref)
+    
+    # .................................................................................................................
+    
+    def submit(self, *data_args):
+        
+        '''
+        Function used to pass data to the worker threads for saving.
+        Note: The data is not copied! The caller should not modify the data after submitting it
+        '''
         
-        # Start saving thread
-        self._thread_ref = threading.Thread(name = thread_name,
-                                            target = self._wait_for_data_to_save,
-                                            args = thread_args,
-                                            daemon = auto_kill_when_main_thread_closes)
+        # Handle queuing based on the back-pressure policy
+        if self.backpressure_policy == "block":
+            self._data_queue.put(data_args, block = True, timeout = None)
+        
+        elif self.backpressure_policy == "drop_newest":
+            try:
+                self._data_queue.put_nowait(data_args)
+            except queue.Full:
+                self._record_drop()
+        
+        elif self.backpressure_policy == "drop_oldest":
+            while True:
+                try:
+                    self._data_queue.put_nowait(data_args)
+                    break
+                except queue.Full:
+                    self._discard_oldest()
+        
+        # Keep track of the deepest the queue has been, for reporting
+        queue_depth = self._data_queue.qsize()
+        with self._stats_lock:
+            self._max_queue_depth = max(self._max_queue_depth, queue_depth)
         
-        # Start the thread
-        self._run_thread_event.set()
-        self._thread_ref.start()
+        return
     
     # .................................................................................................................
     
-    def save_data(self, file_save_name_no_ext, image_data, png_compression_0_to_9 = 0):
+    def record_encode_time(self, encode_time_sec):
         
-        '''
-        Function which handles 'saving' of data (at least from the callers perspective)
-        Actually bundles data and passes it to the savng thread to handle actual file i/o
-        '''
+        ''' Function used to record encoding time when data is encoded before being submitted (for reporting) '''
         
-        # Encode data for saving
-        encoded_png_data = encode_png_data(image_data, png_compression_0_to_9)
+        with self._stats_lock:
+            self._num_encoded += 1
+            self._total_encode_time_sec += encode_time_sec
+            self._max_encode_time_sec = max(self._max_encode_time_sec, encode_time_sec)
+        
+        return
+    
+    # .................................................................................................................
+    
+    def flush(self):
+        
+        ''' Function which blocks until all currently queued data has been saved '''
+        
+        self._data_queue.join()
+    
+    # .................................................................................................................
+    
+    def close(self):
+        
+        ''' Function which waits for all queued data to be saved before shutting down the worker threads '''
         
-        # Bundle everything needed for saving
-        bundled_data = (file_save_name_no_ext, encoded_png_data)
+        # Don't try to close more than once, since shutdown signals would never be consumed
+        if self._is_closed:
+            return
+        self._is_closed = True
         
-        # Now place bundled data in the queue for the thread to deal with
-        # Note: we aren't actually saving (depsite the function name), we're just passing data to the thread to save!
-        self._data_queue.put(bundled_data, block = True, timeout = None)
+        # Send one shutdown signal per worker. Queued data ahead of these signals is still saved
+        for _ in self._thread_ref_list:
+            self._data_queue.put(self._shutdown_signal, block = True, timeout = None)
+        
+        # Now wait for all workers to finish saving data
+        for each_thread_ref in self._thread_ref_list:
+            each_thread_ref.join()
         
         return
     
     # .................................................................................................................
     
-    def _wait_for_data_to_save(self, image_save_folder_path, data_queue_ref, run_thread_event_ref):
+    def get_stats(self):
+        
+        ''' Function which returns a dictionary of queue/timing/throughput info, intended for reporting '''
         
-        # Loop until something stops us
-        while True:
+        with self._stats_lock:
             
-            # Save all data from the queue when it's available
-            while not data_queue_ref.empty():
+            # For convenience
+            num_saved = self._num_saved
+            num_encoded = self._num_encoded
+            elapsed_time_sec = max(1E-6, perf_counter() - self._start_time_sec)
+            
+            stats_dict = {"queue_depth": self._data_queue.qsize(),
+                          "max_queue_depth": self._max_queue_depth,
+                          "num_saved": num_saved,
+                          "num_bytes_saved": self._num_bytes_saved,
+                          "num_batches": self._num_batches,
+                          "num_dropped": self._num_dropped,
+                          "num_errors": self._num_errors,
+                          "saves_per_sec": num_saved / elapsed_time_sec,
+                          "bytes_per_sec": self._num_bytes_saved / elapsed_time_sec,
+                          "avg_encode_ms": (1000.0 * self._total_encode_time_sec / max(1, num_encoded)),
+                          "max_encode_ms": 1000.0 * self._max_encode_time_sec,
+                          "avg_write_ms": (1000.0 * self._total_write_time_sec / max(1, num_saved))}
+        
+        return stats_dict
+    
+    # .................................................................................................................
+    
+    def _wait_for_data_to_save(self):
+        
+        # Loop until we get the shutdown signal
+        got_shutdown_signal = False
+        while not got_shutdown_signal:
+            
+            # Wait for data to arrive, then grab anything else that is already available, to save as a batch
+            # -> Stop grabbing data at a shutdown signal, since any remaining signals belong to other workers
+            batch_list = [self._data_queue.get(block = True, timeout = None)]
+            while len(batch_list) < self.max_batch_size and (batch_list[-1] is not self._shutdown_signal):
+                try:
+                    batch_list.append(self._data_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # Save all the batch data, up to the shutdown signal (if present)
+            num_saved_in_batch = 0
+            saved_paths_list = []
+            for each_queue_data in batch_list:
                 
-                # Get data from queue
-                file_save_name_no_ext, encoded_png_data = data_queue_ref.get()
+                # Stop saving once we hit the shutdown signal
+                if each_queue_data is self._shutdown_signal:
+                    got_shutdown_signal = True
+                    self._data_queue.task_done()
+                    break
                 
-                # Save image data
-                write_encoded_png(image_save_folder_path, file_save_name_no_ext, encoded_png_data)
+                each_saved_paths_list = self._save_one(each_queue_data)
+                if each_saved_paths_list is not None:
+                    num_saved_in_batch += 1
+                    saved_paths_list += each_saved_paths_list
+                self._data_queue.task_done()
             
-            # Check if we need to stop
-            got_shutdown_signal = (not run_thread_event_ref.is_set())
-            if got_shutdown_signal and data_queue_ref.empty():
-                break
+            # Sync the files written in this batch to disk, if needed
+            if self.sync_on_batch and num_saved_in_batch > 0:
+                try:
+                    fsync_file_paths(saved_paths_list)
+                except OSError as err:
+                    print("", "Error syncing saved data! ({})".format(self.thread_name), str(err), sep = "\n")
+            
+            # Record batch info
+            with self._stats_lock:
+                self._num_batches += 1 if num_saved_in_batch > 0 else 0
+        
+        return
+    
+    # .................................................................................................................
+    
+    def _save_one(self, queue_data):
+        
+        ''' Helper function which (encodes &) writes one queue entry. Returns saved file paths (None on errors) '''
+        
+        # Encode & write data (with timing). Errors are reported but don't stop the worker from saving
+        try:
+            t1 = perf_counter()
+            encoded_data_tuple = queue_data
+            need_encoding = (self._encode_function is not None)
+            if need_encoding:
+                encoded_data_tuple = self._encode_function(*queue_data)
+            t2 = perf_counter()
+            num_bytes_written, saved_paths_list = self._write_function(*encoded_data_tuple)
+            t3 = perf_counter()
             
-            # Wait a bit so we aren't completely hammering this thread
-            sleep(0.5)
+        except Exception as err:
+            print("", "Error saving data! ({})".format(self.thread_name), str(err), sep = "\n")
+            with self._stats_lock:
+                self._num_errors += 1
+            return None
+        
+        # Record timing for reporting
+        if need_encoding:
+            self.record_encode_time(t2 - t1)
+        with self._stats_lock:
+            self._num_saved += 1
+            self._num_bytes_saved += num_bytes_written
+            self._total_write_time_sec += (t3 - t2)
+        
+        return saved_paths_list
+    
+    # .................................................................................................................
+    
+    def _discard_oldest(self):
+        
+        ''' Helper function used to make room in the queue by throwing away the oldest data '''
+        
+        try:
+            self._data_queue.get_nowait()
+            self._data_queue.task_done()
+            self._record_drop()
+        except queue.Empty:
+            pass
         
         return
     
     # .................................................................................................................
     
+    def _record_drop(self):
+        with self._stats_lock:
+            self._num_dropped += 1
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
+
+# =====================================================================================================================
+# =====================================================================================================================
+
+
+class Threaded_Saver_Base:
+    
+    '''
+    Shared implementation for all threaded savers. Subclasses only need to provide a save_data(...) function
+    (which should call _queue_data(...)), along with the data-specific _encode_data(...) & _write_data(...) functions
+    
+    When deferred encoding is enabled, raw data is queued and encoding happens on the worker threads.
+    Otherwise, data is encoded on the calling thread and only the file writing is handled by the workers
+    '''
+    
+    # .................................................................................................................
+    
+    def __init__(self, thread_name, *, deferred_encoding = False, num_workers = 1, max_queue_size = 250,
+                 backpressure_policy = "block", max_batch_size = 16, sync_on_batch = False):
+        
+        # Store inputs
+        self.thread_name = thread_name
+        self.deferred_encoding = deferred_encoding
+        
+        # Set up the engine which handles all threading
+        engine_encode_function = self._encode_data if deferred_encoding else None
+        self._engine = Threaded_Saver_Engine(thread_name = thread_name,
+                                             write_function = self._write_data,
+                                             encode_function = engine_encode_function,
+                                             num_workers = num_workers,
+                                             max_queue_size = max_queue_size,
+                                             backpressure_policy = backpressure_policy,
+                                             max_batch_size = max_batch_size,
+                                             sync_on_batch = sync_on_batch)
+    
+    # .................................................................................................................
+    
+    def flush(self):
+        self._engine.flush()
+    
+    # .................................................................................................................
+    
     def close(self):
         
-        # Clear event to trigger thread to close
-        self._run_thread_event.clear()
+        # Wait for all queued data to be saved, then shut down the worker threads
+        self._engine.close()
+        
+        return
+    
+    # .................................................................................................................
+    
+    def get_stats(self):
+        return self._engine.get_stats()
+    
+    # .................................................................................................................
+    
+    def _queue_data(self, *raw_data_args):
+        
+        '''
+        Function which handles 'saving' of data (at least from the callers perspective)
+        Actually bundles data and passes it to the saving thread(s) to handle actual file i/o
+        '''
+        
+        # Pass raw data to the workers, if they're handling the encoding
+        if self.deferred_encoding:
+            self._engine.submit(*raw_data_args)
+            return
         
-        # Now wait for thread to close (may take a moment if still saving data)
-        self._thread_ref.join(10.0)
+        # Encode data for saving (with timing, for reporting)
+        t1 = perf_counter()
+        encoded_data_tuple = self._encode_data(*raw_data_args)
+        t2 = perf_counter()
+        self._engine.record_encode_time(t2 - t1)
+        
+        # Now place encoded data in the queue for the workers to deal with
+        # Note: we aren't actually saving (despite the function name), we're just passing data to the thread to save!
+        self._engine.submit(*encoded_data_tuple)
         
         return
     
+    # .................................................................................................................
+    
+    def _encode_data(self, *raw_data_args):
+        raise NotImplementedError("Must implement _encode_data(...) function! ({})".format(self.thread_name))
+    
+    # .................................................................................................................
+    
+    def _write_data(self, *encoded_data_args):
+        raise NotImplementedError("Must implement _write_data(...) function! ({})".format(self.thread_name))
+    
     # .................................................................................................................
     # .................................................................................................................
 
 
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Background Resource savers
+
+class Threaded_PNG_Saver(Threaded_Saver_Base):
+    
+    # .................................................................................................................
+    
+    def __init__(self, *, thread_name, png_folder_path, **saver_kwargs):
+        
+        # Store inputs
+        self.png_folder_path = png_folder_path
+        
+        # Inherit from parent
+        super().__init__(thread_name, **saver_kwargs)
+    
+    # .................................................................................................................
+    
+    def save_data(self, file_save_name_no_ext, image_data, png_compression_0_to_9 = 0):
+        self._queue_data(file_save_name_no_ext, image_data, png_compression_0_to_9)
+    
+    # .................................................................................................................
+    
+    def _encode_data(self, file_save_name_no_ext, image_data, png_compression_0_to_9):
+        return file_save_name_no_ext, encode_png_data(image_data, png_compression_0_to_9)
+    
+    # .................................................................................................................
+    
+    def _write_data(self, file_save_name_no_ext, encoded_png_data):
+        save_path = write_encoded_png(self.png_folder_path, file_save_name_no_ext, encoded_png_data)
+        return len(encoded_png_data), [save_path]
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
 
 class Nonthreaded_PNG_Saver:
     
@@ -191,117 +515,121 @@ class Nonthreaded_PNG_Saver:
 #%% Object Report data Savers
 
 
-class Threaded_Compressed_JSON_Saver:
+class Threaded_Compressed_JSON_Saver(Threaded_Saver_Base):
     
     # .................................................................................................................
     
-    def __init__(self, *, thread_name, jsongz_folder_path):
+    def __init__(self, *, thread_name, jsongz_folder_path, **saver_kwargs):
         
         # Store inputs
-        self.thread_name = thread_name
         self.jsongz_folder_path = jsongz_folder_path
         
-        # For clarity
-        max_queue_size = 250
-        auto_kill_when_main_thread_closes = True
-        
-        # Set up threading resources
-        self._data_queue = queue.Queue(max_queue_size)
-        self._run_thread_event = threading.Event()
-        thread_args = (jsongz_folder_path, self._data_queue, self._run_thread_event)
-        
-        # Start saving thread
-        self._thread_ref = threading.Thread(name = thread_name,
-                                            target = self._wait_for_data_to_save,
-                                            args = thread_args,
-                                            daemon = auto_kill_when_main_thread_closes)
-        
-        # Start the thread
-        self._run_thread_event.set()
-        self._thread_ref.start()
+        # Inherit from parent
+        super().__init__(thread_name, **saver_kwargs)
     
     # .................................................................................................................
     
     def save_data(self, file_save_name_no_ext, metadata_dict, json_double_precision = 3):
+        self._queue_data(file_save_name_no_ext, metadata_dict, json_double_precision)
+    
+    # .................................................................................................................
+    
+    def _encode_data(self, file_save_name_no_ext, metadata_dict, json_double_precision):
+        return file_save_name_no_ext, encode_jsongz_data(metadata_dict, json_double_precision)
+    
+    # .................................................................................................................
+    
+    def _write_data(self, file_save_name_no_ext, encoded_jsongz_data):
+        save_path = write_encoded_jsongz(self.jsongz_folder_path, file_save_name_no_ext, encoded_jsongz_data)
+        return len(encoded_jsongz_data), [save_path]
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
+
+class Nonthreaded_Compressed_JSON_Saver:
+    
+    # .................................................................................................................
+    
+    def __init__(self, *, jsongz_folder_path):
         
-        '''
-        Function which handles 'saving' of data (at least from the callers perspective)
-        Actually bundles data and passes it to the savng thread to handle actual file i/o
-        '''
+        # Store inputs
+        self.jsongz_folder_path = jsongz_folder_path
+    
+    # .................................................................................................................
+    
+    def save_data(self, file_save_name_no_ext, metadata_dict, json_double_precision = 3):
         
         # Encode data for saving
-        encoded_json_data = encode_jsongz_data(metadata_dict, json_double_precision)
-        
-        # Bundle everything needed for saving
-        bundled_data = (file_save_name_no_ext, encoded_json_data)
+        encoded_jsongz_data = encode_jsongz_data(metadata_dict, json_double_precision)
         
-        # Now place bundled data in the queue for the thread to deal with
-        # Note: we aren't actually saving (depsite the function name), we're just passing data to the thread to save!
-        self._data_queue.put(bundled_data, block = True, timeout = None)
+        # Save metadata with compression
+        write_encoded_jsongz(self.jsongz_folder_path, file_save_name_no_ext, encoded_jsongz_data)
         
         return
     
     # .................................................................................................................
     
-    def _wait_for_data_to_save(self, metadata_save_folder_path, data_queue_ref, run_thread_event_ref):
-        
-        # Loop until something stops us
-        while True:
-            
-            # Save all data from the queue when it's available
-            while not data_queue_ref.empty():
-                
-                # Get data from queue
-                file_save_name_no_ext, encoded_jsongz_data = data_queue_ref.get()
-                
-                # Save metadata with compression
-                write_encoded_jsongz(metadata_save_folder_path, file_save_name_no_ext, encoded_jsongz_data)
-            
-            # Check if we need to stop
-            got_shutdown_signal = (not run_thread_event_ref.is_set())
-            if got_shutdown_signal and data_queue_ref.empty():
-                break
-            
-            # Wait a bit so we aren't completely hammering this thread
-            sleep(0.5)     
+    def close(self):
         
         return
     
     # .................................................................................................................
+    # .................................................................................................................
+
+
+class Threaded_NPZ_Saver(Threaded_Saver_Base):
     
-    def close(self):
-        
-        # Clear event to trigger thread to close
-        self._run_thread_event.clear()
+    # .................................................................................................................
+    
+    def __init__(self, *, thread_name, npz_folder_path, use_float16 = False, **saver_kwargs):
         
-        # Now wait for thread to close (may take a moment if still saving data)
-        self._thread_ref.join(10.0)
+        # Store inputs
+        self.npz_folder_path = npz_folder_path
+        self.use_float16 = use_float16
         
-        return
+        # Inherit from parent
+        super().__init__(thread_name, **saver_kwargs)
+    
+    # .................................................................................................................
+    
+    def save_data(self, file_save_name_no_ext, metadata_dict, json_double_precision = 3):
+        self._queue_data(file_save_name_no_ext, metadata_dict, json_double_precision)
+    
+    # .................................................................................................................
+    
+    def _encode_data(self, file_save_name_no_ext, metadata_dict, json_double_precision):
+        return file_save_name_no_ext, encode_npz_data(metadata_dict, json_double_precision, self.use_float16)
+    
+    # .................................................................................................................
+    
+    def _write_data(self, file_save_name_no_ext, encoded_npz_data):
+        save_path = write_encoded_npz(self.npz_folder_path, file_save_name_no_ext, encoded_npz_data)
+        return len(encoded_npz_data), [save_path]
     
     # .................................................................................................................
     # .................................................................................................................
 
 
-
-class Nonthreaded_Compressed_JSON_Saver:
+class Nonthreaded_NPZ_Saver:
     
     # .................................................................................................................
     
-    def __init__(self, *, jsongz_folder_path):
+    def __init__(self, *, npz_folder_path, use_float16 = False):
         
         # Store inputs
-        self.jsongz_folder_path = jsongz_folder_path
+        self.npz_folder_path = npz_folder_path
+        self.use_float16 = use_float16
     
     # .................................................................................................................
     
     def save_data(self, file_save_name_no_ext, metadata_dict, json_double_precision = 3):
         
         # Encode data for saving
-        encoded_jsongz_data = encode_jsongz_data(metadata_dict, json_double_precision)
+        encoded_npz_data = encode_npz_data(metadata_dict, json_double_precision, self.use_float16)
         
-        # Save metadata with compression
-        write_encoded_jsongz(self.jsongz_folder_path, file_save_name_no_ext, encoded_jsongz_data)
+        # Save metadata in binary format
+        write_encoded_npz(self.npz_folder_path, file_save_name_no_ext, encoded_npz_data)
         
         return
     
@@ -318,98 +646,43 @@ class Nonthreaded_Compressed_JSON_Saver:
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Background/Snapshot Report Data Savers
 
-class Threaded_JPG_and_JSON_Saver:
+class Threaded_JPG_and_JSON_Saver(Threaded_Saver_Base):
     
     # .................................................................................................................
     
-    def __init__(self, *, thread_name, jpg_folder_path, json_folder_path):
+    def __init__(self, *, thread_name, jpg_folder_path, json_folder_path, **saver_kwargs):
         
         # Store inputs
-        self.thread_name = thread_name
         self.jpg_folder_path = jpg_folder_path
         self.json_folder_path = json_folder_path
         
-        # For clarity
-        max_queue_size = 250
-        auto_kill_when_main_thread_closes = True
-        
-        # Set up threading resources
-        self._data_queue = queue.Queue(max_queue_size)
-        self._run_thread_event = threading.Event()
-        thread_args = (jpg_folder_path, json_folder_path, self._data_queue, self._run_thread_event)
-        
-        # Start saving thread
-        self._thread_ref = threading.Thread(name = thread_name,
-                                            target = self._wait_for_data_to_save,
-                                            args = thread_args,
-                                            daemon = auto_kill_when_main_thread_closes)
-        
-        # Start the thread
-        self._run_thread_event.set()
-        self._thread_ref.start()
+        # Inherit from parent
+        super().__init__(thread_name, **saver_kwargs)
     
     # .................................................................................................................
     
     def save_data(self, file_save_name_no_ext, image_data, metadata_dict,
                   jpg_quality_0_to_100 = 25, json_double_precision = 3):
-        
-        '''
-        Function which handles 'saving' of data (at least from the callers perspective)
-        Actually bundles data and passes it to the saving thread to handle actual file i/o
-        '''
-        
-        # Encode data for saving
-        encoded_jpg_data = encode_jpg_data(image_data, jpg_quality_0_to_100)
-        encoded_json_data = encode_json_data(metadata_dict, json_double_precision)
-        
-        # Bundle everything needed for saving
-        bundled_data = (file_save_name_no_ext, encoded_jpg_data, encoded_json_data)
-        
-        # Now place bundled data in the queue for the thread to deal with
-        # Note: we aren't actually saving (despite the function name), we're just passing data to the thread to save!
-        self._data_queue.put(bundled_data, block = True, timeout = None)
-        
-        return
+        self._queue_data(file_save_name_no_ext, image_data, metadata_dict, jpg_quality_0_to_100, json_double_precision)
     
     # .................................................................................................................
     
-    def _wait_for_data_to_save(self, image_save_folder_path, metadata_save_folder_path,
-                               data_queue_ref, run_thread_event_ref):
+    def _encode_data(self, file_save_name_no_ext, image_data, metadata_dict,
+                     jpg_quality_0_to_100, json_double_precision):
         
-        # Loop until something stops us
-        while True:
-            
-            # Save all data from the queue when it's available
-            while not data_queue_ref.empty():
-                
-                # Get data from queue
-                file_save_name_no_ext, encoded_jpg_data, encoded_json_data = data_queue_ref.get()
-                
-                # Save image data
-                write_encoded_jpg(image_save_folder_path, file_save_name_no_ext, encoded_jpg_data)
-                write_encoded_json(metadata_save_folder_path, file_save_name_no_ext, encoded_json_data)
-            
-            # Check if we need to stop
-            got_shutdown_signal = (not run_thread_event_ref.is_set())
-            if got_shutdown_signal and data_queue_ref.empty():
-                break
-            
-            # Wait a bit so we aren't completely hammering this thread
-            sleep(0.5)
+        encoded_jpg_data = encode_jpg_data(image_data, jpg_quality_0_to_100)
+        encoded_json_data = encode_json_data(metadata_dict, json_double_precision)
         
-        return
+        return file_save_name_no_ext, encoded_jpg_data, encoded_json_data
     
     # .................................................................................................................
     
-    def close(self):
-        
-        # Clear event to trigger thread to close
-        self._run_thread_event.clear()
+    def _write_data(self, file_save_name_no_ext, encoded_jpg_data, encoded_json_data):
         
-        # Now wait for thread to close (may take a moment if still saving data)
-        self._thread_ref.join(10.0)
+        jpg_save_path = write_encoded_jpg(self.jpg_folder_path, file_save_name_no_ext, encoded_jpg_data)
+        json_save_path = write_encoded_json(self.json_folder_path, file_save_name_no_ext, encoded_json_data)
         
-        return
+        return len(encoded_jpg_data) + len(encoded_json_data), [jpg_save_path, json_save_path]
     
     # .................................................................................................................
     # .................................................................................................................
@@ -459,6 +732,68 @@ class Nonthreaded_JPG_and_JSON_Saver:
 
 # .....................................................................................................................
 
+def get_threaded_saver_config():
+    
+    '''
+    Helper function used to look up (environment-based) settings for threaded savers
+    
+    Outputs:
+        threaded_saver_kwargs (dictionary)
+    '''
+    
+    threaded_saver_kwargs = {"deferred_encoding": get_env_deferred_encoding(),
+                             "num_workers": get_env_saver_num_workers(),
+                             "backpressure_policy": get_env_saver_backpressure_policy(),
+                             "sync_on_batch": get_env_saver_sync_batches()}
+    
+    return threaded_saver_kwargs
+
+# .....................................................................................................................
+
+def fsync_file_paths(file_paths_list):
+    
+    '''
+    Helper function used to force the given files (and the folders containing them) to be written to disk
+    Unlike a full os.sync(), this only flushes the listed files, not every filesystem on the machine
+    '''
+    
+    # Sync each of the files
+    for each_path in file_paths_list:
+        file_descriptor = os.open(each_path, os.O_RDONLY)
+        try:
+            os.fsync(file_descriptor)
+        finally:
+            os.close(file_descriptor)
+    
+    # Sync the containing folders, so that newly created file entries are also on disk
+    # -> Not supported on all platforms (e.g. windows can't open folders), so skip on errors
+    for each_folder_path in set(os.path.dirname(each_path) for each_path in file_paths_list):
+        try:
+            folder_descriptor = os.open(each_folder_path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(folder_descriptor)
+        except OSError:
+            pass
+        finally:
+            os.close(folder_descriptor)
+    
+    return
+
+# .....................................................................................................................
+
+def get_saver_stats(data_saver):
+    
+    '''
+    Helper function used to get queue/timing info from a data saver
+    Only threaded savers provide stats, for all other savers this function returns None
+    '''
+    
+    get_stats_func = getattr(data_saver, "get_stats", None)
+    
+    return get_stats_func() if get_stats_func is not None else None
+
 # .....................................................................................................................
 # .....................................................................................................................
 
@@ -473,7 +808,5 @@ if __name__ == "__main__":
 #%% Scrap
 
 # TODO
-# - unify threaded savers into a single class!
 # - unify non-threaded savers as well
 # - maybe unify both into a single class?
-
@@ -153,6 +153,11 @@ def build_videos_folder_path(location_select_folder_path, camera_select, *path_j
 def build_video_files_dict_path(location_select_folder_path, camera_select):
     return build_videos_folder_path(location_select_folder_path, camera_select, "video_files_record.json")
 
+# .....................................................................................................................
+
+def build_capture_options_path(location_select_folder_path, camera_select):
+    return build_resources_folder_path(location_select_folder_path, camera_select, "capture_options.json")
+
 # .....................................................................................................................
 # .....................................................................................................................
 
@@ -543,6 +548,70 @@ def video_info_from_name(location_select_folder_path, camera_select, video_selec
 # .....................................................................................................................
 
 
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Capture options functions
+
+# .....................................................................................................................
+
+def create_default_capture_options():
+    
+    '''
+    Helper function used to enforce a 'standard' set of video capture (decoding) options
+    
+    Options:
+        backend -> (String) One of "any", "ffmpeg" or "gstreamer". Picks the (opencv) capture backend
+        
+        decode_threads -> (Integer) Number of threads used for decoding. Zero uses the backend default
+        
+        buffer_size -> (Integer) Number of frames buffered by the capture. Zero uses the backend default
+        
+        hardware_acceleration -> (Boolean) If true, hardware decoding will be used if available
+        
+        decode_wh -> (List or None) Width & height to decode frames at, or None to use the native size.
+                     Only supported by the gstreamer backend! Note that changing this will
+                     invalidate existing background images
+    
+    Note that options not supported by the installed opencv version/backend are ignored
+    '''
+    
+    return {"backend": "any",
+            "decode_threads": 0,
+            "buffer_size": 0,
+            "hardware_acceleration": False,
+            "decode_wh": None}
+
+# .....................................................................................................................
+
+def load_capture_options(location_select_folder_path, camera_select):
+    
+    ''' Function used to load per-camera video capture options. Missing entries are filled with defaults '''
+    
+    # Load the capture options file (or create it if missing)
+    load_path = build_capture_options_path(location_select_folder_path, camera_select)
+    default_content = create_default_capture_options()
+    loaded_options_dict = load_or_create_config_json(load_path, default_content,
+                                                     creation_printout = "Creating capture options file:")
+    
+    # Make sure we always return every option, in case the file was created by an older version
+    capture_options_dict = create_default_capture_options()
+    capture_options_dict.update(loaded_options_dict)
+    
+    return capture_options_dict
+
+# .....................................................................................................................
+
+def save_capture_options(location_select_folder_path, camera_select, capture_options_dict):
+    
+    ''' Function used to save per-camera video capture options '''
+    
+    save_path = build_capture_options_path(location_select_folder_path, camera_select)
+    
+    return update_config_json(save_path, capture_options_dict)
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Playback Functions
 
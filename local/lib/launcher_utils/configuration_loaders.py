@@ -54,12 +54,14 @@ from time import sleep
 from local.lib.common.timekeeper_utils import get_human_readable_timestamp
 from local.lib.common.timekeeper_utils import get_local_datetime, datetime_to_isoformat_string, datetime_to_epoch_ms
 from local.lib.common.exceptions import OS_Close, register_signal_quit
+from local.lib.common.environment import get_env_rtsp_adaptive_frame_skip, get_env_rtsp_target_analysis_fps
 
 from local.lib.ui_utils.cli_selections import Resource_Selector
 from local.lib.ui_utils.script_arguments import script_arg_builder, get_selections_from_script_args
 from local.lib.ui_utils.screen_info import Screen_Info
 
 from local.lib.launcher_utils.video_setup import File_Video_Reader, Threaded_File_Video_Reader, RTSP_Video_Reader
+from local.lib.launcher_utils.video_setup import Threaded_RTSP_Video_Reader
 from local.lib.launcher_utils.core_bundle_loader import Core_Bundle
 from local.lib.launcher_utils.station_bundle_loader import Station_Bundle
 from local.lib.launcher_utils.resource_initialization import initialize_background_and_framerate_from_file
@@ -620,9 +622,7 @@ class RTSP_Configuration_Loader(File_Configuration_Loader):
     def setup_video_reader(self):
         
         # Select video reader
-        Video_Reader = RTSP_Video_Reader
-        if self.threaded_video_enabled:
-            print("", "Threaded video capture is not yet implemented for RTSP!", sep = "\n")
+        Video_Reader = Threaded_RTSP_Video_Reader if self.threaded_video_enabled else RTSP_Video_Reader
 
         # Set up the video source
         self.vreader = Video_Reader(self.location_select_folder_path, self.camera_select)
@@ -645,6 +645,11 @@ class RTSP_Configuration_Loader(File_Configuration_Loader):
         # Store framerate estimate, which can report with camera info
         self.estimated_video_fps = framerate_estimate
         
+        # Update frame skipping to use the estimated framerate, since reported rtsp framerates are unreliable
+        self.vreader.set_frame_skipping(get_env_rtsp_adaptive_frame_skip(),
+                                        get_env_rtsp_target_analysis_fps(),
+                                        source_fps = framerate_estimate)
+        
         return
     
     # .................................................................................................................
@@ -49,14 +49,21 @@ find_path_to_local()
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Imports
 
+import numpy as np
+
 from time import perf_counter
 from collections import OrderedDict
 
+from local.lib.common.environment import get_env_core_readonly_check
+from local.lib.common.environment import get_env_zone_raster_size, get_env_zone_raster_exact_boundary
+
 from local.lib.file_access_utils.configurables import dynamic_import_core, create_blank_configurable_data_dict
 from local.lib.file_access_utils.configurables import unpack_config_data, unpack_access_info, check_matching_access_info
 from local.lib.file_access_utils.json_read_write import load_config_json
 from local.lib.file_access_utils.core import build_core_folder_path, get_ordered_config_paths
 
+from local.eolib.math.geometry import Zone_Label_Raster
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define classes
@@ -80,6 +87,12 @@ class Core_Bundle:
         self.final_stage_config_dict = None
         self.core_ref_dict = None
         self.input_wh_list = None 
+        
+        # Debugging option, used to lock frame data passed between stages so in-place modifications raise errors
+        self._readonly_check = get_env_core_readonly_check()
+        
+        # Set up shared zone rasterization settings (used by stages for fast zone membership checks)
+        Zone_Label_Raster.set_default_settings(get_env_zone_raster_size(), get_env_zone_raster_exact_boundary())
     
     # .................................................................................................................
         
@@ -253,6 +266,13 @@ class Core_Bundle:
         '''
         Function for running the full core processing sequence,
         Takes input from the initial video/background capture stages
+        
+        Note that the stage outputs are shared (without copying) between stages and with any
+        code reading the stage outputs afterwards (e.g. stations, drawing for configuration).
+        Stages must therefore treat their inputs as read-only, and return new arrays if
+        any modifications are needed. This can be checked by setting the CORE_READONLY_CHECK
+        environment variable, which locks all frame data so that in-place modifications raise errors
+        
         Outputs:
             stage_outputs (OrderedDict), stage_timing (OrderedDict)
         '''
@@ -261,7 +281,9 @@ class Core_Bundle:
         process_outputs = {"video_frame": input_frame,"bg_frame": background_image,"bg_update": background_was_updated}
         stage_outputs = OrderedDict({"video_capture_input": process_outputs})
         stage_timing = OrderedDict({"video_capture_input": read_time_sec})
-
+        if self._readonly_check:
+            lock_frame_data(process_outputs)
+        
         # Loop through every run function passing outputs from each stage to inputs of the next stage
         try:
             for each_stage_name, each_stage_ref in self.core_ref_dict.items():
@@ -270,6 +292,10 @@ class Core_Bundle:
                 process_outputs, process_timing = \
                 self._run_one(process_outputs, each_stage_ref,
                               current_frame_index, current_epoch_ms, current_datetime)
+                
+                # Lock outputs when debugging, so the following stages can't modify shared frame data
+                if self._readonly_check:
+                    lock_frame_data(process_outputs)
 
                 # Store results for analysis
                 stage_outputs.update({each_stage_name: process_outputs})
@@ -407,6 +433,29 @@ class Core_Bundle:
     # .................................................................................................................
 
 
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Define functions
+
+# .....................................................................................................................
+
+def lock_frame_data(stage_io_dict):
+    
+    '''
+    Helper used to mark all array data in a stage input/output dictionary as non-writeable
+    Any stage that tries to modify the (shared) data in-place will raise an error.
+    Intended for debugging only!
+    '''
+    
+    for each_value in stage_io_dict.values():
+        if isinstance(each_value, np.ndarray):
+            each_value.flags.writeable = False
+    
+    return stage_io_dict
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Demo
 
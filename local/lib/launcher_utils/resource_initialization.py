@@ -62,6 +62,8 @@ from local.lib.file_access_utils.resources import load_newest_generated_backgrou
 from local.lib.file_access_utils.resources import reset_capture_folder, reset_generate_folder
 from local.lib.file_access_utils.image_read_write import save_png_image
 
+from local.lib.launcher_utils.video_setup import create_VideoCapture
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define classes
@@ -306,7 +308,7 @@ def _generate_initial_background_from_file(video_reader_ref, max_ram_usage_MB =
     
     # Set up a separate video reader to handle capture 
     # (to avoid any threading or weird behavior on provided reader)
-    temp_vreader = cv2.VideoCapture(video_reader_ref.video_source)
+    temp_vreader = create_VideoCapture(video_reader_ref.video_source, video_reader_ref.capture_options)
     
     # Figure out how many frames we can use given the RAM limit
     num_bytes_per_pixel = 3
@@ -49,8 +49,13 @@ find_path_to_local()
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Imports
 
+import cv2
+import numpy as np
+
 from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
 
+from local.lib.common.environment import get_env_fused_station_evaluation, get_env_station_num_workers
 from local.lib.common.timekeeper_utils import Periodic_Polled_Timer, datetime_to_isoformat_string
 
 from local.lib.file_access_utils.reporting import Station_Report_Data_Saver
@@ -58,6 +63,8 @@ from local.lib.file_access_utils.configurables import dynamic_import_stations, u
 from local.lib.file_access_utils.configurables import create_blank_configurable_data_dict, check_matching_access_info
 from local.lib.file_access_utils.stations import build_station_config_folder_path, load_all_station_config_data
 
+from local.configurables.stations._helper_functions import get_zone_pixel_indices
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define classes
@@ -89,6 +96,15 @@ class Station_Bundle:
         # Set up periodic trigger used for saving station data
         self._save_timer = Periodic_Polled_Timer(trigger_on_first_check = False)
         
+        # Set up engine used to evaluate (compatible) stations in a single shared pass
+        self._fused_engine = Fused_Station_Engine(video_wh)
+        self.fused_evaluation_enabled = get_env_fused_station_evaluation()
+        
+        # Set up worker pool storage, used to run stations in parallel (if enabled)
+        self.num_workers = get_env_station_num_workers()
+        self._worker_pool = None
+        self._worker_station_names_lists = []
+        
         # Allocate storage for saving the 'first' times of each data block that gets saved
         self._need_to_update_block_start_times = True
         self._first_frame_index = None
@@ -171,6 +187,9 @@ class Station_Bundle:
         for each_station_name, each_station_ref in self.all_stations_ref_dict.items():
             each_station_ref.close(current_frame_index, current_epoch_ms, current_datetime)
         
+        # Shutdown worker threads, if needed
+        self._shutdown_worker_pool()
+        
         # Close report saver object
         self._report_data_saver.close()
         
@@ -221,6 +240,33 @@ class Station_Bundle:
     
     # .................................................................................................................
     
+    def toggle_fused_evaluation(self, enable_fused_evaluation):
+        
+        '''
+        Function used to enable or disable fused evaluation of stations.
+        When enabled, stations which only depend on the average value of their zone are all
+        evaluated in a single shared pass over each frame, instead of running each station separately
+        '''
+        
+        self.fused_evaluation_enabled = enable_fused_evaluation
+        if self.all_stations_ref_dict is not None:
+            self._setup_fused_engine(self.all_stations_ref_dict)
+    
+    # .................................................................................................................
+    
+    def set_num_workers(self, num_workers):
+        
+        '''
+        Function used to set the number of worker threads used to run stations in parallel
+        A value of 0 (or 1) disables parallel processing, so that stations are run one-by-one on the calling thread
+        '''
+        
+        self.num_workers = num_workers
+        if self.all_stations_ref_dict is not None:
+            self._setup_worker_pool(self.all_stations_ref_dict)
+    
+    # .................................................................................................................
+    
     def set_saving_period(self, minutes = 0, seconds = 0, milliseconds = 0):
         
         ''' Function used to change rate at which the bundler saves station data '''
@@ -229,6 +275,14 @@ class Station_Bundle:
         
     # .................................................................................................................
     
+    def get_saver_stats(self):
+        
+        ''' Function used to get saver queue/timing info for reporting (entries are None without threading) '''
+        
+        return {"report": self._report_data_saver.get_stats()}
+    
+    # .................................................................................................................
+    
     def get_configs_for_reporting(self):
         
         '''
@@ -270,6 +324,10 @@ class Station_Bundle:
         # Pre-check special case where we have no data to save
         self._no_stations_for_saving = (len(all_stations_ref_dict) == 0)
         
+        # Bundle stations for fused evaluation, if possible & split stations among parallel workers, if enabled
+        self._setup_fused_engine(all_stations_ref_dict)
+        self._setup_worker_pool(all_stations_ref_dict)
+        
         # Reset everything to start
         if reset_on_startup:
             self.reset_all()
@@ -316,6 +374,10 @@ class Station_Bundle:
         # Pre-check special case where we have no data to save
         self._no_stations_for_saving = (len(all_stations_ref_dict) == 0)
         
+        # Don't use fused evaluation or worker threads when configuring a single station
+        self._fused_engine.setup({})
+        self._setup_worker_pool({})
+        
         # Reset everything to start
         if reset_on_startup:
             self.reset_all()
@@ -341,15 +403,33 @@ class Station_Bundle:
             self._first_datetime_isoformat = datetime_to_isoformat_string(current_datetime)
             self._need_to_update_block_start_times = False
         
-        # Loop through every run function and pass the current frame + background data
-        station_timing_dict = {}
-        for each_station_name, each_station_ref in self.all_stations_ref_dict.items():
-            t1 = perf_counter()
-            each_station_ref.run(video_frame,
-                                 background_image, background_was_updated,
-                                 current_frame_index, current_epoch_ms, current_datetime)
-            t2 = perf_counter()
-            station_timing_dict[each_station_name] = (t2 - t1)
+        # Evaluate all fused stations in a single pass. Timing is shared evenly among the fused stations
+        t1 = perf_counter()
+        fused_averages_dict = self._fused_engine.run(video_frame)
+        t2 = perf_counter()
+        fused_time_per_station = (t2 - t1) / max(1, len(fused_averages_dict))
+        
+        # Bundle up shared station inputs for convenience
+        run_args = (video_frame, background_image, background_was_updated,
+                    current_frame_index, current_epoch_ms, current_datetime)
+        
+        # Run all stations, either one-by-one or split among worker threads
+        # -> In either case, all stations will have finished processing the frame before we check for saving
+        if self._worker_pool is None:
+            all_station_names = self.all_stations_ref_dict.keys()
+            station_timing_dict = self._run_stations(all_station_names, fused_averages_dict, fused_time_per_station,
+                                                     *run_args)
+        else:
+            worker_futures_list = [self._worker_pool.submit(self._run_stations, each_names_list,
+                                                            fused_averages_dict, fused_time_per_station, *run_args)
+                                   for each_names_list in self._worker_station_names_lists]
+            worker_timing_dict = {}
+            for each_future in worker_futures_list:
+                worker_timing_dict.update(each_future.result())
+            
+            # Re-order timing results so they're consistent with non-parallel processing
+            station_timing_dict = {each_station_name: worker_timing_dict[each_station_name]
+                                   for each_station_name in self.all_stations_ref_dict.keys()}
         
         # Check timer to see if we need to save data
         need_to_save = self._save_timer.check_trigger(current_epoch_ms)
@@ -361,6 +441,37 @@ class Station_Bundle:
     
     # .................................................................................................................
     
+    def _run_stations(self, station_names_list, fused_averages_dict, fused_time_per_station,
+                      video_frame, background_image, background_was_updated,
+                      current_frame_index, current_epoch_ms, current_datetime):
+        
+        '''
+        Helper function which runs a set of stations (one-by-one) on the current frame (or fused result)
+        Can be called from worker threads, each with a separate set of stations
+        Returns a dictionary of per-station processing times
+        '''
+        
+        # Loop through every run function and pass the current frame (or fused result) + background data
+        station_timing_dict = {}
+        for each_station_name in station_names_list:
+            each_station_ref = self.all_stations_ref_dict[each_station_name]
+            t1 = perf_counter()
+            if each_station_name in fused_averages_dict:
+                each_station_ref.run_reduced(fused_averages_dict[each_station_name],
+                                             background_image, background_was_updated,
+                                             current_frame_index, current_epoch_ms, current_datetime)
+                t1 -= fused_time_per_station
+            else:
+                each_station_ref.run(video_frame,
+                                     background_image, background_was_updated,
+                                     current_frame_index, current_epoch_ms, current_datetime)
+            t2 = perf_counter()
+            station_timing_dict[each_station_name] = (t2 - t1)
+        
+        return station_timing_dict
+    
+    # .................................................................................................................
+    
     def _save_station_data(self, current_frame_index, current_epoch_ms, current_datetime):
         
         # Bail if we won't have any data to save
@@ -427,6 +538,57 @@ class Station_Bundle:
     
     # .................................................................................................................
     
+    def _setup_fused_engine(self, all_stations_ref_dict):
+        
+        ''' Helper function used to (re-)build the fused station engine using the current settings '''
+        
+        stations_to_fuse_dict = all_stations_ref_dict if self.fused_evaluation_enabled else {}
+        self._fused_engine.setup(stations_to_fuse_dict)
+        
+        return
+    
+    # .................................................................................................................
+    
+    def _setup_worker_pool(self, all_stations_ref_dict):
+        
+        '''
+        Helper function used to (re-)build the worker thread pool used to run stations in parallel
+        Stations are split (round-robin) into one group per worker, and each group is run one-by-one on its worker,
+        so that a single station is never run by more than one thread at a time
+        '''
+        
+        # Clear any existing workers
+        self._shutdown_worker_pool()
+        
+        # Don't bother with workers if we can't run anything in parallel
+        all_station_names_list = list(all_stations_ref_dict.keys())
+        num_workers = min(self.num_workers, len(all_station_names_list))
+        if num_workers < 2:
+            return
+        
+        # Split stations among workers & start up the worker threads
+        self._worker_station_names_lists = [all_station_names_list[k::num_workers] for k in range(num_workers)]
+        self._worker_pool = ThreadPoolExecutor(max_workers = num_workers,
+                                               thread_name_prefix = "{}-stations".format(self.camera_select))
+        
+        return
+    
+    # .................................................................................................................
+    
+    def _shutdown_worker_pool(self):
+        
+        ''' Helper function used to close down the worker thread pool (if present) '''
+        
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown(wait = True)
+        
+        self._worker_pool = None
+        self._worker_station_names_lists = []
+        
+        return
+    
+    # .................................................................................................................
+    
     def _initialize_report_data_saver(self):
         
         ''' Helper function used to set/reset the report data saving object with new settings '''
@@ -440,6 +602,158 @@ class Station_Bundle:
     # .................................................................................................................
 
 
+# =====================================================================================================================
+# =====================================================================================================================
+
+
+class Fused_Station_Engine:
+    
+    # .................................................................................................................
+    
+    def __init__(self, video_wh):
+        
+        '''
+        Object used to evaluate many stations in a single shared pass over each frame
+        Only works with stations that provide a reduction spec (see Reference_Station.get_fused_reduction_spec),
+        which indicates that the station output only depends on the average pixel value within the station zone
+        
+        For these stations, the zone pixels of every station are gathered from the frame all at once,
+        color conversions (gray/hsv) are applied once to all gathered pixels, and all zone averages
+        are computed with a single (segmented) sum, rather than cropping/masking/averaging every station separately
+        '''
+        
+        # Store frame sizing, needed to convert station crop/mask data into frame pixel indexing
+        self.video_wh = video_wh
+        
+        # Allocate storage for station pixel indexing data, grouped by color space
+        self.fused_station_names_list = []
+        self._reduction_groups_list = []
+    
+    # .................................................................................................................
+    
+    def __repr__(self):
+        
+        num_fused = len(self.fused_station_names_list)
+        num_groups = len(self._reduction_groups_list)
+        return "Fused Station Engine ({} stations, {} color spaces)".format(num_fused, num_groups)
+    
+    # .................................................................................................................
+    
+    def setup(self, all_stations_ref_dict):
+        
+        '''
+        Function used to gather the pixel indexing data of all stations that can be fused
+        Should be called any time the station zones are changed!
+        '''
+        
+        # Get the zone pixel indices for every station that supports fused evaluation, grouped by color space
+        zone_pixels_by_color_space_dict = {}
+        for each_station_name, each_station_ref in all_stations_ref_dict.items():
+            
+            # Skip stations that can't be fused
+            reduction_spec = each_station_ref.get_fused_reduction_spec()
+            if reduction_spec is None:
+                continue
+            
+            # Skip stations with empty zones, since we can't average them (let the station handle it instead)
+            color_space, crop_y1y2x1x2, logical_cropmask_1d = reduction_spec
+            zone_pixel_idxs = get_zone_pixel_indices(self.video_wh, crop_y1y2x1x2, logical_cropmask_1d)
+            if zone_pixel_idxs.size == 0:
+                continue
+            
+            # Make sure we know how to handle the requested color space
+            if color_space not in _COLOR_CONVERSION_LUT:
+                raise NameError("Unrecognized fused color space ({}) for station: {}".format(color_space,
+                                                                                            each_station_name))
+            
+            new_entry = (each_station_name, zone_pixel_idxs)
+            zone_pixels_by_color_space_dict.setdefault(color_space, []).append(new_entry)
+        
+        # Build the combined pixel indexing & labelling data for each color space
+        fused_station_names_list = []
+        reduction_groups_list = []
+        for each_color_space, each_entry_list in zone_pixels_by_color_space_dict.items():
+            
+            # For clarity
+            conversion_code, num_channels = _COLOR_CONVERSION_LUT[each_color_space]
+            station_names_list, zone_pixel_idxs_list = zip(*each_entry_list)
+            num_stations = len(station_names_list)
+            
+            # Combine all station pixel indices together, so we can grab all the pixels at once
+            pixel_idx_array = np.concatenate(zone_pixel_idxs_list)
+            
+            # Record where each station's pixels start in the combined listing, so we can sum each segment at once
+            pixel_counts_list = [len(each_idxs) for each_idxs in zone_pixel_idxs_list]
+            segment_starts_array = np.concatenate(((0,), np.cumsum(pixel_counts_list)[:-1]))
+            pixel_counts_array = np.float64(pixel_counts_list).reshape(num_stations, 1)
+            
+            # Store everything needed to evaluate the stations on each frame
+            new_group = (station_names_list, conversion_code, num_channels,
+                         pixel_idx_array, segment_starts_array, pixel_counts_array)
+            reduction_groups_list.append(new_group)
+            fused_station_names_list += station_names_list
+        
+        # Store results for use on every frame
+        self.fused_station_names_list = fused_station_names_list
+        self._reduction_groups_list = reduction_groups_list
+        
+        return
+    
+    # .................................................................................................................
+    
+    def run(self, video_frame):
+        
+        '''
+        Function which computes the zone average of every fused station
+        Returns:
+            fused_averages_dict (keys are station names, values are the zone averages)
+        '''
+        
+        # Bail if there is nothing to fuse
+        fused_averages_dict = {}
+        if len(self._reduction_groups_list) == 0:
+            return fused_averages_dict
+        
+        # Flatten the frame, so we can grab pixels by index
+        frame_pixels_1d = np.reshape(video_frame, (-1, 3))
+        
+        for each_group in self._reduction_groups_list:
+            
+            # For clarity
+            station_names_list, conversion_code, num_channels, \
+            pixel_idx_array, segment_starts_array, pixel_counts_array = each_group
+            
+            # Grab the pixels of all zones at once and apply color conversion if needed
+            # -> Pixels are converted as a 1 x N image, which gives the same result as converting per-station
+            zone_pixels = np.take(frame_pixels_1d, pixel_idx_array, axis = 0)
+            if conversion_code is not None:
+                zone_pixels = cv2.cvtColor(np.expand_dims(zone_pixels, 0), conversion_code)
+            zone_pixels = np.reshape(zone_pixels, (-1, num_channels))
+            
+            # Sum every station/channel at once (using integers, so sums are exact), then get per-station averages
+            channel_sums = np.add.reduceat(zone_pixels, segment_starts_array, axis = 0, dtype = np.int64)
+            channel_averages = channel_sums / pixel_counts_array
+            
+            # Single channel results are given as plain values, rather than 1-element arrays
+            if num_channels == 1:
+                channel_averages = channel_averages[:, 0]
+            fused_averages_dict.update(zip(station_names_list, channel_averages))
+        
+        return fused_averages_dict
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Define functions
+
+# Lookup used to get the (opencv) color conversion code & number of channels for each fused color space
+_COLOR_CONVERSION_LUT = {"bgr": (None, 3),
+                         "gray": (cv2.COLOR_BGR2GRAY, 1),
+                         "hsv": (cv2.COLOR_BGR2HSV, 3)}
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Demo
 
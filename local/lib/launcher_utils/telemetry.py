@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:12:40 2026
+
+@author: eo
+"""
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Add local path
+
+import os
+import sys
+
+def find_path_to_local(target_folder = "local"):
+    
+    # Skip path finding if we successfully import the dummy file
+    try:
+        from local.dummy import dummy_func; dummy_func(); return
+    except ImportError:
+        print("", "Couldn't find local directory!", "Searching for path...", sep="\n")
+    
+    # Figure out where this file is located so we can work backwards to find the target folder
+    file_directory = os.path.dirname(os.path.abspath(__file__))
+    path_check = []
+    
+    # Check parent directories to see if we hit the main project directory containing the target folder
+    prev_working_path = working_path = file_directory
+    while True:
+        
+        # If we find the target folder in the given directory, add it to the python path (if it's not already there)
+        if target_folder in os.listdir(working_path):
+            if working_path not in sys.path:
+                tilde_swarm = "~"*(4 + len(working_path))
+                print("\n{}\nPython path updated:\n  {}\n{}".format(tilde_swarm, working_path, tilde_swarm))
+                sys.path.append(working_path)
+            break
+        
+        # Stop if we hit the filesystem root directory (parent directory isn't changing)
+        prev_working_path, working_path = working_path, os.path.dirname(working_path)
+        path_check.append(prev_working_path)
+        if prev_working_path == working_path:
+            print("\nTried paths:", *path_check, "", sep="\n  ")
+            raise ImportError("Can't find '{}' directory!".format(target_folder))
+            
+find_path_to_local()
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Imports
+
+import numpy as np
+
+from time import perf_counter
+
+from local.lib.common.environment import get_env_telemetry_enabled, get_env_telemetry_period_sec
+from local.lib.common.timekeeper_utils import get_human_readable_timestamp, get_utc_epoch_ms
+
+from local.lib.file_access_utils.state_files import save_metrics_file
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Define classes
+
+class Performance_Telemetry:
+    
+    # .................................................................................................................
+    
+    def __init__(self, location_select_folder_path, camera_select, enable_telemetry = None,
+                 report_period_sec = None, window_size = 1024):
+        
+        '''
+        Object used to keep track of run-time performance (stage timing, framerate, late frames, saver queues)
+        Timing data is stored in rolling windows, so that percentiles reflect recent performance only.
+        Results are periodically written to a (per camera) metrics file, which can be read by the control server
+        
+        Recording is kept cheap (storing a few numbers per frame), percentiles are only
+        calculated when the metrics file is written
+        '''
+        
+        # Store pathing info, needed for saving metrics file
+        self.location_select_folder_path = location_select_folder_path
+        self.camera_select = camera_select
+        
+        # Use environment settings if not given
+        self.enabled = get_env_telemetry_enabled() if enable_telemetry is None else enable_telemetry
+        report_period_sec = get_env_telemetry_period_sec() if report_period_sec is None else report_period_sec
+        self.report_period_sec = max(1.0, report_period_sec)
+        
+        # Allocate storage for rolling timing windows
+        self._window_size = window_size
+        self._stage_windows_dict = {}
+        self._station_windows_dict = {}
+        
+        # Allocate storage for frame timing
+        self._frame_period_sec = None
+        self._total_frames = 0
+        self._total_late_frames = 0
+        self._total_dropped_frames = 0
+        
+        # Allocate storage for counts since the last report, used to report recent framerate/late/dropped frames
+        self._report_frames = 0
+        self._report_late_frames = 0
+        self._report_dropped_frames = 0
+        
+        # Allocate storage for report timing
+        self._start_time_sec = perf_counter()
+        self._last_report_time_sec = self._start_time_sec
+        self._next_report_time_sec = self._start_time_sec + self.report_period_sec
+        
+        # Storage for function used to get saver stats (only called when reporting)
+        self._get_saver_stats_func = None
+    
+    # .................................................................................................................
+    
+    def __repr__(self):
+        
+        repr_strs = ["Performance Telemetry ({})".format("enabled" if self.enabled else "disabled"),
+                     "  Report period (sec): {}".format(self.report_period_sec),
+                     "        Total frames: {}".format(self._total_frames)]
+        
+        return "\n".join(repr_strs)
+    
+    # .................................................................................................................
+    
+    def set_frame_period(self, video_fps):
+        
+        ''' Function used to set the expected frame period, used to detect late frames '''
+        
+        try:
+            self._frame_period_sec = (1.0 / video_fps) if video_fps > 0 else None
+        except TypeError:
+            self._frame_period_sec = None
+    
+    # .................................................................................................................
+    
+    def set_saver_stats_source(self, get_saver_stats_func):
+        
+        '''
+        Function used to provide a function for getting saver stats (e.g. queue depths)
+        The provided function should return a json-friendly dictionary, and is only called when reporting
+        '''
+        
+        self._get_saver_stats_func = get_saver_stats_func
+    
+    # .................................................................................................................
+    
+    def record_frame(self, frame_time_sec, stage_timing_dict = None):
+        
+        '''
+        Function called once per frame, with the total processing time of the frame
+        and optionally the per-stage timing (e.g. from the core bundle)
+        Note that the frame time is measured after the frame is read, so it does not include
+        time spent reading/waiting on frames. Late frames are frames whose processing alone
+        takes longer than the expected frame period
+        Also handles periodic saving of the metrics file
+        '''
+        
+        # Skip everything if disabled
+        if not self.enabled:
+            return
+        
+        # Update frame counts
+        self._total_frames += 1
+        self._report_frames += 1
+        if self._frame_period_sec is not None and frame_time_sec > self._frame_period_sec:
+            self._total_late_frames += 1
+            self._report_late_frames += 1
+        
+        # Record timing for the full frame and individual stages
+        self._add_sample(self._stage_windows_dict, "full_frame", frame_time_sec)
+        if stage_timing_dict is not None:
+            for each_stage_name, each_time_sec in stage_timing_dict.items():
+                self._add_sample(self._stage_windows_dict, each_stage_name, each_time_sec)
+        
+        # Save metrics periodically
+        current_time_sec = perf_counter()
+        if current_time_sec >= self._next_report_time_sec:
+            self.save_metrics(current_time_sec)
+        
+        return
+    
+    # .................................................................................................................
+    
+    def record_station_timing(self, station_timing_dict):
+        
+        '''
+        Function used to record station processing timing (may be called from a separate thread than frames)
+        Stores timing for every station as well as the total time of all stations
+        '''
+        
+        # Skip everything if disabled
+        if not self.enabled:
+            return
+        
+        total_time_sec = 0.0
+        for each_station_name, each_time_sec in station_timing_dict.items():
+            self._add_sample(self._station_windows_dict, each_station_name, each_time_sec)
+            total_time_sec += each_time_sec
+        self._add_sample(self._stage_windows_dict, "station_processing", total_time_sec)
+        
+        return
+    
+    # .................................................................................................................
+    
+    def record_dropped_frames(self, num_dropped_frames):
+        
+        ''' Function used to record frames that were skipped/dropped without processing '''
+        
+        self._total_dropped_frames += num_dropped_frames
+        self._report_dropped_frames += num_dropped_frames
+    
+    # .................................................................................................................
+    
+    def get_metrics(self, current_time_sec = None):
+        
+        ''' Function which bundles all recorded data into a json-friendly dictionary '''
+        
+        # Get timing of reporting period, used to calculate recent framerate
+        if current_time_sec is None:
+            current_time_sec = perf_counter()
+        report_elapsed_sec = max(1E-6, current_time_sec - self._last_report_time_sec)
+        
+        # Bundle frame count info
+        frames_dict = {"total": self._total_frames,
+                       "fps": round(self._report_frames / report_elapsed_sec, 2),
+                       "late": self._total_late_frames,
+                       "late_recent": self._report_late_frames,
+                       "dropped": self._total_dropped_frames,
+                       "dropped_recent": self._report_dropped_frames}
+        
+        # Get saver stats, if possible
+        saver_stats_dict = {}
+        if self._get_saver_stats_func is not None:
+            saver_stats_dict = self._get_saver_stats_func()
+        
+        # Bundle everything together
+        metrics_dict = {"camera_select": self.camera_select,
+                        "timestamp_str": get_human_readable_timestamp(),
+                        "epoch_ms": get_utc_epoch_ms(),
+                        "uptime_sec": round(current_time_sec - self._start_time_sec, 1),
+                        "report_period_sec": self.report_period_sec,
+                        "frames": frames_dict,
+                        "stages_ms": _summarize_windows(self._stage_windows_dict),
+                        "stations_ms": _summarize_windows(self._station_windows_dict),
+                        "savers": saver_stats_dict}
+        
+        return metrics_dict
+    
+    # .................................................................................................................
+    
+    def save_metrics(self, current_time_sec = None):
+        
+        ''' Function used to write out the metrics file. Also resets 'recent' counts for the next report '''
+        
+        # Don't save anything if disabled
+        if not self.enabled:
+            return
+        
+        # Get current metrics & save them
+        if current_time_sec is None:
+            current_time_sec = perf_counter()
+        metrics_dict = self.get_metrics(current_time_sec)
+        try:
+            save_metrics_file(self.location_select_folder_path, self.camera_select, metrics_dict)
+        except OSError as err:
+            print("", "Error saving performance metrics:", str(err), sep = "\n")
+        
+        # Reset 'recent' counts & schedule next report
+        self._report_frames = 0
+        self._report_late_frames = 0
+        self._report_dropped_frames = 0
+        self._last_report_time_sec = current_time_sec
+        self._next_report_time_sec = current_time_sec + self.report_period_sec
+        
+        return metrics_dict
+    
+    # .................................................................................................................
+    
+    def close(self):
+        
+        ''' Function used to write a final metrics file, if any frames were recorded '''
+        
+        if self._total_frames > 0:
+            self.save_metrics()
+        
+        return
+    
+    # .................................................................................................................
+    
+    def _add_sample(self, windows_dict, window_name, time_sec):
+        
+        ''' Helper used to add timing samples to a (possibly new) rolling window '''
+        
+        window_ref = windows_dict.get(window_name, None)
+        if window_ref is None:
+            window_ref = Rolling_Timing_Window(self._window_size)
+            windows_dict[window_name] = window_ref
+        window_ref.add(time_sec)
+        
+        return
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
+
+# =====================================================================================================================
+# =====================================================================================================================
+
+
+class Rolling_Timing_Window:
+    
+    # .................................................................................................................
+    
+    def __init__(self, window_size):
+        
+        ''' Fixed-size ring of the most recent timing samples, used to get rolling percentiles '''
+        
+        self._samples_array = np.zeros(window_size, dtype = np.float64)
+        self._window_size = window_size
+        self._next_idx = 0
+        self._num_samples = 0
+    
+    # .................................................................................................................
+    
+    def add(self, time_sec):
+        
+        ''' Add a new sample, overwriting the oldest sample once the window is full '''
+        
+        self._samples_array[self._next_idx] = time_sec
+        self._next_idx = (self._next_idx + 1) % self._window_size
+        self._num_samples = min(self._num_samples + 1, self._window_size)
+    
+    # .................................................................................................................
+    
+    def summarize_ms(self):
+        
+        ''' Returns a dictionary of p50/p95/p99/max timing (in milliseconds) of all samples in the window '''
+        
+        # Handle empty windows
+        if self._num_samples == 0:
+            return {"p50": None, "p95": None, "p99": None, "max": None, "samples": 0}
+        
+        # Only use the filled part of the window
+        samples_ms = 1000.0 * self._samples_array[:self._num_samples]
+        p50, p95, p99 = np.percentile(samples_ms, (50, 95, 99))
+        max_ms = np.max(samples_ms)
+        
+        return {"p50": round(float(p50), 3),
+                "p95": round(float(p95), 3),
+                "p99": round(float(p99), 3),
+                "max": round(float(max_ms), 3),
+                "samples": self._num_samples}
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Define functions
+
+# .....................................................................................................................
+
+def _summarize_windows(windows_dict):
+    
+    ''' Helper used to summarize every timing window in a dictionary. Works on a copy in case of threading '''
+    
+    return {each_name: each_window.summarize_ms() for each_name, each_window in list(windows_dict.items())}
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Demo
+
+if __name__ == "__main__":
+    pass
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Scrap
+
+
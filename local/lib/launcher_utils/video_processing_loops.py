@@ -49,6 +49,8 @@ find_path_to_local()
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Imports
 
+import threading
+import queue
 import cv2
 
 from tqdm import tqdm
@@ -58,6 +60,8 @@ from collections import OrderedDict
 
 from local.lib.common.exceptions import OS_Close
 
+from local.lib.launcher_utils.telemetry import Performance_Telemetry
+
 from local.lib.ui_utils.local_ui.windows_base import Simple_Window, Max_WH_Window, Drawing_Window
 from local.lib.ui_utils.local_ui.controls import Local_Window_Controls
 from local.lib.ui_utils.local_ui.timing import Local_Timing_Window
@@ -73,14 +77,29 @@ class Video_Processing_Loop:
     
     # .................................................................................................................
     
-    def __init__(self, configuration_loader_object, enable_display):
+    def __init__(self, configuration_loader_object, enable_display,
+                 enable_pipelining = False, pipeline_queue_size = 8, enable_telemetry = None):
         
         # Store loader object so we can access all fully configured processing objects
         self.loader = configuration_loader_object
         
+        # Set up performance telemetry, used to report run-time performance (uses environment settings by default)
+        location_select_folder_path, camera_select = self.loader.get_camera_pathing()
+        self.telemetry = Performance_Telemetry(location_select_folder_path, camera_select, enable_telemetry)
+        self.telemetry.set_frame_period(self.loader.video_fps)
+        self.telemetry.set_saver_stats_source(self.get_saver_stats)
+        
         # Storage for display settings
         self.enable_display = enable_display
         
+        # Storage for pipelined (multi-threaded) processing settings
+        self.enable_pipelining = enable_pipelining
+        self._pipeline_queue_size = max(1, int(pipeline_queue_size))
+        
+        # Warning if pipelining is requested along with display, since display is only handled by the serial loop
+        if enable_pipelining and enable_display:
+            print("", "WARNING:", "  Pipelined processing is not supported with display enabled!", sep = "\n")
+        
     # .................................................................................................................
     
     def _loop_no_display(self, enable_progress_bar = False):
@@ -102,6 +121,7 @@ class Video_Processing_Loop:
                 if req_break:
                     break
                 prev_fed_time_args = fed_time_args
+                t_frame_start = perf_counter()
                 
                 # Capture snapshots
                 self.run_snapshot_capture(frame, *fed_time_args)
@@ -110,15 +130,19 @@ class Video_Processing_Loop:
                 background_args = self.run_background_capture(frame, *fed_time_args)
                 
                 # Perform main core processing
-                stage_outputs, _ = \
+                stage_outputs, stage_timing = \
                 self.run_core_processing(frame, read_time_sec, *background_args, *fed_time_args)
                 
                 # Perform station processing
-                self.run_station_processing(frame, *background_args, *fed_time_args)
+                station_timing_dict = self.run_station_processing(frame, *background_args, *fed_time_args)
+                self.telemetry.record_station_timing(station_timing_dict)
                 
                 # Capture object data
                 self.run_object_capture(stage_outputs, *fed_time_args)
                 
+                # Record frame processing time (not including time spent waiting on frames) for performance reporting
+                self.telemetry.record_frame(perf_counter() - t_frame_start, stage_timing)
+                
                 # Provide progress feedback if needed
                 if enable_progress_bar:
                     cli_prog_bar.update()
@@ -163,6 +187,7 @@ class Video_Processing_Loop:
                 if req_break:
                     break
                 prev_fed_time_args = fed_time_args
+                t_frame_start = perf_counter()
                 
                 # Capture snapshots
                 self.run_snapshot_capture(frame, *fed_time_args)
@@ -171,15 +196,19 @@ class Video_Processing_Loop:
                 background_args = self.run_background_capture(frame, *fed_time_args)
                 
                 # Perform main core processing
-                stage_outputs, _ = \
+                stage_outputs, stage_timing = \
                 self.run_core_processing(frame, read_time_sec, *background_args, *fed_time_args)
                 
                 # Perform station processing
-                self.run_station_processing(frame, *background_args, *fed_time_args)
+                station_timing_dict = self.run_station_processing(frame, *background_args, *fed_time_args)
+                self.telemetry.record_station_timing(station_timing_dict)
                 
                 # Capture object data
                 self.run_object_capture(stage_outputs, *fed_time_args)
                 
+                # Record frame processing time (not including time spent waiting on frames) for performance reporting
+                self.telemetry.record_frame(perf_counter() - t_frame_start, stage_timing)
+                
                 # Display tracking results
                 simple_display(window_ref, display_obj, stage_outputs, *fed_time_args)
                 
@@ -205,17 +234,154 @@ class Video_Processing_Loop:
         
     # .................................................................................................................
     
+    def _loop_pipelined(self, enable_progress_bar = False):
+        
+        '''
+        Alternate (no display) loop which splits processing across two threads.
+        The main thread handles frame reading, background capture, core processing & object capture,
+        while a worker thread handles snapshot capture & station processing.
+        Frames are passed to the worker through a bounded queue and are always processed in order,
+        so that saved data is identical to the serial loop. The main benefit is that the
+        snapshot/station work on frame N can overlap with core processing on frame N+1
+        '''
+        
+        # Allocate storage for buffering time info, in case of sudden close/clean up
+        prev_fed_time_args = [None, None, None]
+        
+        # Set up the worker thread used to handle snapshot & station processing
+        pipeline_queue = queue.Queue(self._pipeline_queue_size)
+        worker_error_list = []
+        worker_ref = threading.Thread(target = self._pipeline_worker,
+                                      args = (pipeline_queue, worker_error_list),
+                                      daemon = True)
+        worker_ref.start()
+        
+        # Set up progress bar
+        if enable_progress_bar:
+            total_frames = self.loader.vreader.total_frames
+            cli_prog_bar = tqdm(total = total_frames, mininterval = 0.5)
+        
+        try:
+            
+            while True:
+                
+                # Read video frames & get timing info
+                req_break, frame, read_time_sec, *fed_time_args = self.read_frames()
+                if req_break:
+                    break
+                prev_fed_time_args = fed_time_args
+                t_frame_start = perf_counter()
+                
+                # Capture frames & generate new background images
+                background_args = self.run_background_capture(frame, *fed_time_args)
+                
+                # Hand off snapshot & station processing to the worker (blocks if the worker falls behind)
+                self._pipeline_put(pipeline_queue, worker_ref, (frame, background_args, fed_time_args))
+                
+                # Perform main core processing
+                stage_outputs, stage_timing = \
+                self.run_core_processing(frame, read_time_sec, *background_args, *fed_time_args)
+                
+                # Capture object data
+                self.run_object_capture(stage_outputs, *fed_time_args)
+                
+                # Record frame processing time (not including time spent waiting on frames) for performance reporting
+                self.telemetry.record_frame(perf_counter() - t_frame_start, stage_timing)
+                
+                # Stop if the worker ran into an error
+                if worker_error_list:
+                    break
+                
+                # Provide progress feedback if needed
+                if enable_progress_bar:
+                    cli_prog_bar.update()
+            
+        except KeyboardInterrupt:
+            print("", "Keyboard interrupt! Closing...", sep = "\n")
+        
+        except SystemExit:
+            print("", "Done! User ended...", sep = "\n")
+        
+        except OS_Close:
+            print("", "System terminated! Quitting...", sep = "\n")
+        
+        # Signal the worker to finish any queued frames & wait for it to close, so stations/snapshots are complete
+        self._pipeline_put(pipeline_queue, worker_ref, None)
+        worker_ref.join()
+        
+        # Clean up the progress bar, if needed
+        if enable_progress_bar:
+            cli_prog_bar.close()
+            print("")
+        
+        # Pass worker errors back to the main thread, so they aren't silently lost
+        if worker_error_list:
+            raise worker_error_list[0]
+        
+        return prev_fed_time_args
+    
+    # .................................................................................................................
+    
+    def _pipeline_worker(self, pipeline_queue, worker_error_list):
+        
+        ''' Function run on a separate thread to handle snapshot & station processing when pipelining '''
+        
+        while True:
+            
+            # Wait for the next frame of data. A 'None' entry is used to signal shutdown
+            queue_data = pipeline_queue.get()
+            if queue_data is None:
+                break
+            
+            # Skip processing if an error already occurred, but keep draining the queue so the main thread can't stall
+            if worker_error_list:
+                continue
+            
+            try:
+                # Run the same (ordered) processing as the serial loop
+                frame, background_args, fed_time_args = queue_data
+                self.run_snapshot_capture(frame, *fed_time_args)
+                station_timing_dict = self.run_station_processing(frame, *background_args, *fed_time_args)
+                self.telemetry.record_station_timing(station_timing_dict)
+                
+            except Exception as err:
+                worker_error_list.append(err)
+        
+        return
+    
+    # .................................................................................................................
+    
+    def _pipeline_put(self, pipeline_queue, worker_ref, queue_data):
+        
+        ''' Helper function used to add data to the pipeline queue without blocking forever on a dead worker '''
+        
+        while worker_ref.is_alive():
+            try:
+                pipeline_queue.put(queue_data, block = True, timeout = 0.5)
+                break
+            except queue.Full:
+                pass
+        
+        return
+    
+    # .................................................................................................................
+    
     def loop(self, *, enable_progress_bar):
         
         # Start timer for measuring full run-time
         t_start = perf_counter()
         
-        # Run processing loop, with or without display depending on inputs
+        # Run processing loop, with or without display (or pipelining) depending on inputs
         if self.enable_display:
             final_fed_time_args = self._loop_with_display(enable_progress_bar)
+        elif self.enable_pipelining:
+            final_fed_time_args = self._loop_pipelined(enable_progress_bar)
         else:
             final_fed_time_args = self._loop_no_display(enable_progress_bar)
-            
+        
+        # Write out final performance metrics (before closing savers, so saver stats are still available)
+        self.telemetry.close()
+        
         # Clean up any open resources
         self.clean_up(*final_fed_time_args)
         
@@ -233,6 +399,11 @@ class Video_Processing_Loop:
         req_break, input_frame, read_time_sec, current_frame_index, current_epoch_ms, current_datetime = \
         self.loader.vreader.read()
         
+        # Report any frames that were skipped by the video reader (e.g. rtsp frame skipping)
+        num_skipped_frames = self.loader.vreader.pop_skipped_frame_count()
+        if num_skipped_frames > 0:
+            self.telemetry.record_dropped_frames(num_skipped_frames)
+        
         return req_break, input_frame, read_time_sec, current_frame_index, current_epoch_ms, current_datetime
     
     # .................................................................................................................
@@ -293,6 +464,19 @@ class Video_Processing_Loop:
         # Have loader clean up opened resources
         self.loader.clean_up(current_frame_index, current_epoch_ms, current_datetime)
     
+    # .................................................................................................................
+    
+    def get_saver_stats(self):
+        
+        ''' Function used to gather saver queue/timing info from all stages that save data, for reporting '''
+        
+        saver_stats_dict = {"background_capture": self.loader.bgcap.get_saver_stats(),
+                            "snapshot_capture": self.loader.snapcap.get_saver_stats(),
+                            "object_capture": self.loader.objcap.get_saver_stats(),
+                            "stations": self.loader.station_bundle.get_saver_stats()}
+        
+        return saver_stats_dict
+    
     # .................................................................................................................
     # .................................................................................................................
 
@@ -314,7 +498,7 @@ class Reconfigurable_Video_Loop(Video_Processing_Loop):
         except: pass
         
         # Inherit from parent class
-        super().__init__(configuration_loader_object, enable_display = True)
+        super().__init__(configuration_loader_object, enable_display = True, enable_telemetry = False)
         
         # Storage for re-configurable object
         self.configurable_ref = configuration_loader_object.configurable_ref
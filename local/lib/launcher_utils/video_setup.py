@@ -49,15 +49,18 @@ find_path_to_local()
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Imports
 
+import os
 import threading
 import queue
 import cv2
 
 from time import perf_counter
 
-from local.lib.file_access_utils.video import video_info_from_name
+from local.lib.file_access_utils.video import video_info_from_name, load_capture_options
+from local.lib.file_access_utils.video import create_default_capture_options
 from local.lib.file_access_utils.rtsp import load_rtsp_config, check_valid_rtsp_ip
 from local.lib.common.timekeeper_utils import Timekeeper, get_human_readable_timestamp
+from local.lib.common.environment import get_env_rtsp_adaptive_frame_skip, get_env_rtsp_target_analysis_fps
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -68,13 +71,17 @@ class Base_Video_Reader:
     # .................................................................................................................
     
     def __init__(self, video_source, video_type,
-                 start_datetime_isoformat = None, timelapse_factor = None):
+                 start_datetime_isoformat = None, timelapse_factor = None, capture_options = None):
         
         # Store video access info
         self.video_source = video_source
         self.video_type = video_type
+        self.capture_options = capture_options
         self.vcap = None
         self._start_videocapture()
+        
+        # Allocate storage for counting frames that are read but never processed (only used by some readers)
+        self._num_skipped_frames = 0
 
         # Create object for keeping track of time
         self.timekeeper = Timekeeper(start_datetime_isoformat, timelapse_factor)
@@ -161,6 +168,17 @@ class Base_Video_Reader:
     
     # .................................................................................................................
     
+    def pop_skipped_frame_count(self):
+        
+        ''' Returns the number of frames skipped (without processing) since the last call, then resets the count '''
+        
+        num_skipped_frames = self._num_skipped_frames
+        self._num_skipped_frames = 0
+        
+        return num_skipped_frames
+    
+    # .................................................................................................................
+    
     def set(self, property_code, new_value):
         return self.vcap.set(property_code, new_value)
     
@@ -212,7 +230,7 @@ class Base_Video_Reader:
     # .................................................................................................................
     
     def _start_videocapture(self):
-        self.vcap = safe_VideoCapture(self.video_source)
+        self.vcap = safe_VideoCapture(self.video_source, self.capture_options)
     
     # .................................................................................................................
     
@@ -258,11 +276,15 @@ class Threaded_File_Video_Reader(Base_Video_Reader):
         # Allocate storage for keeping tracking of current frame from a 'synchronous' perspective
         self._sync_frame_index = 0
         
+        # Load per-camera decoding options
+        capture_options = load_capture_options(location_select_folder_path, camera_select)
+        
         # Inherit from parent
         super().__init__(video_source,
                          video_type = "file",
                          start_datetime_isoformat = start_datetime_isoformat,
-                         timelapse_factor = timelapse_factor)
+                         timelapse_factor = timelapse_factor,
+                         capture_options = capture_options)
 
     # .................................................................................................................
     
@@ -394,7 +416,7 @@ class Threaded_File_Video_Reader(Base_Video_Reader):
     def _start_videocapture(self):
         
         # Create initial capture object
-        self.vcap = safe_VideoCapture(self.video_source)
+        self.vcap = safe_VideoCapture(self.video_source, self.capture_options)
         
         # Storage for threading resources
         self._thread_on = True
@@ -441,11 +463,15 @@ class File_Video_Reader(Base_Video_Reader):
                                                                                         camera_select,
                                                                                         video_select)
         
+        # Load per-camera decoding options
+        capture_options = load_capture_options(location_select_folder_path, camera_select)
+        
         # Inherit from parent
         super().__init__(video_source,
                          video_type = "file",
                          start_datetime_isoformat = start_datetime_isoformat,
-                         timelapse_factor = timelapse_factor)
+                         timelapse_factor = timelapse_factor,
+                         capture_options = capture_options)
         
     # .................................................................................................................
     
@@ -508,8 +534,110 @@ class RTSP_Video_Reader(Base_Video_Reader):
         self.rtsp_config_dict = rtsp_config_dict
         self.rtsp_string = rtsp_string
         
+        # Load per-camera decoding options
+        capture_options = load_capture_options(location_select_folder_path, camera_select)
+        
         # Inherit from parent
-        super().__init__(rtsp_string, video_type = "rtsp")
+        super().__init__(rtsp_string, video_type = "rtsp", capture_options = capture_options)
+        
+        # Set up frame skipping (used to keep up with the stream when processing is slow)
+        self._adaptive_frame_skip = False
+        self._target_analysis_fps = 0
+        self._source_frame_period_sec = None
+        self._max_skip_per_read = 0
+        self._fixed_skip_accumulator = 0.0
+        self._prev_read_end_time = None
+        self.set_frame_skipping(get_env_rtsp_adaptive_frame_skip(), get_env_rtsp_target_analysis_fps())
+    
+    # .................................................................................................................
+    
+    def set_frame_skipping(self, adaptive_frame_skip, target_analysis_fps = 0, source_fps = None):
+        
+        '''
+        Function used to control frame skipping (i.e. grabbing frames without decoding/processing them)
+        
+        Inputs:
+            adaptive_frame_skip -> (Boolean) If true, frames which arrive while the previous frame is still
+                                   being processed will be skipped, so that processing never falls behind the stream
+            
+            target_analysis_fps -> (Float) If greater than zero, frames will be skipped so that
+                                   (at most) this many frames per second are processed
+            
+            source_fps -> (Float or None) Framerate of the stream. If None, the reported video framerate is used
+        
+        Returns:
+            frame_skipping_enabled (boolean)
+        '''
+        
+        # Use reported framerate by default, but some cameras report nonsense values, so fall back to 'no skipping'
+        source_fps = self.video_fps if source_fps is None else source_fps
+        valid_source_fps = (source_fps is not None) and (0 < source_fps < 1000)
+        
+        # Store skipping settings
+        self._adaptive_frame_skip = (bool(adaptive_frame_skip) and valid_source_fps)
+        self._target_analysis_fps = target_analysis_fps if (valid_source_fps and target_analysis_fps > 0) else 0
+        self._source_frame_period_sec = (1.0 / source_fps) if valid_source_fps else None
+        self._max_skip_per_read = int(round(source_fps)) if valid_source_fps else 0
+        self._fixed_skip_accumulator = 0.0
+        self._prev_read_end_time = None
+        
+        # Warn if skipping was requested but can't be used
+        skip_requested = (adaptive_frame_skip or target_analysis_fps > 0)
+        if skip_requested and not valid_source_fps:
+            print("", "WARNING:", "  Can't enable frame skipping, bad source framerate ({})".format(source_fps),
+                  sep = "\n")
+        
+        return self._adaptive_frame_skip or (self._target_analysis_fps > 0)
+    
+    # .................................................................................................................
+    
+    def read(self):
+        
+        # Skip any frames we shouldn't process, without decoding them
+        t1 = perf_counter()
+        num_to_skip = self._get_num_frames_to_skip(t1)
+        for _ in range(num_to_skip):
+            req_break = self.no_decode_read()
+            if req_break:
+                break
+            self._num_skipped_frames += 1
+            self.timekeeper.skip_frame_index(1)
+        
+        # Read the frame we'll actually process
+        req_break, frame, read_time_sec, curent_frame_index, current_epoch_ms, current_datetime = super().read()
+        t2 = perf_counter()
+        self._prev_read_end_time = t2
+        
+        # Include skipping time as part of the read time
+        read_time_sec = (t2 - t1)
+        
+        return req_break, frame, read_time_sec, curent_frame_index, current_epoch_ms, current_datetime
+    
+    # .................................................................................................................
+    
+    def _get_num_frames_to_skip(self, current_time_sec):
+        
+        ''' Helper function used to decide how many frames to skip before the next processed frame '''
+        
+        # Never skip the first frame read after (re-)configuring skipping
+        if self._prev_read_end_time is None:
+            return 0
+        
+        # Skip frames to (roughly) hit a target analysis rate, carrying fractional skips forward between reads
+        num_fixed_skip = 0
+        if self._target_analysis_fps > 0:
+            target_period_sec = (1.0 / self._target_analysis_fps)
+            self._fixed_skip_accumulator += (target_period_sec / self._source_frame_period_sec) - 1.0
+            num_fixed_skip = max(0, int(self._fixed_skip_accumulator))
+            self._fixed_skip_accumulator -= num_fixed_skip
+        
+        # Skip every frame that arrived while we were processing the previous frame (beyond the one we'll read)
+        num_adaptive_skip = 0
+        if self._adaptive_frame_skip:
+            processing_time_sec = (current_time_sec - self._prev_read_end_time)
+            num_adaptive_skip = int(processing_time_sec / self._source_frame_period_sec) - 1
+        
+        return min(self._max_skip_per_read, max(0, num_fixed_skip, num_adaptive_skip))
     
     # .................................................................................................................
     
@@ -541,12 +669,220 @@ class RTSP_Video_Reader(Base_Video_Reader):
     # .................................................................................................................
 
 
+# /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+# /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+
+
+class Threaded_RTSP_Video_Reader(RTSP_Video_Reader):
+    
+    '''
+    RTSP reader which reads (and decodes) frames on a separate thread, so that slow processing
+    doesn't cause stale frames to build up in the stream buffer.
+    Only the newest frame is kept (latest-wins), older unread frames are dropped & counted as skipped.
+    Frames are timestamped when they're read from the stream, not when they're handed to the caller.
+    If the stream drops, the reader will try to reconnect, waiting longer after each failed attempt
+    '''
+    
+    # .................................................................................................................
+    
+    def __init__(self, location_select_folder_path, camera_select,
+                 min_reconnect_delay_sec = 1.0, max_reconnect_delay_sec = 30.0):
+        
+        # Set up storage for threading resources
+        self._vcap_lock = threading.Lock()
+        self._frame_condition = threading.Condition()
+        self._latest_frame_data = None
+        self._thread_on = None
+        self._thread_ref = None
+        
+        # Store reconnection settings
+        self._min_reconnect_delay_sec = min_reconnect_delay_sec
+        self._max_reconnect_delay_sec = max(min_reconnect_delay_sec, max_reconnect_delay_sec)
+        self.num_reconnects = 0
+        
+        # Inherit from parent
+        super().__init__(location_select_folder_path, camera_select)
+        
+        # Start reading only after the timekeeper has been set up by the parent, since the thread needs it!
+        self._thread_on = True
+        self._thread_ref = threading.Thread(target = self._threaded_read, daemon = True)
+        self._thread_ref.start()
+    
+    # .................................................................................................................
+    
+    def _threaded_read(self):
+        
+        reconnect_delay_sec = self._min_reconnect_delay_sec
+        while self._thread_on:
+            
+            # Get frames, with timing
+            with self._vcap_lock:
+                t1 = perf_counter()
+                (rec_frame, frame) = self.vcap.read()
+                t2 = perf_counter()
+            
+            # Try to reconnect if the stream drops, with increasing delays between attempts
+            if not rec_frame:
+                reconnected = self._reconnect(reconnect_delay_sec)
+                reconnect_delay_sec = self._min_reconnect_delay_sec if reconnected \
+                                      else min(2.0 * reconnect_delay_sec, self._max_reconnect_delay_sec)
+                continue
+            
+            # Timestamp the frame at read-time, so that timing isn't affected by how long the frame waits
+            curent_frame_index, current_epoch_ms, current_datetime = self._get_time()
+            read_time_sec = (t2 - t1)
+            
+            # Replace any unread frame with the newest one
+            frame_data = (False, frame, read_time_sec, curent_frame_index, current_epoch_ms, current_datetime)
+            with self._frame_condition:
+                if self._latest_frame_data is not None:
+                    self._num_skipped_frames += 1
+                self._latest_frame_data = frame_data
+                self._frame_condition.notify()
+        
+        # Wake up any waiting readers so they can see that the thread has ended
+        with self._frame_condition:
+            self._frame_condition.notify_all()
+        
+        return
+    
+    # .................................................................................................................
+    
+    def _reconnect(self, reconnect_delay_sec):
+        
+        ''' Helper function used to re-create the video capture after the stream drops '''
+        
+        print("",
+              "Lost connection to RTSP source... {}".format(get_human_readable_timestamp()),
+              "  Will try to reconnect in {:.1f} seconds".format(reconnect_delay_sec),
+              sep = "\n")
+        
+        # Wait before reconnecting, but stop waiting if the reader is closed
+        t_end = perf_counter() + reconnect_delay_sec
+        while self._thread_on and (perf_counter() < t_end):
+            with self._frame_condition:
+                self._frame_condition.wait(timeout = 0.5)
+        if not self._thread_on:
+            return False
+        
+        # Replace the old capture. Don't use safe_VideoCapture, since it raises an error on failed connections
+        with self._vcap_lock:
+            self.vcap.release()
+            self.vcap = create_VideoCapture(self.video_source, self.capture_options)
+            reconnected = self.vcap.isOpened()
+        
+        if reconnected:
+            self.num_reconnects += 1
+            print("", "Reconnected to RTSP source! {}".format(get_human_readable_timestamp()), sep = "\n")
+        
+        return reconnected
+    
+    # .................................................................................................................
+    
+    def read(self):
+        
+        # Wait for a new frame from the read thread, unless the thread has ended
+        t1 = perf_counter()
+        with self._frame_condition:
+            while (self._latest_frame_data is None) and self._thread_on:
+                self._frame_condition.wait(timeout = 0.5)
+            frame_data = self._latest_frame_data
+            self._latest_frame_data = None
+        t2 = perf_counter()
+        
+        # If the thread was closed, we won't have frame data, so return a break request
+        if frame_data is None:
+            curent_frame_index, current_epoch_ms, current_datetime = self.timekeeper.get_rtsp_time()
+            return True, None, (t2 - t1), curent_frame_index, current_epoch_ms, current_datetime
+        
+        # Report time spent waiting on the frame as the read time (since reading itself happens on the thread)
+        req_break, frame, _, curent_frame_index, current_epoch_ms, current_datetime = frame_data
+        read_time_sec = (t2 - t1)
+        
+        return req_break, frame, read_time_sec, curent_frame_index, current_epoch_ms, current_datetime
+    
+    # .................................................................................................................
+    
+    def no_decode_read(self):
+        
+        '''
+        Waits for (and discards) the next frame from the read thread.
+        Frames are always decoded by the thread, so this doesn't save any processing,
+        but it keeps the same behavior as other readers (one call per new frame)
+        '''
+        
+        req_break, *_ = self.read()
+        
+        return req_break
+    
+    # .................................................................................................................
+    
+    def decode_read(self):
+        return self.read()
+    
+    # .................................................................................................................
+    
+    def set_frame_skipping(self, adaptive_frame_skip, target_analysis_fps = 0, source_fps = None):
+        
+        # Threaded reader always skips stale frames (latest-wins), so other frame skipping isn't used
+        self._adaptive_frame_skip = False
+        self._target_analysis_fps = 0
+        
+        return False
+    
+    # .................................................................................................................
+    
+    def pop_skipped_frame_count(self):
+        
+        # Lock access, since the skip count is updated by the read thread
+        with self._frame_condition:
+            num_skipped_frames = self._num_skipped_frames
+            self._num_skipped_frames = 0
+        
+        return num_skipped_frames
+    
+    # .................................................................................................................
+    
+    def set(self, property_code, new_value):
+        with self._vcap_lock:
+            return self.vcap.set(property_code, new_value)
+    
+    # .................................................................................................................
+    
+    def get(self, property_code):
+        with self._vcap_lock:
+            return self.vcap.get(property_code)
+    
+    # .................................................................................................................
+    
+    def release(self):
+        
+        # Provide some feedback while closing the video capture
+        print("Closing threaded video capture...", end = " ")
+        
+        # Send the 'off' signal to the read thread & wait for it to finish before releasing the capture
+        self._thread_on = False
+        if self._thread_ref is not None:
+            self._thread_ref.join()
+        self.vcap.release()
+        
+        print("Done!")
+    
+    # .................................................................................................................
+    # .................................................................................................................
+
+
 # /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
 # /////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
 
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Define functions
 
+# Lookup used to convert capture backend options into opencv 'api preference' codes
+_CAPTURE_BACKEND_LUT = {"any": cv2.CAP_ANY,
+                        "ffmpeg": cv2.CAP_FFMPEG,
+                        "gstreamer": cv2.CAP_GSTREAMER}
+
 # .....................................................................................................................
 
 def create_video_reader(location_select_folder_path, camera_select, video_select):
@@ -561,14 +897,14 @@ def create_video_reader(location_select_folder_path, camera_select, video_select
 
 # .....................................................................................................................
 
-def safe_VideoCapture(video_source):
+def safe_VideoCapture(video_source, capture_options = None):
     
     ''' Helper function which adds very basic error handling to cv2.VideoCapture functionality '''
     
     while True:
         
         # Try to connect to the video source
-        vcap = cv2.VideoCapture(video_source)
+        vcap = create_VideoCapture(video_source, capture_options)
         if vcap.isOpened():
             break
         
@@ -581,8 +917,95 @@ def safe_VideoCapture(video_source):
     return vcap
 
 # .....................................................................................................................
+
+def create_VideoCapture(video_source, capture_options = None):
+    
+    '''
+    Helper function used to create a cv2.VideoCapture object using (per-camera) capture options
+    See the create_default_capture_options(...) function for a description of the available options.
+    Options which aren't supported by the installed version of opencv are ignored.
+    
+    Note: The returned capture may not be opened! Check with vcap.isOpened()
+    '''
+    
+    # Fill in any missing options with defaults
+    options_dict = create_default_capture_options()
+    if capture_options is not None:
+        options_dict.update(capture_options)
+    
+    # Figure out which backend to use
+    backend_select = str(options_dict["backend"]).lower().strip()
+    api_preference = _CAPTURE_BACKEND_LUT.get(backend_select, None)
+    if api_preference is None:
+        print("", "WARNING:", "  Unknown capture backend: {}".format(backend_select), "  Using default!", sep = "\n")
+        api_preference = cv2.CAP_ANY
+    
+    # Gstreamer requires a pipeline, which also handles re-sizing & buffering
+    decode_wh = options_dict["decode_wh"]
+    buffer_size = int(options_dict["buffer_size"])
+    use_gstreamer = (api_preference == cv2.CAP_GSTREAMER)
+    if use_gstreamer:
+        video_source = build_gstreamer_pipeline(video_source, decode_wh, buffer_size)
+    elif decode_wh is not None:
+        print("", "WARNING:", "  Reduced resolution decoding is only supported with gstreamer!", sep = "\n")
+    
+    # Build capture parameters, which are only supported on newer versions of opencv
+    capture_params = []
+    decode_threads = int(options_dict["decode_threads"])
+    if decode_threads > 0 and hasattr(cv2, "CAP_PROP_N_THREADS"):
+        capture_params += [cv2.CAP_PROP_N_THREADS, decode_threads]
+    if options_dict["hardware_acceleration"] and hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        capture_params += [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+    
+    # Create the capture, falling back to no parameters on older versions of opencv
+    try:
+        vcap = cv2.VideoCapture(video_source, api_preference, capture_params)
+    except TypeError:
+        vcap = cv2.VideoCapture(video_source, api_preference)
+    
+    # Set the buffer size directly, since it isn't available as a capture parameter
+    if buffer_size > 0 and not use_gstreamer:
+        vcap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+    
+    return vcap
+
 # .....................................................................................................................
 
+def build_gstreamer_pipeline(video_source, decode_wh = None, buffer_size = 0):
+    
+    '''
+    Helper function used to build a gstreamer pipeline string for a given video source (file path or url)
+    If the video source is already a pipeline (i.e. contains '!'), it is returned unchanged
+    '''
+    
+    # Don't modify sources that are already pipelines
+    if "!" in video_source:
+        return video_source
+    
+    # Gstreamer needs a uri, so convert file paths as needed
+    source_is_uri = ("://" in video_source)
+    source_uri = video_source if source_is_uri else "file://{}".format(os.path.abspath(video_source))
+    
+    # Resize before color conversion, so that conversion is done on the (smaller) resized frame
+    scale_str = ""
+    if decode_wh is not None:
+        decode_width, decode_height = decode_wh
+        scale_str = " ! videoscale ! video/x-raw,width={},height={}".format(int(decode_width), int(decode_height))
+    
+    # Only drop frames on live streams, since we never want to skip frames when reading from files
+    is_live_stream = source_uri.startswith("rtsp")
+    sink_str = "appsink sync=false"
+    if is_live_stream:
+        sink_str += " drop=true max-buffers={}".format(max(1, buffer_size))
+    elif buffer_size > 0:
+        sink_str += " max-buffers={}".format(buffer_size)
+    
+    return "uridecodebin uri={}{} ! videoconvert ! video/x-raw,format=BGR ! {}".format(source_uri, scale_str, sink_str)
+
+# .....................................................................................................................
+# .....................................................................................................................
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 #%% Demo
 
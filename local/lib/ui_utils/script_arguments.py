@@ -174,6 +174,7 @@ def _script_arg_function_lut(key_name):
                 "unthreaded_video": _unthreaded_video_arg,
                 "threaded_save": _threaded_save_arg,
                 "unthreaded_save": _unthreaded_save_arg,
+                "pipelined": _pipelined_arg,
                 "disable_saving": _disable_saving_arg,
                 "delete_existing_data": _delete_existing_data_arg,
                 "protocol": _protocol_arg,
@@ -250,6 +251,11 @@ def _unthreaded_save_arg(help_text = "Disable threaded file saving (slower but m
 
 # .....................................................................................................................
 
+def _pipelined_arg(help_text = "Enable pipelined (multi-threaded) processing (faster on multi-core systems)"):
+    return ("-pipe", "--pipelined"), {"default": False, "action": "store_true", "help": help_text}
+
+# .....................................................................................................................
+
 def _disable_saving_arg(help_text = "Turn off report data saving"):
     return ("-nosave", "--disable_saving"), {"default": False, "action": "store_true", "help": help_text}
 
@@ -55,6 +55,7 @@ import numpy as np
 from time import perf_counter
 
 from local.lib.common.timekeeper_utils import any_time_type_to_epoch_ms, isoformat_to_datetime
+from local.lib.common.environment import get_env_file_db_cache
 
 from local.lib.file_access_utils.reporting import build_camera_info_metadata_report_path
 from local.lib.file_access_utils.reporting import build_config_info_metadata_report_path
@@ -72,6 +73,8 @@ from local.lib.file_access_utils.classifier import build_classifier_adb_metadata
 
 from local.lib.file_access_utils.summary import build_summary_adb_metadata_report_path
 
+from local.lib.file_access_utils.resources import build_file_db_cache_path
+
 from local.lib.file_access_utils.rules import save_rule_report_data
 from local.lib.file_access_utils.rules import build_rule_adb_metadata_report_path
 from local.lib.file_access_utils.rules import build_rule_adb_info_report_path
@@ -95,7 +98,8 @@ class File_DB:
     
     def __init__(self, location_select_folder_path, camera_select,
                  primary_key, required_keys_set,
-                 db_path = ":memory:", check_same_thread = True, debug_connect = False):
+                 db_path = ":memory:", check_same_thread = True, debug_connect = False,
+                 indexed_keys_list = None):
         
         # Store camera selections
         self.location_select_folder_path = location_select_folder_path
@@ -107,16 +111,27 @@ class File_DB:
         self._metadata_key = "metadata_json"
         self._ordered_key_list = [primary_key, *sorted(list(required_keys_set))]
         
-        # Build (internal) table name
+        # Store (secondary) index info. Each entry is either a single key or a tuple of keys (composite index)
+        # -> The primary key is always indexed, since most lookups (and sync deletions) search on it
+        indexed_keys_list = [] if indexed_keys_list is None else indexed_keys_list
+        self._indexed_keys_list = [primary_key, *indexed_keys_list]
+        
+        # Build (internal) table names
         self._table_name = "[{}-{}]".format(self.camera_select, self._class_name)
+        self._file_record_table_name = "[{}-{}-files]".format(self.camera_select, self._class_name)
         self._table_created = False
         
         # Allocate storage for db info
         self.db_path = db_path
         self._connection = None
         
-        # Start up the database!
+        # Start up the database! (the table may already exist if we're using a persistent db file)
         self._connection = self.connect(check_same_thread, debug_connect)
+        self._table_created = self._table_exists(self._table_name)
+        
+        # Make sure any pre-existing table has all of the expected indexes
+        if self._table_created:
+            self._create_table_indexes()
     
     # .................................................................................................................
     
@@ -131,6 +146,12 @@ class File_DB:
     
     # .................................................................................................................
     
+    @property
+    def is_persistent(self):
+        return (self.db_path != ":memory:")
+    
+    # .................................................................................................................
+    
     @classmethod
     def _get_table_data_type(cls, python_data_type):
         return cls._table_data_type_lut[python_data_type]
@@ -253,27 +274,8 @@ class File_DB:
     
     def add_entry(self, metadata_dict):
         
-        # Build list of values to insert for each key, with typecasting for dictionaries
-        insert_keys_list = []
-        insert_values_list = []
-        for each_key in self._ordered_key_list:
-            
-            # Type-case python data types to sqlite data types
-            value_to_insert = metadata_dict[each_key]
-            value_type = type(value_to_insert)
-            if value_type is dict:
-                value_to_insert = fast_dict_to_json(value_to_insert)
-            elif value_type is list:
-                value_to_insert = fast_dict_to_json(value_to_insert)
-            
-            # Build outputs
-            insert_keys_list.append(each_key)
-            insert_values_list.append(value_to_insert)
-        
-        # Add final entry which holds the entire metadata as a single json value
-        metadata_as_json = fast_dict_to_json(metadata_dict)
-        insert_keys_list.append(self._metadata_key)
-        insert_values_list.append(metadata_as_json)
+        # Convert metadata into table insertion data
+        insert_keys_list, insert_values_list = self._build_insert_data(metadata_dict)
         
         # Insert the data into the table
         self._create_table_if_missing(insert_keys_list, insert_values_list)
@@ -281,6 +283,112 @@ class File_DB:
     
     # .................................................................................................................
     
+    def add_many_entries(self, metadata_dict_list, replace_existing = False):
+        
+        '''
+        Function used to insert many entries into the database at once (using a single transaction).
+        This is much faster than calling add_entry(...) repeatedly
+        '''
+        
+        # Don't do anything if there's no data
+        if not metadata_dict_list:
+            return
+        
+        # Convert all metadata into table insertion data (assumes all entries have the same keys!)
+        insert_values_list_of_lists = []
+        for each_metadata_dict in metadata_dict_list:
+            insert_keys_list, insert_values_list = self._build_insert_data(each_metadata_dict)
+            insert_values_list_of_lists.append(insert_values_list)
+        
+        # Insert all the data into the table
+        self._create_table_if_missing(insert_keys_list, insert_values_list_of_lists[0])
+        with self._connection:
+            self._insert_many_into_table(insert_keys_list, insert_values_list_of_lists, replace_existing)
+        
+        return
+    
+    # .................................................................................................................
+    
+    def sync_from_file_paths(self, file_path_list):
+        
+        '''
+        Function used to keep a (persistent) database in sync with a set of metadata files.
+        Only files that are new or have changed (based on modification time & size) since the last sync
+        are loaded into the database. Entries from files that no longer exist are removed.
+        
+        Inputs:
+            file_path_list -> (List of strings) Paths to all metadata files that the database should represent
+        
+        Outputs:
+            num_files_loaded, num_files_removed
+        '''
+        
+        # Get stored file records from previous syncs
+        self._create_file_record_table_if_missing()
+        select_cmd = "SELECT file_path, mtime_sec, size_bytes, entry_key FROM {}".format(self._file_record_table_name)
+        prev_records_dict = {each_path: (each_mtime, each_size, each_key)
+                             for each_path, each_mtime, each_size, each_key
+                             in self._fetchall(select_cmd, return_if_missing = [])}
+        
+        # Figure out which files are new or have changed since we last synced
+        paths_to_load_list = []
+        stats_to_load_list = []
+        stale_keys_list = []
+        for each_path in file_path_list:
+            
+            # Get file info used to check for changes
+            file_stat = os.stat(each_path)
+            new_mtime_sec, new_size_bytes = file_stat.st_mtime, file_stat.st_size
+            
+            # Skip files that haven't changed
+            prev_record = prev_records_dict.pop(each_path, None)
+            if prev_record is not None:
+                prev_mtime_sec, prev_size_bytes, prev_key = prev_record
+                is_unchanged = (prev_mtime_sec == new_mtime_sec and prev_size_bytes == new_size_bytes)
+                if is_unchanged:
+                    continue
+                stale_keys_list.append(prev_key)
+            
+            paths_to_load_list.append(each_path)
+            stats_to_load_list.append((new_mtime_sec, new_size_bytes))
+        
+        # Any remaining previous records correspond to files that no longer exist
+        removed_paths_list = list(prev_records_dict.keys())
+        stale_keys_list += [each_key for _, _, each_key in prev_records_dict.values()]
+        
+        # Load all new/changed data
+        metadata_dict_list = [load_metadata(each_path) for each_path in paths_to_load_list]
+        if metadata_dict_list:
+            insert_keys_list, first_values_list = self._build_insert_data(metadata_dict_list[0])
+            self._create_table_if_missing(insert_keys_list, first_values_list)
+        
+        # Update the database (in a single transaction)
+        with self._connection:
+            cursor = self._cursor()
+            
+            # Remove stale entries
+            delete_entry_cmd = "DELETE FROM {} WHERE {} = ?".format(self._table_name, self._primary_key)
+            delete_record_cmd = "DELETE FROM {} WHERE file_path = ?".format(self._file_record_table_name)
+            if self._table_created:
+                cursor.executemany(delete_entry_cmd, [(each_key,) for each_key in stale_keys_list])
+            cursor.executemany(delete_record_cmd, [(each_path,) for each_path in removed_paths_list])
+            
+            # Add new entries
+            insert_values_list_of_lists = [self._build_insert_data(each_dict)[1] for each_dict in metadata_dict_list]
+            if insert_values_list_of_lists:
+                self._insert_many_into_table(insert_keys_list, insert_values_list_of_lists, replace_existing = True)
+            
+            # Record file info so we can skip unchanged files next time
+            record_cmd = "INSERT OR REPLACE INTO {}(file_path, mtime_sec, size_bytes, entry_key) VALUES(?,?,?,?)"
+            record_values_list = [(each_path, *each_stat, each_dict[self._primary_key])
+                                  for each_path, each_stat, each_dict
+                                  in zip(paths_to_load_list, stats_to_load_list, metadata_dict_list)]
+            cursor.executemany(record_cmd.format(self._file_record_table_name), record_values_list)
+        
+        return len(paths_to_load_list), len(removed_paths_list)
+    
+    # .................................................................................................................
+    
     def no_data(self):
         
         ''' Helper function which returns true if there is no data in the database '''
@@ -306,6 +414,64 @@ class File_DB:
     
     # .................................................................................................................
     
+    def _table_exists(self, table_name):
+        
+        ''' Helper function used to check if a table already exists (only relevant for persistent dbs) '''
+        
+        # Table names are stored without square brackets
+        bare_table_name = table_name.strip("[]")
+        select_cmd = "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?"
+        cursor = self._cursor()
+        cursor.execute(select_cmd, (bare_table_name,))
+        
+        return (cursor.fetchone() is not None)
+    
+    # .................................................................................................................
+    
+    def _create_file_record_table_if_missing(self):
+        
+        ''' Helper function used to create a table for recording which files have been loaded into the db '''
+        
+        create_table_cmd = """CREATE TABLE IF NOT EXISTS {}
+                              (file_path TEXT PRIMARY KEY, mtime_sec REAL, size_bytes INTEGER, entry_key)
+                           """.format(self._file_record_table_name)
+        self._cursor().execute(create_table_cmd)
+        self._connection.commit()
+        
+        return
+    
+    # .................................................................................................................
+    
+    def _build_insert_data(self, metadata_dict):
+        
+        ''' Helper function which converts metadata into lists of keys/values for table insertion '''
+        
+        # Build list of values to insert for each key, with typecasting for dictionaries
+        insert_keys_list = []
+        insert_values_list = []
+        for each_key in self._ordered_key_list:
+            
+            # Type-case python data types to sqlite data types
+            value_to_insert = metadata_dict[each_key]
+            value_type = type(value_to_insert)
+            if value_type is dict:
+                value_to_insert = fast_dict_to_json(value_to_insert)
+            elif value_type is list:
+                value_to_insert = fast_dict_to_json(value_to_insert)
+            
+            # Build outputs
+            insert_keys_list.append(each_key)
+            insert_values_list.append(value_to_insert)
+        
+        # Add final entry which holds the entire metadata as a single json value
+        metadata_as_json = fast_dict_to_json(metadata_dict)
+        insert_keys_list.append(self._metadata_key)
+        insert_values_list.append(metadata_as_json)
+        
+        return insert_keys_list, insert_values_list
+    
+    # .................................................................................................................
+    
     def _create_table_if_missing(self, insert_keys_list, insert_values_list):
         
         # Create the first table, if needed. Assumes all data will have the same formatting!
@@ -347,6 +513,9 @@ class File_DB:
         self._cursor().execute(create_table_cmd)
         self._connection.commit()
         
+        # Add indexes so that time-based lookups don't need to scan the whole table
+        self._create_table_indexes()
+        
         '''
         # DEBUG
         print("Created table ({})".format(self._table_name))
@@ -358,6 +527,34 @@ class File_DB:
     
     # .................................................................................................................
     
+    def _create_table_indexes(self):
+        
+        '''
+        Helper function used to create indexes on the table, based on the indexed keys list
+        Composite indexes (given as tuples of keys) are useful for interval queries,
+        for example a (first_epoch_ms, final_epoch_ms) index can answer overlap queries without reading rows
+        '''
+        
+        cursor = self._cursor()
+        for each_entry in self._indexed_keys_list:
+            
+            # Allow for single keys or tuples of keys (for composite indexes)
+            index_keys_list = [each_entry] if type(each_entry) is str else list(each_entry)
+            
+            # Build index name based on the table + indexed keys
+            # Example: "[cam-Object_DB-idx-first_epoch_ms-final_epoch_ms]"
+            index_name = "[{}-{}-idx-{}]".format(self.camera_select, self._class_name, "-".join(index_keys_list))
+            create_index_cmd = "CREATE INDEX IF NOT EXISTS {} ON {}({})".format(index_name,
+                                                                                 self._table_name,
+                                                                                 ", ".join(index_keys_list))
+            cursor.execute(create_index_cmd)
+        
+        self._connection.commit()
+        
+        return
+    
+    # .................................................................................................................
+    
     def _check_keys_are_valid(self, insert_keys_list):
         
         '''
@@ -400,6 +597,24 @@ class File_DB:
         cursor.execute(insert_cmd, insert_values_list)
         self._connection.commit()
     
+    # .................................................................................................................
+    
+    def _insert_many_into_table(self, insert_keys_list, insert_values_list_of_lists, replace_existing = False):
+        
+        ''' Helper function for inserting many rows at once. Does not commit! (caller should manage transaction) '''
+        
+        # Build insert command
+        insert_qs_list = "?" * len(insert_keys_list)
+        insert_keys_str = ", ".join(insert_keys_list)
+        insert_qs_str = ",".join(insert_qs_list)
+        insert_type_str = "INSERT OR REPLACE" if replace_existing else "INSERT"
+        insert_cmd = "{} INTO {}({}) VALUES({})".format(insert_type_str, self._table_name,
+                                                        insert_keys_str, insert_qs_str)
+        
+        # Update the database!
+        cursor = self._cursor()
+        cursor.executemany(insert_cmd, insert_values_list_of_lists)
+    
     # .................................................................................................................
     # .................................................................................................................
 
@@ -662,10 +877,11 @@ class Background_DB(File_DB):
         # Build key info
         primary_key = "epoch_ms"
         required_keys_set = {"frame_index", "datetime_isoformat"}
+        indexed_keys_list = ["frame_index"]
         
         # Inherit from parent
         super().__init__(location_select_folder_path, camera_select, primary_key, required_keys_set,
-                         db_path, check_same_thread, debug_connect)
+                         db_path, check_same_thread, debug_connect, indexed_keys_list)
         
         # Set up pathing to load image data
         self.bg_images_folder_path = build_background_image_report_path(location_select_folder_path,
@@ -846,10 +1062,11 @@ class Snap_DB(File_DB):
         # Build key info
         primary_key = "epoch_ms"
         required_keys_set = {"frame_index", "datetime_isoformat"}
+        indexed_keys_list = ["frame_index"]
         
         # Inherit from parent
         super().__init__(location_select_folder_path, camera_select, primary_key, required_keys_set,
-                         db_path, check_same_thread, debug_connect)
+                         db_path, check_same_thread, debug_connect, indexed_keys_list)
         
         # Set up pathing to load image data
         self.snap_images_folder_path = build_snapshot_image_report_path(location_select_folder_path,
@@ -1171,10 +1388,14 @@ class Object_DB(File_DB):
         required_keys_set = {"first_epoch_ms", "final_epoch_ms",
                              "first_frame_index", "final_frame_index",
                              "tracking"}
+        indexed_keys_list = [("first_epoch_ms", "final_epoch_ms"), "final_epoch_ms"]
         
         # Inherit from parent
         super().__init__(location_select_folder_path, camera_select, primary_key, required_keys_set,
-                         db_path, check_same_thread, debug_connect)
+                         db_path, check_same_thread, debug_connect, indexed_keys_list)
+        
+        # Allocate storage for checking sqlite json support (checked on first use)
+        self._json1_supported = None
     
     # .................................................................................................................
     
@@ -1267,15 +1488,138 @@ class Object_DB(File_DB):
         
         ''' Acts as a generator! '''
         
-        # First get all object IDs for the given time range
-        object_id_list = self.get_object_ids_by_time_range(start_time, end_time)
+        # Return all object metadata (from a single query), using a generator
+        for _, each_metadata_dict in self.load_bulk_metadata_by_time_range(start_time, end_time):
+            yield each_metadata_dict
         
-        # Return all object metadata, using a generator
-        for each_obj_id in object_id_list:
-            yield self.load_metadata_by_id(each_obj_id)
+        return
+    
+    # .................................................................................................................
+    
+    def load_bulk_metadata_by_time_range(self, start_time, end_time, keys_to_load_list = None, fetch_size = 500):
+        
+        '''
+        Acts as a generator! Returns (object_id, metadata_dict) pairs for all objects in the given time range,
+        using a single query (as opposed to one query per object)
+        
+        Inputs:
+            start_time, end_time -> (Any time type) Time range to search for objects
+            
+            keys_to_load_list -> (List of strings or None) If provided, only the given keys will be loaded,
+                                 instead of decoding the full metadata of every object. Nested keys can
+                                 be given using dot-notation, for example: ["first_epoch_ms", "tracking.xy_center"]
+                                 The returned metadata will still be nested, for example:
+                                 {"first_epoch_ms": ..., "tracking": {"xy_center": ...}}
+            
+            fetch_size -> (Integer) Number of rows to pull from the database at a time
+        
+        Outputs:
+            (object_id, metadata_dict) pairs (via generator)
+        '''
+        
+        # Convert time values into epoch_ms values for searching
+        start_epoch_ms = any_time_type_to_epoch_ms(start_time)
+        end_epoch_ms = any_time_type_to_epoch_ms(end_time)
+        
+        # Select either the full metadata or only the targeted values (as a json array, in key order)
+        # -> Projection needs the sqlite json functions, so fall back to loading full metadata if they're missing
+        load_all_keys = (keys_to_load_list is None) or (not self._check_json1_support())
+        if keys_to_load_list is not None:
+            projection_str = self._build_json_projection(keys_to_load_list)
+        select_columns_str = self._metadata_key if load_all_keys else projection_str
+        
+        # Build selection commands
+        select_cmd = """
+                     SELECT full_id, {}
+                     FROM {}
+                     WHERE 
+                     final_epoch_ms >= {} 
+                     AND 
+                     first_epoch_ms <= {}
+                     ORDER BY full_id
+                     """.format(select_columns_str, self._table_name, start_epoch_ms, end_epoch_ms)
+        
+        # Start the query, but bail if the table doesn't exist (i.e. there is no data)
+        try:
+            cursor = self._cursor()
+            cursor.execute(select_cmd)
+        except sqlite3.OperationalError:
+            return
+        
+        # Return object data in chunks, so we don't have to hold all the (raw) metadata in memory at once
+        while True:
+            
+            fetched_rows_list = cursor.fetchmany(fetch_size)
+            if not fetched_rows_list:
+                break
+            
+            for each_obj_id, each_json in fetched_rows_list:
+                
+                # Handle the simple case, where we just want the full metadata
+                decoded_data = fast_json_to_dict(each_json)
+                if keys_to_load_list is None:
+                    yield each_obj_id, decoded_data
+                    continue
+                
+                # Get the values of the targeted keys, either from the projection or from the full metadata
+                if load_all_keys:
+                    values_list = [_get_nested_value(decoded_data, each_key) for each_key in keys_to_load_list]
+                else:
+                    values_list = decoded_data
+                
+                # Rebuild nested metadata from each of the projected values
+                metadata_dict = {}
+                for each_key, each_value in zip(keys_to_load_list, values_list):
+                    *parent_keys_list, final_key = each_key.split(".")
+                    target_dict = metadata_dict
+                    for each_parent_key in parent_keys_list:
+                        target_dict = target_dict.setdefault(each_parent_key, {})
+                    target_dict[final_key] = each_value
+                
+                yield each_obj_id, metadata_dict
         
         return
     
+    # .................................................................................................................
+    
+    def _build_json_projection(self, dot_keys_list):
+        
+        '''
+        Helper function which builds a selection string for a list of (possibly nested) metadata keys
+        Values are selected as a single json array (one entry per key, in order), which keeps the
+        original json text of each value (e.g. floats aren't re-formatted by sqlite) and only needs
+        to be decoded once per row. Missing keys are returned as 'null' (i.e. None)
+        '''
+        
+        # Only allow simple key names, since these get formatted directly into the query
+        for each_dot_key in dot_keys_list:
+            all_keys_valid = all(each_key.isidentifier() for each_key in each_dot_key.split("."))
+            if not all_keys_valid:
+                raise NameError("Invalid metadata key for table {}: {}".format(self._table_name, each_dot_key))
+        
+        # Sqlite only returns a json array when extracting more than one path,
+        # so repeat the path if needed (the extra value is ignored when rebuilding the metadata)
+        json_paths_list = ["'$.{}'".format(each_dot_key) for each_dot_key in dot_keys_list]
+        if len(json_paths_list) == 1:
+            json_paths_list *= 2
+        
+        return "json_extract({}, {})".format(self._metadata_key, ", ".join(json_paths_list))
+    
+    # .................................................................................................................
+    
+    def _check_json1_support(self):
+        
+        ''' Helper function which checks (once) whether the sqlite json functions are available '''
+        
+        if self._json1_supported is None:
+            try:
+                self._cursor().execute("SELECT json_quote(1)")
+                self._json1_supported = True
+            except sqlite3.OperationalError:
+                self._json1_supported = False
+        
+        return self._json1_supported
+    
     # .................................................................................................................
     # .................................................................................................................
     
@@ -1441,10 +1785,11 @@ class Stations_DB(File_DB):
                              "first_frame_index", "final_frame_index",
                              "first_datetime_isoformat", "final_datetime_isoformat",
                              "stations"}
+        indexed_keys_list = [("first_epoch_ms", "final_epoch_ms"), "final_epoch_ms"]
         
         # Inherit from parent
         super().__init__(location_select_folder_path, camera_select, primary_key, required_keys_set,
-                         db_path, check_same_thread, debug_connect)
+                         db_path, check_same_thread, debug_connect, indexed_keys_list)
     
     # .................................................................................................................
     
@@ -1672,16 +2017,34 @@ def fetchall_to_1d_list(fetchall_result, return_index = 0, sort_results = True):
 
 # .....................................................................................................................
 
+def _get_nested_value(data_dict, dot_key):
+    
+    ''' Helper function which gets a (possibly nested) value using dot-notation. Returns None if missing '''
+    
+    value = data_dict
+    for each_key in dot_key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(each_key, None)
+    
+    return value
+
+# .....................................................................................................................
+
 def post_from_folder_path(folder_path, database):
     
     # Start timing
     t_start = perf_counter()
     
-    # Loop over every file path in the given folder and send the data to the database
+    # Get every file path in the given folder
     metdata_path_list = get_file_list(folder_path, return_full_path = True, sort_list = True)
-    for each_file_path in metdata_path_list:
-        metadata_dict = load_metadata(each_file_path)
-        database.add_entry(metadata_dict)
+    
+    # For persistent databases, only load files that are new/changed. Otherwise load all data in bulk
+    if database.is_persistent:
+        database.sync_from_file_paths(metdata_path_list)
+    else:
+        metadata_dict_list = [load_metadata(each_file_path) for each_file_path in metdata_path_list]
+        database.add_many_entries(metadata_dict_list)
     
     # End timing
     t_end = perf_counter()
@@ -1843,7 +2206,20 @@ def _print_missing(error_message):
 # .....................................................................................................................
 
 def launch_dbs(location_select_folder_path, camera_select, *dbs_to_launch,
-               check_same_thread = True, debug_connect = False, db_path = ":memory:"):
+               check_same_thread = True, debug_connect = False, db_path = ":memory:", use_cache = None):
+    
+    '''
+    Function used to launch (and load data into) one or more file dbs
+    If use_cache is True, data will be stored in a persistent (per-camera) db file, so that only
+    new/changed report data needs to be loaded on future launches. If use_cache is None,
+    the setting is taken from the environment (see FILE_DB_CACHE)
+    '''
+    
+    # Use a persistent db file (per camera) instead of an in-memory db, if caching is enabled
+    use_cache = get_env_file_db_cache() if use_cache is None else use_cache
+    if use_cache and db_path == ":memory:":
+        db_path = build_file_db_cache_path(location_select_folder_path, camera_select)
+        os.makedirs(os.path.dirname(db_path), exist_ok = True)
     
     # Specify all the different launch settings for each database type
     launch_lut = {"camera_info": {"print_name": "Camera info",
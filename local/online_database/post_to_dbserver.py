@@ -52,6 +52,7 @@ find_path_to_local()
 import requests
 import ujson
 
+from zipfile import BadZipFile
 from multiprocessing import Process, Event
 from time import perf_counter, sleep
 from random import random as unit_random
@@ -257,6 +258,10 @@ def bundle_metadata(metadata_file_paths):
             # Empty/incorrectly saved files raise value errors
             error_message_list.append("Metadata loading error:\n{}\n{}".format(each_metadata_path, "Bad json data"))
             
+        except (BadZipFile, KeyError, OSError, EOFError):
+            # Truncated/corrupt binary (npz) or compressed files raise zip, missing entry or file errors
+            error_message_list.append("Metadata loading error:\n{}\n{}".format(each_metadata_path, "Bad file data"))
+            
         except (AttributeError, TypeError) as err:
             # In case something unexpected happens, try to log some info
             error_message_list.append("Metadata loading error:\n{}\n{}".format(each_metadata_path, str(err)))
@@ -75,6 +75,7 @@ def parse_run_args(debug_print = False):
                  "delete_existing_data",
                  "unthreaded_video",
                  "threaded_save",
+                 "pipelined",
                  "disable_prompts"]
     
     # Provide some extra information when accessing help text
@@ -103,6 +104,7 @@ ap_result = parse_run_args()
 threaded_video = (not ap_result.get("unthreaded_video", True))
 threaded_save = (ap_result.get("threaded_save", False))
 enable_display = ap_result.get("display", False)
+enable_pipelining = ap_result.get("pipelined", False)
 allow_saving = (not ap_result.get("disable_saving", True))
 delete_existing_data = ap_result.get("delete_existing_data", False)
 provide_prompts = (not ap_result.get("disable_prompts", False))
@@ -144,7 +146,7 @@ loader.toggle_threaded_capture(threaded_video)
 start_timestamp = loader.setup_all()
 
 # Set up object to handle all video processing
-main_process = Video_Processing_Loop(loader, enable_display)
+main_process = Video_Processing_Loop(loader, enable_display, enable_pipelining)
 
 
 # ---------------------------------------------------------------------------------------------------------------------
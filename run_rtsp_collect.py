@@ -87,6 +87,8 @@ def parse_run_args(debug_print = False):
                  "disable_saving",
                  "delete_existing_data",
                  "unthreaded_save",
+                 "threaded_video",
+                 "pipelined",
                  {"url": {"default": default_dbserver_url,
                           "help_text": url_help_text}}]
     
@@ -116,6 +118,8 @@ ap_result = parse_run_args()
 dbserver_url = ap_result.get("url", None)
 threaded_save = (not ap_result.get("unthreaded_save", True))
 enable_display = ap_result.get("display", False)
+enable_pipelining = ap_result.get("pipelined", False)
+threaded_video = ap_result.get("threaded_video", False)
 allow_saving = (not ap_result.get("disable_saving", True))
 delete_existing_data = ap_result.get("delete_existing_data", False)
 provide_prompts = ap_result.get("enable_prompts", False)
@@ -125,7 +129,6 @@ arg_location_select, arg_camera_select, _ = get_selections_from_script_args(ap_r
 
 # Hard-code some settings for rtsp only
 hardcode_video_select = "rtsp"
-hardcode_threaded_video = False
 
 # Catch missing inputs, if prompts are disabled
 check_missing_main_selections(arg_location_select, arg_camera_select, hardcode_video_select,
@@ -157,14 +160,14 @@ if enable_saving:
 # Turn on saving if needed and enable threaded i/o on rtsp streams, to avoid blocking
 loader.toggle_saving(enable_saving)
 loader.toggle_threaded_saving(threaded_save)
-loader.toggle_threaded_capture(hardcode_threaded_video)
+loader.toggle_threaded_capture(threaded_video)
 
 # Configure everything!
 loader.update_state_file("Initializing")
 start_timestamp = loader.setup_all()
 
 # Set up object to handle all video processing
-main_process = Video_Processing_Loop(loader, enable_display)
+main_process = Video_Processing_Loop(loader, enable_display, enable_pipelining)
 
 # Start auto-data posting
 parallel_post_ref, shutdown_post_event = \
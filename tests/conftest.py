@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# Make sure the 'local' package is importable when running tests from anywhere
+project_root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root_path not in sys.path:
+    sys.path.insert(0, project_root_path)
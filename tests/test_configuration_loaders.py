@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import local.lib.launcher_utils.configuration_loaders as config_loaders
+
+from local.lib.launcher_utils.video_setup import File_Video_Reader, Threaded_File_Video_Reader
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Helpers
+
+def _new_file_loader(loader_class, vreader):
+    
+    ''' Build a loader without running the (interactive) selection/setup steps, just enough to set up resources '''
+    
+    loader = object.__new__(loader_class)
+    loader.location_select_folder_path = "/nowhere"
+    loader.camera_select = "camera"
+    loader.saving_enabled = False
+    loader.vreader = vreader
+    
+    return loader
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Tests
+
+@pytest.mark.parametrize("loader_class", [config_loaders.File_Configuration_Loader,
+                                          config_loaders.Reconfigurable_Core_Stage_Loader])
+@pytest.mark.parametrize("reader_class", [File_Video_Reader, Threaded_File_Video_Reader])
+def test_file_loader_setup_resources(monkeypatch, loader_class, reader_class):
+    
+    # Skip the actual background/framerate initialization, which requires real video & location data
+    fake_framerate = 12.5
+    monkeypatch.setattr(config_loaders, "initialize_background_and_framerate_from_file",
+                        lambda *args, **kwargs: fake_framerate)
+    
+    # File readers don't support frame skipping, so setup must not depend on it
+    vreader = object.__new__(reader_class)
+    loader = _new_file_loader(loader_class, vreader)
+    loader.setup_resources()
+    
+    assert loader.estimated_video_fps == fake_framerate
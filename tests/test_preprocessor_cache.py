@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+
+import local.configurables.core.preprocessor._helper_functions as preproc_helpers
+
+from local.configurables.core.preprocessor._helper_functions import build_remap_cache_key
+from local.configurables.core.preprocessor._helper_functions import load_remap_cache, save_remap_cache
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Helpers
+
+def _save_example_cache(cache_file_path, cache_key):
+    
+    ''' Save a small (valid) cache file, returning the saved mapping data '''
+    
+    x_mapping, y_mapping = np.meshgrid(np.arange(8, dtype = np.float32), np.arange(6, dtype = np.float32))
+    remap_tables = (np.float32(x_mapping), np.float32(y_mapping))
+    save_remap_cache(cache_file_path, cache_key, x_mapping, y_mapping, remap_tables)
+    
+    return x_mapping, y_mapping
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+#%% Tests
+
+def test_load_remap_cache_round_trip(tmp_path):
+    
+    cache_file_path = str(tmp_path / "cache" / "remap.npz")
+    cache_key = build_remap_cache_key("script", (8, 6), (8, 6), [])
+    x_mapping, y_mapping = _save_example_cache(cache_file_path, cache_key)
+    
+    loaded_x_mapping, loaded_y_mapping, _ = load_remap_cache(cache_file_path, cache_key)
+    assert np.array_equal(loaded_x_mapping, x_mapping)
+    assert np.array_equal(loaded_y_mapping, y_mapping)
+    assert load_remap_cache(cache_file_path, "different key") is None
+
+# .....................................................................................................................
+
+def test_load_remap_cache_empty_file(tmp_path):
+    
+    # Interrupted saves can leave a zero-length cache file behind
+    cache_file_path = str(tmp_path / "remap.npz")
+    open(cache_file_path, "wb").close()
+    
+    assert load_remap_cache(cache_file_path, "any key") is None
+
+# .....................................................................................................................
+
+def test_load_remap_cache_truncated_file(tmp_path):
+    
+    # Save a valid cache, then cut it in half to mimic a partial write
+    cache_file_path = str(tmp_path / "remap.npz")
+    _save_example_cache(cache_file_path, "key")
+    with open(cache_file_path, "rb") as in_file:
+        cache_bytes = in_file.read()
+    with open(cache_file_path, "wb") as out_file:
+        out_file.write(cache_bytes[:len(cache_bytes) // 2])
+    
+    assert os.path.getsize(cache_file_path) > 0
+    assert load_remap_cache(cache_file_path, "key") is None
+
+# .....................................................................................................................
+
+def test_remap_cache_key_includes_version(monkeypatch):
+    
+    # Changing the cache version (i.e. after mapping code changes) must invalidate previously saved caches
+    key_data = ("script", (8, 6), (8, 6), [1, 2, 3])
+    original_key = build_remap_cache_key(*key_data)
+    monkeypatch.setattr(preproc_helpers, "_REMAP_CACHE_VERSION", preproc_helpers._REMAP_CACHE_VERSION + 1)
+    
+    assert build_remap_cache_key(*key_data) != original_key